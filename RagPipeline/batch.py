@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Batch Issue Resolution
+여러 이슈를 파일(또는 표준입력)에서 읽어 하나의 IssueQuerySystem으로 동시에 해결
+- 열린 벡터스토어, API 클라이언트, 임베딩/리서치/시맨틱 캐시를 모든 이슈가 공유
+- 동시 처리 수 제한과 LLM / 리서치 API별 분당 요청 수 예산
+- 정규화 후 같은 이슈는 한 번만 해결하고 결과를 재사용
+- 이슈별 리포트와 단계별 처리량 요약(summary.json, summary.md) 저장
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from src.infrastructure.concurrency.rate_limiter import RateLimiter
+from RagPipeline.query import IssueQuerySystem
+
+
+def read_issues(path: str) -> List[Dict[str, str]]:
+    """한 줄에 이슈 하나 (빈 줄, # 주석 무시) 또는 JSONL({"id", "issue"}) 읽기
+
+    path가 "-" 이면 표준입력에서 읽음"""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    issues = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            data = json.loads(line)
+            issue = data["issue"]
+            issue_id = str(data.get("id") or f"issue-{len(issues) + 1}")
+        else:
+            issue = line
+            issue_id = f"issue-{len(issues) + 1}"
+        issues.append({"id": issue_id, "issue": issue})
+    return issues
+
+
+def normalize_issue(issue: str) -> str:
+    return re.sub(r"\s+", " ", issue).strip().lower()
+
+
+class BatchIssueResolver:
+    def __init__(
+        self,
+        query_system: IssueQuerySystem,
+        concurrency: int = 4,
+        llm_per_minute: float = 60.0,
+        research_per_minute: float = 60.0,
+        output_dir: str = "report/batch",
+        use_cache: bool = True,
+    ):
+        self.query_system = query_system
+        self.concurrency = max(1, concurrency)
+        self.output_dir = output_dir
+        self.use_cache = use_cache
+
+        # API별 호출 속도 예산 (0 이하이면 제한 없음)
+        if llm_per_minute > 0:
+            query_system.llm_limiter = RateLimiter("llm", llm_per_minute)
+        if research_per_minute > 0:
+            query_system.research_limiter = RateLimiter(
+                "research", research_per_minute
+            )
+
+    def run(self, issues: List[Dict[str, str]]) -> Dict[str, Any]:
+        return asyncio.run(self.arun(issues))
+
+    async def arun(self, issues: List[Dict[str, str]]) -> Dict[str, Any]:
+        """이슈 목록을 동시에 해결하고 요약 반환"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        started = time.perf_counter()
+
+        # 인덱스를 한 번만 열어 모든 이슈가 공유
+        if not self.query_system.vectorstore:
+            self.query_system.load_vector_store()
+
+        # 같은 이슈(정규화 기준)는 첫 번째 것만 해결
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for index, item in enumerate(issues, 1):
+            groups.setdefault(normalize_issue(item["issue"]), []).append(
+                {**item, "index": index}
+            )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        records = await asyncio.gather(
+            *(self._resolve_group(items, semaphore) for items in groups.values())
+        )
+        records = sorted(
+            (record for group in records for record in group),
+            key=lambda record: record["index"],
+        )
+
+        summary = self._summary(records, time.perf_counter() - started)
+        self._write_summary(summary)
+        return summary
+
+    async def _resolve_group(
+        self, items: List[Dict[str, Any]], semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        first = items[0]
+        async with semaphore:
+            try:
+                result = await self.query_system.aresolve_issue(
+                    first["issue"], use_cache=self.use_cache
+                )
+                error = None
+            except Exception as e:
+                print(f"[{first['id']}] resolution failed : {e}")
+                result, error = None, str(e)
+
+        records = []
+        for item in items:
+            record = {
+                "index": item["index"],
+                "id": item["id"],
+                "issue": item["issue"],
+                "status": "error" if error else "ok",
+            }
+            if error:
+                record["error"] = error
+            else:
+                if item is not first:
+                    record["status"] = "duplicate"
+                    record["duplicate_of"] = first["id"]
+                elif result.get("cache", {}).get("hit"):
+                    record["status"] = "cached"
+                record["timings"] = result.get("timings", {})
+                record["report"] = self._report_path(item)
+                self.query_system.print_resolution_report(
+                    {**result, "issue": item["issue"]}, record["report"]
+                )
+            records.append(record)
+        return records
+
+    def _report_path(self, item: Dict[str, Any]) -> str:
+        slug = re.sub(r"[^\w-]+", "-", item["id"]).strip("-")[:40] or "issue"
+        return os.path.join(self.output_dir, f"{item['index']:04d}-{slug}.md")
+
+    def _summary(
+        self, records: List[Dict[str, Any]], wall_seconds: float
+    ) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for record in records:
+            statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+
+        # 중복 이슈는 실제로 실행되지 않았으므로 단계 통계에서 제외
+        stage_times: Dict[str, List[float]] = {}
+        for record in records:
+            if record["status"] in ("ok", "cached"):
+                for stage, elapsed in record["timings"].items():
+                    stage_times.setdefault(stage, []).append(elapsed)
+
+        stages = {}
+        for stage, values in stage_times.items():
+            values.sort()
+            stages[stage] = {
+                "count": len(values),
+                "avg_ms": sum(values) / len(values),
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max_ms": values[-1],
+                # 단계에 쓰인 시간 합 (가장 큰 단계가 처리량 병목)
+                "busy_seconds": sum(values) / 1000,
+                "per_second": len(values) / wall_seconds if wall_seconds else 0.0,
+            }
+
+        limiters = {
+            name: limiter.stats()
+            for name, limiter in (
+                ("llm", self.query_system.llm_limiter),
+                ("research", self.query_system.research_limiter),
+            )
+            if limiter is not None
+        }
+
+        return {
+            "issues": len(records),
+            "statuses": statuses,
+            "concurrency": self.concurrency,
+            "wall_seconds": wall_seconds,
+            "issues_per_minute": (
+                len(records) / wall_seconds * 60 if wall_seconds else 0.0
+            ),
+            "stages": stages,
+            "rate_limits": limiters,
+            "research_cache": self.query_system.research_cache.stats(),
+            "records": records,
+        }
+
+    def _write_summary(self, summary: Dict[str, Any]) -> None:
+        with open(
+            os.path.join(self.output_dir, "summary.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+        lines = [
+            "# Batch Issue Resolution Summary",
+            "",
+            f"- issues: {summary['issues']} {summary['statuses']}",
+            f"- concurrency: {summary['concurrency']}",
+            f"- wall time: {summary['wall_seconds']:.1f} s "
+            f"({summary['issues_per_minute']:.1f} issues/min)",
+            "",
+            "## Stages",
+            "",
+            "| stage | count | avg ms | p95 ms | max ms | busy s | completed/s |",
+            "| --- | --- | --- | --- | --- | --- | --- |",
+        ]
+        for stage, stats in summary["stages"].items():
+            lines.append(
+                f"| {stage} | {stats['count']} | {stats['avg_ms']:.0f} "
+                f"| {stats['p95_ms']:.0f} | {stats['max_ms']:.0f} "
+                f"| {stats['busy_seconds']:.1f} | {stats['per_second']:.2f} |"
+            )
+
+        lines += ["", "## Issues", ""]
+        for record in summary["records"]:
+            target = record.get("report") or record.get("error", "")
+            lines.append(
+                f"- [{record['status']}] {record['id']}: {record['issue']} → {target}"
+            )
+
+        with open(
+            os.path.join(self.output_dir, "summary.md"), "w", encoding="utf-8"
+        ) as f:
+            f.write("\n".join(lines) + "\n")
+
+        print(f"✅ Batch summary saved to: {self.output_dir}/summary.md")
+
+
+def resolve_issue_file(
+    path: str,
+    concurrency: int,
+    llm_per_minute: float,
+    research_per_minute: float,
+    output_dir: str,
+    use_cache: bool = True,
+    query_system: Optional[IssueQuerySystem] = None,
+) -> Dict[str, Any]:
+    """이슈 파일(또는 "-" 표준입력)을 읽어 일괄 해결"""
+    issues = read_issues(path)
+    resolver = BatchIssueResolver(
+        query_system or IssueQuerySystem(),
+        concurrency=concurrency,
+        llm_per_minute=llm_per_minute,
+        research_per_minute=research_per_minute,
+        output_dir=output_dir,
+        use_cache=use_cache,
+    )
+    return resolver.run(issues)
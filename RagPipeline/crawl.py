@@ -17,6 +17,11 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_openai.embeddings import OpenAIEmbeddings
 import chromadb
+from src.infrastructure.storage.span_store import SpanStore
+from src.infrastructure.vector_stores.chroma_store import write_chunks
+from src.infrastructure.symbols.symbol_extractor import extract_symbols
+from src.infrastructure.symbols.symbol_table import SymbolTable
+from src.infrastructure.storage.index_generation import IndexGeneration
 
 load_dotenv()
 
@@ -47,6 +52,11 @@ class RepositoryCrawler:
 
         self.chroma_persist_dir = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
 
+        # 파일 원문은 span store에 한 번만 압축 저장
+        self.span_store = SpanStore.for_persist_dir(self.chroma_persist_dir)
+        # 식별자 질의를 바로 응답하기 위한 심볼 테이블
+        self.symbol_table = SymbolTable.load(self.chroma_persist_dir)
+
     def clone_repository(self, repo_url: str, local_path: str = "./temp_repo") -> str:
         """GitHub 레포지토리 클론"""
         print(f"Cloning repository: {repo_url}")
@@ -126,6 +136,8 @@ class RepositoryCrawler:
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                     content = f.read()
 
+                # 이전 크롤링의 span 제거 후 다시 기록
+                self.span_store.remove_file(file_path)
                 if not content.strip():
                     continue
 
@@ -133,29 +145,41 @@ class RepositoryCrawler:
                 print(f"원문 확인 {content}")
                 chunks = self.text_splitter.split_text(content)
                 print(f"청크데이터 확인 {chunks}")
-                for i, chunk in enumerate(chunks):
-                    documents.append(
-                        {
-                            "content": chunk,
-                            "metadata": {
-                                "source": file_path,
-                                "chunk_index": i,
-                                "total_chunks": len(chunks),
-                                "file_type": Path(file_path).suffix,
-                                "file_name": Path(file_path).name,
-                                "relative_path": str(
-                                    Path(file_path).relative_to(
-                                        Path(file_path).parts[0]
-                                    )
-                                ),
-                            },
-                        }
-                    )
+                spans = self.span_store.locate_chunks(content, chunks)
+                file_id = self.span_store.put_file(
+                    file_path, content, [span or (0, 0) for span in spans]
+                )
+                self.symbol_table.set_file_symbols(
+                    file_path, extract_symbols(file_path, content, file_id, spans)
+                )
+
+                for i, (chunk, span) in enumerate(zip(chunks, spans)):
+                    metadata = {
+                        "source": file_path,
+                        "chunk_id": f"{file_id}:{i}",
+                        "chunk_index": i,
+                        "total_chunks": len(chunks),
+                        "file_type": Path(file_path).suffix,
+                        "file_name": Path(file_path).name,
+                        "relative_path": str(
+                            Path(file_path).relative_to(Path(file_path).parts[0])
+                        ),
+                    }
+                    if span is not None:
+                        metadata.update(
+                            {
+                                "file_id": file_id,
+                                "span_start": span[0],
+                                "span_end": span[1],
+                            }
+                        )
+                    documents.append({"content": chunk, "metadata": metadata})
 
             except Exception as e:
                 print(f"Error processing {file_path}: {e}")
                 continue
 
+        self.span_store.save()
         print(f"{len(documents)} document chunks 생성완료")
         return documents
 
@@ -167,20 +191,17 @@ class RepositoryCrawler:
         """
         print(f"Creating vector store with {len(documents)} chunks...")
 
-        # 텍스트와 메타데이터 분리
-        texts = [doc["content"] for doc in documents]
-        metadatas = [doc["metadata"] for doc in documents]
-
-        # ChromaDB 벡터스토어 생성
-        vectorstore = Chroma.from_texts(
-            texts=texts,
-            metadatas=metadatas,
-            embedding=self.embeddings,
+        # ChromaDB 벡터스토어 생성 (원문은 span store에 있으므로 임베딩과 메타데이터만 저장)
+        vectorstore = Chroma(
             persist_directory=self.chroma_persist_dir,
+            embedding_function=self.embeddings,
         )
+        write_chunks(vectorstore, self.embeddings, documents)
+        self.symbol_table.save(self.chroma_persist_dir)
+
+        # 인덱스 세대 갱신 → 세대를 키로 쓰는 캐시들 자동 무효화
+        IndexGeneration(self.chroma_persist_dir).bump()
 
-        # 벡터스토어 저장
-        vectorstore.persist()
         print(f"Vector store created and saved to: {self.chroma_persist_dir}")
 
     def crawl_repository(self, repo_url: str) -> None:
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Warm Issue Resolution Process
+IssueQuerySystem(벡터스토어, API 클라이언트, 캐시)을 한 번만 초기화하고 계속 재사용
+- IssueDaemon: 로컬 유닉스 소켓으로 daemon_client의 요청을 받아 처리하는 데몬
+- run_repl: 같은 프로세스에서 이슈를 연속으로 입력받는 대화형 REPL
+질문마다 import / 클라이언트 생성 / 인덱스 로드 비용을 다시 치르지 않음
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from RagPipeline.daemon_client import DaemonClient, DaemonUnavailable
+from RagPipeline.query import IssueQuerySystem, REPORT_PATH
+
+
+def warm_query_system() -> IssueQuerySystem:
+    """이슈 해결 시스템 생성 후 벡터스토어까지 미리 로드"""
+    query_system = IssueQuerySystem()
+    query_system.load_vector_store()
+    return query_system
+
+
+class IssueDaemon:
+    # 요청 한 줄(JSON)의 최대 크기 (기본 64KiB로는 긴 이슈 본문이 잘림)
+    MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, query_system: IssueQuerySystem, socket_path: str):
+        self.query_system = query_system
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self.requests = 0
+        self.active = 0
+        self._stopping: Optional[asyncio.Event] = None
+
+    def run(self) -> None:
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        self._claim_socket()
+        self._stopping = asyncio.Event()
+        server = await asyncio.start_unix_server(
+            self._handle, path=self.socket_path, limit=self.MAX_REQUEST_BYTES
+        )
+        os.chmod(self.socket_path, 0o600)
+        print(f"Issue daemon listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Issue daemon stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "uptime_s": time.time() - self.started_at,
+            "requests": self.requests,
+            "active": self.active,
+            "research_cache": self.query_system.research_cache.stats(),
+            "semantic_cache": self.query_system.semantic_cache.stats(),
+        }
+
+    def _claim_socket(self) -> None:
+        """이미 실행 중인 데몬이 있으면 중단, 남아 있는 소켓 파일은 정리"""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            DaemonClient(self.socket_path, timeout=2.0).call("ping")
+        except (DaemonUnavailable, OSError, ValueError):
+            os.unlink(self.socket_path)
+            return
+        raise RuntimeError(f"issue daemon already running at {self.socket_path}")
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.requests += 1
+        self.active += 1
+        try:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # 한도를 넘는 요청은 StreamReader가 LimitOverrunError를 ValueError로 변환
+                await self._send(
+                    writer,
+                    {
+                        "event": "error",
+                        "error": f"request exceeds {self.MAX_REQUEST_BYTES} bytes",
+                    },
+                )
+                return
+            request = json.loads(line)
+            command = request.get("command")
+            if command == "ping":
+                await self._send(writer, {"event": "pong", "pid": os.getpid()})
+            elif command == "stats":
+                await self._send(writer, {"event": "stats", **self.stats()})
+            elif command == "shutdown":
+                await self._send(writer, {"event": "stopping"})
+                self._stopping.set()
+            elif command == "resolve":
+                await self._resolve(request, writer)
+            else:
+                await self._send(
+                    writer, {"event": "error", "error": f"unknown command: {command}"}
+                )
+        except Exception as e:
+            print(f"daemon request failed : {e}")
+            try:
+                await self._send(writer, {"event": "error", "error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def _resolve(
+        self, request: Dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        started = time.perf_counter()
+        issue = request["issue"]
+        use_cache = request.get("use_cache", True)
+        path = request.get("report_path") or REPORT_PATH
+
+        if request.get("stream"):
+            # final에서 빠져나오거나 전송 중 연결이 끊겨도 생성기를 바로 정리
+            events = self.query_system.astream_resolution_report(issue, use_cache, path)
+            async with contextlib.aclosing(events):
+                async for event in events:
+                    if event["event"] == "final":
+                        break
+                    await self._send(writer, event)
+            result = event["result"]
+        else:
+            result = await self.query_system.aresolve_issue(issue, use_cache)
+            self.query_system.print_resolution_report(result, path)
+
+        await self._send(
+            writer,
+            {
+                "event": "final",
+                "result": result,
+                "report": path,
+                "server_ms": (time.perf_counter() - started) * 1000,
+            },
+        )
+
+    async def _send(self, writer: asyncio.StreamWriter, event: Dict[str, Any]) -> None:
+        payload = json.dumps(event, ensure_ascii=False, default=str)
+        writer.write(payload.encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+def run_repl(
+    query_system: IssueQuerySystem,
+    use_cache: bool = True,
+    stream: bool = True,
+    startup_ms: Optional[float] = None,
+) -> None:
+    """이슈를 한 줄씩 입력받아 해결 (:stats 통계, :quit 종료)"""
+    asyncio.run(_repl(query_system, use_cache, stream, startup_ms))
+
+
+async def _repl(
+    query_system: IssueQuerySystem,
+    use_cache: bool,
+    stream: bool,
+    startup_ms: Optional[float],
+) -> None:
+    # API 클라이언트의 비동기 커넥션이 이벤트 루프에 묶이므로 하나의 루프에서 계속 처리
+    loop = asyncio.get_running_loop()
+    if startup_ms is not None:
+        print(f"Ready in {startup_ms:.0f} ms. Type an issue, :stats or :quit")
+
+    while True:
+        try:
+            line = await loop.run_in_executor(None, input, "issue> ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+
+        issue = line.strip()
+        if not issue:
+            continue
+        if issue in (":quit", ":q", ":exit"):
+            return
+        if issue == ":stats":
+            print(
+                json.dumps(
+                    {
+                        "research_cache": query_system.research_cache.stats(),
+                        "semantic_cache": query_system.semantic_cache.stats(),
+                    },
+                    ensure_ascii=False,
+                    indent=2,
+                    default=str,
+                )
+            )
+            continue
+
+        started = time.perf_counter()
+        try:
+            if stream:
+                result = await query_system.aresolve_issue_streaming(issue, use_cache)
+            else:
+                result = await query_system.aresolve_issue(issue, use_cache)
+                query_system.print_resolution_report(result)
+                print(result["solution"])
+        except Exception as e:
+            print(f"Query failed: {e}")
+            continue
+
+        elapsed = (time.perf_counter() - started) * 1000
+        pipeline = result.get("timings", {}).get("total", elapsed)
+        print(
+            f"--- answered in {elapsed:.0f} ms "
+            f"(pipeline {pipeline:.0f} ms, overhead {elapsed - pipeline:.0f} ms) ---"
+        )
@@ -0,0 +1,73 @@
+"""
+Issue Daemon Client
+실행 중인 이슈 해결 데몬에 로컬 유닉스 소켓으로 요청을 전달하는 얇은 클라이언트
+langchain/openai/chromadb를 import 하지 않으므로 CLI 시작 비용이 거의 없음
+
+프로토콜: 요청 JSON 한 줄 → 응답 이벤트 JSON 여러 줄 (마지막은 final / error / pong 등)
+"""
+
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Dict, Iterator, Optional
+
+REPORT_PATH = os.path.join("report", "result-query.md")
+
+
+def default_socket_path() -> str:
+    return os.getenv(
+        "RAG_DAEMON_SOCKET",
+        os.path.join(tempfile.gettempdir(), f"rag-daemon-{os.getuid()}.sock"),
+    )
+
+
+class DaemonUnavailable(ConnectionError):
+    """데몬 소켓에 연결할 수 없음"""
+
+
+class DaemonClient:
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 600.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """요청을 보내고 응답 이벤트를 도착하는 대로 반환"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailable(
+                f"issue daemon not running at {self.socket_path}: {e}"
+            ) from e
+
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(payload, ensure_ascii=False).encode() + b"\n")
+            stream.flush()
+            for line in stream:
+                yield json.loads(line)
+
+    def resolve(
+        self,
+        issue: str,
+        use_cache: bool = True,
+        stream: bool = False,
+        report_path: str = REPORT_PATH,
+    ) -> Iterator[Dict[str, Any]]:
+        return self.request(
+            {
+                "command": "resolve",
+                "issue": issue,
+                "use_cache": use_cache,
+                "stream": stream,
+                # 리포트는 데몬이 작성하므로 클라이언트 기준 절대 경로로 전달
+                "report_path": os.path.abspath(report_path),
+            }
+        )
+
+    def call(self, command: str) -> Dict[str, Any]:
+        """ping / stats / shutdown 등 응답이 하나인 명령"""
+        events = list(self.request({"command": command}))
+        return events[-1] if events else {}
@@ -2,39 +2,76 @@
 """
 Issue Query & Resolution Pipeline
 Issue 번호 입력 → VectorStore 검색 → Tavily API 리서치 → OpenAI ChatCompletion으로 해결책 생성
+VectorStore 검색과 Tavily 리서치 등 컨텍스트 소스는 소스별 타임아웃을 두고 동시에 실행
 """
 
 import os
 import sys
+import time
+import asyncio
 import argparse
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional
 from dotenv import load_dotenv
 
 from langchain_community.vectorstores import Chroma
-from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_openai import ChatOpenAI
 from tavily import TavilyClient
 import os
 from datetime import datetime
 from langchain_core.messages import SystemMessage, HumanMessage
+from src.infrastructure.storage.span_store import SpanStore
+from src.infrastructure.storage.positional_index import PositionalIndex
+from src.infrastructure.symbols.symbol_table import SymbolTable
+from src.infrastructure.embeddings.cached_embeddings import CachedEmbeddings
+from src.config import settings
+from src.infrastructure.cache.semantic_cache import SemanticAnswerCache
+from src.infrastructure.cache.research_cache import ResearchCache, ResearchCacheMiss
+from src.infrastructure.concurrency.rate_limiter import RateLimiter
+from src.infrastructure.storage.index_generation import IndexGeneration
+from src.services.context_packer import ContextPacker, PackedContext
+from src.services.context_compressor import ContextCompressor
+from src.services.neighbor_expander import NeighborExpander
 
 load_dotenv()
 
+REPORT_PATH = "report/result-query.md"
+
 # LangSmith 추적 활성화
 os.environ["LANGCHAIN_TRACING_V2"] = "true"
 if os.getenv("LANGCHAIN_API_KEY"):
     os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT", "rag-system")
 
 
+@dataclass
+class ContextSource:
+    """이슈 해결에 사용할 컨텍스트 소스
+
+    fetch(issue_description)는 블로킹 호출로 스레드에서 실행
+    required=True 이면 생성 전에 완료(또는 타임아웃)를 기다리고
+    False 이면 필수 소스가 모두 끝난 시점까지 완료된 경우에만 사용"""
+
+    name: str
+    fetch: Callable[[str], Any]
+    timeout: float
+    required: bool = True
+    fallback: Any = None
+
+
 class IssueQuerySystem:
     def __init__(self):
         # API 키 확인
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.tavily_api_key = os.getenv("TAVILY_API_KEY")
+        # offline 모드에서는 Tavily를 호출하지 않고 리서치 캐시에서만 응답
+        self.research_offline = (
+            os.getenv("RESEARCH_CACHE_OFFLINE", "false").lower() == "true"
+        )
 
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
-        if not self.tavily_api_key:
+        if not self.tavily_api_key and not self.research_offline:
             raise ValueError("TAVILY_API_KEY not found in environment variables")
 
         # LangChain ChatOpenAI 초기화 (LangSmith 추적 가능)
@@ -44,16 +81,98 @@ class IssueQuerySystem:
 
         # Embeddings 초기화 (crawl.py와 동일한 모델 사용 해야함 아니면 정상적으로 검색이 되지않음
         # 추후 포스팅 예정)
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small", api_key=self.openai_api_key
+        # 질의 임베딩은 (model, 정규화 질의) 기준으로 메모리 + 디스크 캐시
+        self.embeddings = CachedEmbeddings.from_config(
+            settings.load_config(), self.openai_api_key
         )
 
         # Tavily 클라이언트 초기화
-        self.tavily_client = TavilyClient(api_key=self.tavily_api_key)
+        self.tavily_client = (
+            TavilyClient(api_key=self.tavily_api_key) if self.tavily_api_key else None
+        )
+
+        # 같은 질의의 리서치 결과는 TTL 동안 디스크 캐시에서 재사용
+        self.research_cache = ResearchCache(
+            os.getenv("RESEARCH_CACHE_PATH", "research_cache.db"),
+            ttl_seconds=float(os.getenv("RESEARCH_CACHE_TTL", "86400")),
+            stale_seconds=float(os.getenv("RESEARCH_CACHE_STALE", "604800")),
+            max_bytes=int(os.getenv("RESEARCH_CACHE_MAX_MB", "64")) * 1024 * 1024,
+            offline=self.research_offline,
+        )
 
         # ChromaDB 설정
         self.chroma_persist_dir = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
         self.vectorstore = None
+        self.span_store = SpanStore.for_persist_dir(self.chroma_persist_dir)
+        self.index_generation = IndexGeneration(self.chroma_persist_dir)
+
+        # 코드 컨텍스트는 토큰 예산 안에서 겹치는 청크를 병합해 프롬프트에 포함
+        # (CONTEXT_COMPRESSION=true 이면 이슈와 관련된 줄 위주로 추출 압축)
+        compressor = None
+        if os.getenv("CONTEXT_COMPRESSION", "false").lower() == "true":
+            compressor = ContextCompressor(
+                keep_ratio=float(os.getenv("CONTEXT_COMPRESSION_RATIO", "0.4"))
+            )
+        self.context_packer = ContextPacker(
+            max_tokens=int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000")),
+            model="gpt-4",
+            span_store=self.span_store,
+            compressor=compressor,
+        )
+
+        # 검색된 청크를 앞뒤 청크(neighbors) 또는 감싸는 함수(function)까지 확장
+        # (CONTEXT_EXPANSION=none 이면 사용 안 함, 확장 토큰은 별도 예산으로 제한)
+        self.context_expansion = os.getenv("CONTEXT_EXPANSION", "none")
+        self.expansion_window = int(os.getenv("CONTEXT_EXPANSION_WINDOW", "1"))
+        self.neighbor_expander = None
+        if self.context_expansion != "none":
+            self.neighbor_expander = NeighborExpander(
+                PositionalIndex.build(
+                    self.span_store, SymbolTable.load(self.chroma_persist_dir)
+                ),
+                self.span_store,
+                max_tokens=int(os.getenv("CONTEXT_EXPANSION_TOKENS", "1500")),
+                count_tokens=self.context_packer.count_tokens,
+            )
+
+        # 거의 동일한 이슈는 LLM 호출 없이 이전 해결 결과 재사용
+        self.semantic_cache = SemanticAnswerCache(
+            os.getenv("SEMANTIC_CACHE_PATH", "semantic_cache.db"),
+            threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+            max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000")),
+            ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL", "86400")),
+        )
+
+        # 컨텍스트 소스별 타임아웃 (초)
+        self.retrieval_timeout = float(os.getenv("ISSUE_RETRIEVAL_TIMEOUT", "10"))
+        self.research_timeout = float(os.getenv("ISSUE_RESEARCH_TIMEOUT", "15"))
+        self.research_required = (
+            os.getenv("ISSUE_RESEARCH_REQUIRED", "true").lower() == "true"
+        )
+        # 외부 API 호출 속도 제한 (배치 처리 등에서 지정, 없으면 제한 없음)
+        self.llm_limiter: Optional[RateLimiter] = None
+        self.research_limiter: Optional[RateLimiter] = None
+
+        # 추가 컨텍스트 소스 (add_context_source로 등록, 결과는 프롬프트에 포함)
+        self.extra_sources: List[ContextSource] = []
+        # 소스 호출 전용 스레드 풀 (타임아웃된 호출이 이벤트 루프 종료를 막지 않도록
+        # asyncio 기본 실행기 대신 사용)
+        self.source_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("ISSUE_SOURCE_WORKERS", "8")),
+            thread_name_prefix="issue-source",
+        )
+
+    def add_context_source(
+        self,
+        name: str,
+        fetch: Callable[[str], str],
+        timeout: float = 10.0,
+        required: bool = False,
+    ) -> None:
+        """이슈 설명을 받아 텍스트 컨텍스트를 반환하는 소스 등록"""
+        self.extra_sources.append(
+            ContextSource(name, fetch, timeout, required, fallback="")
+        )
 
     def load_vector_store(self) -> None:
         print(f"Get Vector stor: ${self.chroma_persist_dir}")
@@ -67,45 +186,58 @@ class IssueQuerySystem:
             print(f" Error vector load : {e}")
             raise
 
-    def search_relevant_context(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
-        """VectorStore에서 관련된 코드 검색"""
+    def search_relevant_context(
+        self, query: str, k: int = 5, embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """VectorStore에서 관련된 코드 검색
+
+        embedding이 주어지면 질의 임베딩을 다시 계산하지 않고 벡터로 검색"""
         print(f"quety: {query}")
 
         if not self.vectorstore:
             self.load_vector_store()
 
-            # 기존 로드한 github 대상으로 유사도 검색 수행
-            # 현재는 단일 프로젝트로만 가능하나 추후 github를 다중을로 구성하여 쿼리 가능하게끔 구조 개선 필요
+        # 기존 로드한 github 대상으로 유사도 검색 수행
+        # 현재는 단일 프로젝트로만 가능하나 추후 github를 다중을로 구성하여 쿼리 가능하게끔 구조 개선 필요
 
-            # 디폴트 값으로 5개의 유사도를 가진 내용만 가져오게끔 수정
-            # 추후 dense retrival뿐만 아닌, sparse retrival이 가능하게끔 수정
-            # 현재는 정확하게 일치되는 내용을 불러오는것에는 한계가 존재...
+        # 디폴트 값으로 5개의 유사도를 가진 내용만 가져오게끔 수정
+        # 추후 dense retrival뿐만 아닌, sparse retrival이 가능하게끔 수정
+        # 현재는 정확하게 일치되는 내용을 불러오는것에는 한계가 존재...
+        if embedding is not None:
+            # similarity_search_with_score와 같은 (문서, 거리) 결과
+            result = self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                embedding, k=k
+            )
+        else:
             result = self.vectorstore.similarity_search_with_score(query, k=k)
 
-            context_docs = []
-            for doc, score in result:
-                context_docs.append(
-                    {
-                        "content": doc.page_content,
-                        "metadata": doc.metadata,
-                        "similarity_score": float(score),
-                    }
-                )
-                print(
-                    f"content : {doc.page_content}, metadata: {doc.metadata}, score : {float(score)}"
-                )
+        context_docs = []
+        for doc, score in result:
+            # span 기반 청크는 span store에서 원문 복원
+            content = self.span_store.materialize(doc.page_content, doc.metadata)
+            context_docs.append(
+                {
+                    "content": content,
+                    "metadata": doc.metadata,
+                    "similarity_score": float(score),
+                }
+            )
+            print(
+                f"content : {content}, metadata: {doc.metadata}, score : {float(score)}"
+            )
 
-            print(f"관련 검색 code data {len(context_docs)}")
-            print(f"{context_docs}")
+        print(f"관련 검색 code data {len(context_docs)}")
+        print(f"{context_docs}")
 
-            return context_docs
+        return context_docs
 
     def tavily_resarch(self, query: str) -> str:
-        """Tavily API를 활용한 웹검색"""
+        """Tavily API를 활용한 웹검색 (리서치 캐시 경유)"""
+        params = {"search_depth": "advanced", "max_results": 3, "include_answer": True}
         try:
             # Tavily search
-            response = self.tavily_client.search(
-                query=query, search_depth="advanced", max_results=3, include_answer=True
+            response = self.research_cache.search(
+                query, params, lambda: self._search_tavily(query, params)
             )
 
             print(f"response: {response}")
@@ -122,28 +254,102 @@ class IssueQuerySystem:
                 research_content += f"URL: {result.get('url', 'N/A')}\n\n"
 
             return research_content
+        except ResearchCacheMiss as e:
+            print(f"research skipped : {e}")
+            return "External research unavailable (offline, not cached)"
         except Exception as e:
             print(f"research failed : {e}")
             return "api error"
 
+    def _search_tavily(self, query: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        # 캐시 miss로 실제 호출할 때만 속도 예산 사용
+        if self.research_limiter is not None:
+            self.research_limiter.acquire()
+        return self.tavily_client.search(query=query, **params)
+
     def generate_solution(
-        self, issue_description: str, context_docs: List[Dict], resarch_content: str
+        self,
+        issue_description: str,
+        context_docs: List[Dict],
+        resarch_content: str,
+        extra_context: Optional[Dict[str, str]] = None,
+        packed: Optional[PackedContext] = None,
     ) -> str:
         """OpenAI gpt-4 모델로 해결책생성
 
         기존에 tavily에서 외부 research 한것을 포함하여 이슈 해결 준비"""
+        messages = self._solution_messages(
+            issue_description, context_docs, resarch_content, extra_context, packed
+        )
+        try:
+            if self.llm_limiter is not None:
+                self.llm_limiter.acquire()
+            # LangChain을 활용하여 추후 LangSmith 추적에 사용
+            response = self.llm.invoke(messages)
+            solution = response.content
+            return solution
+        except Exception as e:
+            print(f" Error generate : {e}")
+            return f"솔루션 생성중 에러 발생 : {e}"
+
+    async def agenerate_solution(
+        self,
+        issue_description: str,
+        context_docs: List[Dict],
+        resarch_content: str,
+        extra_context: Optional[Dict[str, str]] = None,
+        packed: Optional[PackedContext] = None,
+    ) -> str:
+        """generate_solution의 비동기 버전"""
+        messages = self._solution_messages(
+            issue_description, context_docs, resarch_content, extra_context, packed
+        )
+        try:
+            if self.llm_limiter is not None:
+                await self.llm_limiter.aacquire()
+            response = await self.llm.ainvoke(messages)
+            return response.content
+        except Exception as e:
+            print(f" Error generate : {e}")
+            return f"솔루션 생성중 에러 발생 : {e}"
+
+    async def astream_solution(
+        self,
+        issue_description: str,
+        context_docs: List[Dict],
+        resarch_content: str,
+        extra_context: Optional[Dict[str, str]] = None,
+        packed: Optional[PackedContext] = None,
+    ) -> AsyncIterator[str]:
+        """해결책을 생성되는 대로 텍스트 조각 단위로 반환"""
+        messages = self._solution_messages(
+            issue_description, context_docs, resarch_content, extra_context, packed
+        )
+        try:
+            if self.llm_limiter is not None:
+                await self.llm_limiter.aacquire()
+            async for chunk in self.llm.astream(messages):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            print(f" Error generate : {e}")
+            yield f"솔루션 생성중 에러 발생 : {e}"
+
+    def _solution_messages(
+        self,
+        issue_description: str,
+        context_docs: List[Dict],
+        resarch_content: str,
+        extra_context: Optional[Dict[str, str]] = None,
+        packed: Optional[PackedContext] = None,
+    ) -> List:
+        """해결책 생성 프롬프트 메시지 구성"""
 
         # 코드 질의
-        code_context = ""
-        for i, doc in enumerate(context_docs, 1):
-            code_context += f"Code Snippet {i}:\n"
-            code_context += f"File: {doc['metadata'].get('source','Unknown')}\n"
-            code_context += (
-                f"File Type: {doc['metadata'].get('file_type', 'Unknown')}\n"
-            )
-            code_context += f"Similarity Score: {doc['similarity_score']:.3f}\n"
-            code_context += f"Content:\n{doc['content']}\n"
-            code_context += "-" * 50 + "\n"
+        # 검색 순서(유사도 순) 그대로 토큰 예산 안에 병합/패킹
+        if packed is None:
+            packed = self.context_packer.pack(context_docs, query=issue_description)
+        code_context = packed.text
 
         # 프롬프트 구성
         system_prompt = """당신은 Spring Boot와 Kotlin에 전문성을 가진 시니어 개발자입니다. 
@@ -169,56 +375,360 @@ class IssueQuerySystem:
 
         위 정보를 바탕으로 이슈에 대한 종합적인 해결책을 제시해주세요.
         """
+        for name, content in (extra_context or {}).items():
+            if content:
+                user_prompt += f"\n{name} :\n{content}\n"
+
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt),
+        ]
+
+    def resolve_issue(
+        self, issue_description: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """전체 이슈 해결 파이프라인 (aresolve_issue 동기 실행)
+
+        use_cache=False 이면 시맨틱 캐시를 무시하고 항상 새로 생성"""
+        return asyncio.run(self.aresolve_issue(issue_description, use_cache))
+
+    async def aresolve_issue(
+        self, issue_description: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """비동기 이슈 해결 파이프라인
+
+        이슈 임베딩/캐시 조회, 코드 검색, 외부 리서치를 동시에 시작하고 (캐시 적중시 소스 취소)
+        필수 소스가 모두 준비되면 바로 해결책 생성 (단계별 소요 시간은 timings에 기록)"""
+        async for event in self._resolve_events(
+            issue_description, use_cache, stream=False
+        ):
+            if event["event"] == "final":
+                return event["result"]
+
+    def resolve_issue_streaming(
+        self, issue_description: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """해결책을 생성되는 대로 터미널에 출력하고 리포트 파일도 점진적으로 작성"""
+        return asyncio.run(
+            self.aresolve_issue_streaming(issue_description, use_cache)
+        )
 
-        try:
-            # LangChain을 활용하여 추후 LangSmith 추적에 사용
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt),
-            ]
+    async def aresolve_issue_streaming(
+        self, issue_description: str, use_cache: bool = True, path: str = REPORT_PATH
+    ) -> Dict[str, Any]:
+        result = {}
+        async for event in self.astream_resolution_report(
+            issue_description, use_cache, path
+        ):
+            if event["event"] == "context":
+                print("\n--- Solution (streaming) ---", flush=True)
+            elif event["event"] == "token":
+                print(event["text"], end="", flush=True)
+            elif event["event"] == "final":
+                result = event["result"]
+        timings = result.get("timings", {})
+        if "first_token" in timings:
+            print(
+                f"\n--- first token {timings['first_token']:.0f} ms, "
+                f"total {timings['total']:.0f} ms, "
+                f"{result['generation_tokens']['completion']} tokens ---"
+            )
+        return result
 
-            response = self.llm.invoke(messages)
-            solution = response.content
-            return solution
-        except Exception as e:
-            print(f" Error generate : {e}")
-            return f"솔루션 생성중 에러 발생 : {e}"
+    async def astream_resolve_issue(
+        self, issue_description: str, use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """스트리밍 이슈 해결 파이프라인
 
-    def resolve_issue(self, issue_description: str) -> Dict[str, Any]:
-        """전체 이슈 해결 파이프라인"""
-        print(f"Starting issue resolution for: {issue_description}")
+        이벤트 순서: context (컨텍스트 준비 완료) → token (해결책 조각, 여러 번) → final
+        시맨틱 캐시 hit이면 final만 반환"""
+        async for event in self._resolve_events(
+            issue_description, use_cache, stream=True
+        ):
+            yield event
 
-        # 1. 관련 코드 컨텍스트 검색
-        context_docs = self.search_relevant_context(issue_description)
+    async def _resolve_events(
+        self, issue_description: str, use_cache: bool, stream: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        print(f"Starting issue resolution for: {issue_description}")
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        # 이슈 임베딩은 캐시 조회와 코드 검색이 함께 사용 (한 번만 계산)
+        embedding_task = asyncio.create_task(
+            self._timed(
+                timings,
+                "embedding",
+                self._in_thread(self.embeddings.embed_query, issue_description),
+            )
+        )
+        # 임베딩 왕복을 기다리지 않도록 소스는 바로 시작 (캐시 적중시 취소)
+        source_tasks = self._start_sources(issue_description, embedding_task, timings)
 
-        # 2. 외부 리서치 수행
-        research_query = f"spring boot kotlin {issue_description} solution"
-        research_content = self.tavily_resarch(research_query)
+        # 0. 같은 인덱스 세대에서 거의 동일한 이슈를 해결한 적이 있으면 그대로 반환
+        try:
+            issue_embedding = await embedding_task
+        except BaseException:
+            self._cancel(source_tasks)
+            raise
+        generation = self.index_generation.current()
+        if use_cache:
+            cached = self.semantic_cache.lookup(issue_embedding, generation)
+            if cached is not None:
+                self._cancel(source_tasks)
+                timings["total"] = (time.perf_counter() - started) * 1000
+                print(
+                    f"Semantic cache hit (similarity {cached['similarity']:.3f}): "
+                    f"{cached['issue']}"
+                )
+                result = {
+                    **cached["resolution"],
+                    "issue": issue_description,
+                    "cache": {
+                        "hit": True,
+                        "similarity": cached["similarity"],
+                        "cached_issue": cached["issue"],
+                        "cached_at": datetime.fromtimestamp(
+                            cached["created_at"]
+                        ).isoformat(),
+                    },
+                    "timings": timings,
+                }
+                yield {"event": "final", "result": result}
+                return
+
+        # 1. 필수 소스(코드 검색, 외부 리서치)가 준비될 때까지 대기
+        outcomes = await self._gather_sources(source_tasks)
+        context_docs = outcomes["retrieval"]["value"]
+        research_content = outcomes["research"]["value"]
+        extra_context = {
+            source.name: outcomes[source.name]["value"]
+            for source in self.extra_sources
+        }
 
-        # 3. 해결책 생성
-        solution = self.generate_solution(
-            issue_description, context_docs, research_content
-        )
+        # 2. 검색된 청크를 인접 청크/함수로 확장하고 토큰 예산 안에 패킹 후 해결책 생성
+        expansion = None
+        if self.neighbor_expander is not None:
+            expansion_started = time.perf_counter()
+            context_docs, expansion = self.neighbor_expander.expand(
+                context_docs, self.context_expansion, self.expansion_window
+            )
+            timings["expansion"] = (time.perf_counter() - expansion_started) * 1000
+
+        packing_started = time.perf_counter()
+        packed = self.context_packer.pack(context_docs, query=issue_description)
+        timings["packing"] = (time.perf_counter() - packing_started) * 1000
+        relevant_files = [
+            doc["metadata"].get("source", "Unknown") for doc in context_docs
+        ]
+        sources = {name: outcome["status"] for name, outcome in outcomes.items()}
+
+        generation_started = time.perf_counter()
+        chunks = 0
+        if stream:
+            yield {
+                "event": "context",
+                "issue": issue_description,
+                "relevant_files": relevant_files,
+                "sources": sources,
+                "context_tokens": packed.stats(),
+                "cache": {"hit": False},
+                "timings": dict(timings),
+            }
+            parts = []
+            async for text in self.astream_solution(
+                issue_description, context_docs, research_content, extra_context, packed
+            ):
+                if not parts:
+                    # 파이프라인 시작부터 첫 토큰까지 (체감 지연)
+                    timings["first_token"] = (time.perf_counter() - started) * 1000
+                parts.append(text)
+                chunks += 1
+                yield {"event": "token", "text": text}
+            solution = "".join(parts)
+        else:
+            solution = await self.agenerate_solution(
+                issue_description, context_docs, research_content, extra_context, packed
+            )
+        timings["generation"] = (time.perf_counter() - generation_started) * 1000
 
         # 결과 정리
         result = {
             "issue": issue_description,
-            "relevant_files": [
-                doc["metadata"].get("source", "Unknown") for doc in context_docs
-            ],
+            "relevant_files": relevant_files,
             "context_docs": context_docs,
             "research_content": research_content,
             "solution": solution,
         }
+        if extra_context:
+            result["extra_context"] = extra_context
+
+        # 생성 실패 결과나 컨텍스트 소스가 실패한 결과는 캐시하지 않음
+        sources_ok = all(o["status"] == "ok" for o in outcomes.values())
+        if sources_ok and not solution.startswith("솔루션 생성중 에러 발생"):
+            self.semantic_cache.store(
+                issue_description, issue_embedding, generation, result
+            )
+        result["cache"] = {"hit": False}
+        result["context_tokens"] = packed.stats()
+        if expansion is not None:
+            result["context_expansion"] = expansion
+        result["sources"] = sources
+        messages = self._solution_messages(
+            issue_description, context_docs, research_content, extra_context, packed
+        )
+        result["generation_tokens"] = {
+            "prompt": sum(self.context_packer.count_tokens(m.content) for m in messages),
+            "completion": self.context_packer.count_tokens(solution),
+            "stream_chunks": chunks,
+        }
+        timings["total"] = (time.perf_counter() - started) * 1000
+        result["timings"] = timings
 
-        print("Issue resolution completed!")
-        return result
+        print(f"Issue resolution completed! timings(ms): {timings}")
+        yield {"event": "final", "result": result}
+
+    def _context_sources(
+        self, issue_description: str, embedding_task: asyncio.Task
+    ) -> List[ContextSource]:
+        research_query = f"spring boot kotlin {issue_description} solution"
+        return [
+            ContextSource(
+                "retrieval",
+                lambda issue: self.search_relevant_context(
+                    issue, embedding=embedding_task.result()
+                ),
+                self.retrieval_timeout,
+                required=True,
+                fallback=[],
+            ),
+            ContextSource(
+                "research",
+                lambda issue: self.tavily_resarch(research_query),
+                self.research_timeout,
+                required=self.research_required,
+                fallback="External research unavailable",
+            ),
+            *self.extra_sources,
+        ]
+
+    def _start_sources(
+        self,
+        issue_description: str,
+        embedding_task: asyncio.Task,
+        timings: Dict[str, float],
+    ) -> Dict[str, tuple]:
+        """컨텍스트 소스를 모두 동시에 시작 (name -> (소스, 태스크))"""
+
+        async def run(source: ContextSource) -> Any:
+            # 코드 검색은 이슈 임베딩이 준비된 뒤 벡터로 검색
+            if source.name == "retrieval":
+                await asyncio.shield(embedding_task)
+            fetch = self._in_thread(source.fetch, issue_description)
+            return await self._timed(
+                timings, source.name, asyncio.wait_for(fetch, source.timeout)
+            )
+
+        return {
+            source.name: (source, asyncio.create_task(run(source)))
+            for source in self._context_sources(issue_description, embedding_task)
+        }
+
+    async def _gather_sources(
+        self, source_tasks: Dict[str, tuple]
+    ) -> Dict[str, Dict[str, Any]]:
+        """필수 소스 완료(또는 타임아웃)까지 대기, 이후 끝나지 않은 선택 소스는 취소
+
+        실패/타임아웃한 소스는 fallback 값 사용"""
+        required = [task for source, task in source_tasks.values() if source.required]
+        if required:
+            await asyncio.wait(required)
+
+        outcomes = {}
+        for name, (source, task) in source_tasks.items():
+            if not task.done():
+                task.cancel()
+                outcomes[name] = {"status": "skipped", "value": source.fallback}
+            elif task.cancelled():
+                outcomes[name] = {"status": "cancelled", "value": source.fallback}
+            elif isinstance(task.exception(), asyncio.TimeoutError):
+                print(f"context source {name} timed out ({source.timeout}s)")
+                outcomes[name] = {"status": "timeout", "value": source.fallback}
+            elif task.exception() is not None:
+                print(f"context source {name} failed : {task.exception()}")
+                outcomes[name] = {"status": "error", "value": source.fallback}
+            else:
+                outcomes[name] = {"status": "ok", "value": task.result()}
+        return outcomes
+
+    async def _timed(self, timings: Dict[str, float], stage: str, awaitable) -> Any:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = (time.perf_counter() - started) * 1000
 
-    def print_resolution_report(self, result: Dict[str, Any]) -> None:
-        """해결책 리포트를 report/result-query.md 파일에 저장"""
+    def _in_thread(self, fn: Callable, *args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.source_executor, fn, *args)
+
+    def _cancel(self, source_tasks: Dict[str, tuple]) -> None:
+        for _, task in source_tasks.values():
+            task.cancel()
+
+    def print_resolution_report(
+        self, result: Dict[str, Any], path: str = REPORT_PATH
+    ) -> None:
+        """해결책 리포트를 report/result-query.md (또는 path) 파일에 저장"""
 
         # report 디렉토리 생성
-        os.makedirs("report", exist_ok=True)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        report_content = (
+            self._report_header(result)
+            + f"{result['solution']}\n"
+            + self._report_footer(result)
+        )
+
+        # 파일에 저장
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report_content)
+
+        print(f"✅ Resolution report saved to: {path}")
+
+    async def astream_resolution_report(
+        self, issue_description: str, use_cache: bool = True, path: str = REPORT_PATH
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """스트리밍 이슈 해결 이벤트를 그대로 반환하면서 리포트 파일을 점진적으로 작성
+
+        컨텍스트 준비시 헤더, 토큰 도착시 해결책 본문, 완료시 나머지 섹션을 기록"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        report = None
+        try:
+            async for event in self.astream_resolve_issue(
+                issue_description, use_cache
+            ):
+                if event["event"] == "context":
+                    report = open(path, "w", encoding="utf-8")
+                    report.write(self._report_header(event))
+                    report.flush()
+                elif event["event"] == "token" and report is not None:
+                    report.write(event["text"])
+                    report.flush()
+                elif event["event"] == "final":
+                    if report is None:
+                        # 캐시 hit 등 토큰 스트림 없이 완료된 경우
+                        self.print_resolution_report(event["result"], path)
+                    else:
+                        report.write("\n" + self._report_footer(event["result"]))
+                        print(f"✅ Resolution report saved to: {path}")
+                yield event
+        finally:
+            if report is not None:
+                report.close()
+
+    def _report_header(self, result: Dict[str, Any]) -> str:
+        """리포트의 해결책 본문 앞부분 (이슈, 관련 파일, 캐시 정보)"""
 
         # 리포트 내용 생성
         report_content = f"""# Issue Resolution Report
@@ -234,7 +744,54 @@ class IssueQuerySystem:
         for file in result["relevant_files"][:5]:  # 최대 5개만 표시
             report_content += f"- {file}\n"
 
-        report_content += f"\n## 🤖 Solution\n{result['solution']}\n"
+        cache_info = result.get("cache") or {}
+        if cache_info.get("hit"):
+            report_content += (
+                f"\n> 유사 이슈 캐시 결과 (similarity {cache_info['similarity']:.3f}, "
+                f"{cache_info['cached_at']}): {cache_info['cached_issue']}\n"
+            )
+
+        report_content += "\n## 🤖 Solution\n"
+        return report_content
+
+    def _report_footer(self, result: Dict[str, Any]) -> str:
+        """리포트의 해결책 본문 뒷부분 (소요 시간, 토큰 수, 외부 리서치)"""
+        report_content = ""
+
+        timings = result.get("timings") or {}
+        if timings:
+            report_content += "\n## ⏱ Timings (ms)\n"
+            for stage, elapsed in timings.items():
+                report_content += f"- {stage}: {elapsed:.0f}\n"
+
+        context_tokens = result.get("context_tokens")
+        if context_tokens:
+            report_content += (
+                f"\n## 🧮 Context Tokens\n"
+                f"- packed: {context_tokens['packed_tokens']} "
+                f"/ raw: {context_tokens['raw_tokens']} "
+                f"(budget {context_tokens['budget']})\n"
+            )
+            expansion = result.get("context_expansion")
+            if expansion:
+                report_content += (
+                    f"- expansion ({expansion['mode']}): "
+                    f"+{expansion['added_tokens']} tokens, "
+                    f"{expansion['input']} → {expansion['output']} chunks\n"
+                )
+            compression = context_tokens.get("compression")
+            if compression:
+                report_content += (
+                    f"- compression: {compression['ratio']:.2f} "
+                    f"({compression['elapsed_ms']:.1f} ms)\n"
+                )
+
+        generation_tokens = result.get("generation_tokens")
+        if generation_tokens:
+            report_content += (
+                f"- prompt: {generation_tokens['prompt']} "
+                f"/ completion: {generation_tokens['completion']}\n"
+            )
 
         if (
             result["research_content"]
@@ -246,11 +803,7 @@ class IssueQuerySystem:
             if len(result["research_content"].split("\n")) > 10:
                 report_content += "\n\n... (more research results available)"
 
-        # 파일에 저장
-        with open("report/result-query.md", "w", encoding="utf-8") as f:
-            f.write(report_content)
-
-        print(f"✅ Resolution report saved to: report/result-query.md")
+        return report_content
 
 
 def main():
@@ -263,21 +816,45 @@ def main():
         help="if you need to cetain chromDB check this option",
         default="./chroma_db",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the semantic answer cache and always generate a new solution",
+    )
+    parser.add_argument(
+        "--offline-research",
+        action="store_true",
+        help="Serve external research only from the research cache (no Tavily calls)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the solution as it is generated and write the report incrementally",
+    )
 
     args = parser.parse_args()
 
     if args.persist_dir:
         os.environ["CHROMA_PERSIST_DIRECTORY"] = args.persist_dir
+    if args.offline_research:
+        os.environ["RESEARCH_CACHE_OFFLINE"] = "true"
 
     try:
         # 쿼리 초기화
         query_system = IssueQuerySystem()
 
-        # 이슈 해결
-        result = query_system.resolve_issue(args.issue)
+        # 이슈 해결 (스트리밍 모드는 리포트를 생성 중에 저장)
+        if args.stream:
+            query_system.resolve_issue_streaming(
+                args.issue, use_cache=not args.no_cache
+            )
+        else:
+            result = query_system.resolve_issue(
+                args.issue, use_cache=not args.no_cache
+            )
 
-        # 리포트 생성 및 저장
-        query_system.print_resolution_report(result)
+            # 리포트 생성 및 저장
+            query_system.print_resolution_report(result)
         print(f"Issue resolution completed successfully!")
 
     except Exception as e:
@@ -0,0 +1,130 @@
+"""
+점수 융합 마이크로 벤치마크
+
+기존 dict 기반 RRF(본문 앞부분 키, 전체 정렬)와 FusionEngine(정수 id, NumPy)을
+같은 후보 집합으로 비교하고 top-k 일치 여부, 실행 시간, 할당 메모리를 출력
+
+실행: python benchmarks/fusion_benchmark.py [--depth 50] [--k 5] [--repeat 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.fusion_engine import FusionEngine  # noqa: E402
+
+
+def legacy_rrf(dense, sparse, dense_weight, sparse_weight, k=60):
+    """기존 _combine_with_rrf 구현"""
+    doc_scores = {}
+    for rank, doc in enumerate(dense):
+        doc_id = doc["id"]
+        rrf_score = dense_weight / (k + rank + 1)
+        doc_scores[doc_id] = {
+            "score": doc_scores.get(doc_id, {}).get("score", 0) + rrf_score,
+            "document": doc,
+        }
+    for rank, doc in enumerate(sparse):
+        doc_id = doc["id"]
+        rrf_score = sparse_weight / (k + rank + 1)
+        if doc_id in doc_scores:
+            doc_scores[doc_id]["score"] += rrf_score
+        else:
+            doc_scores[doc_id] = {"score": rrf_score, "document": doc}
+    sorted_results = sorted(doc_scores.values(), key=lambda x: x["score"], reverse=True)
+    return [item["document"]["id"] for item in sorted_results]
+
+
+def make_candidates(depth: int, corpus: int, seed: int):
+    rng = random.Random(seed)
+    dense = [
+        {"id": f"chunk:{i}", "score": 1.0 - r / depth}
+        for r, i in enumerate(rng.sample(range(corpus), depth))
+    ]
+    sparse = [
+        {"id": f"chunk:{i}", "score": float(depth - r)}
+        for r, i in enumerate(rng.sample(range(corpus), depth))
+    ]
+    return dense, sparse
+
+
+def engine_rrf(engine, dense, sparse, dense_weight, sparse_weight, k):
+    id_map = {}
+    dense_ids = np.fromiter(
+        (id_map.setdefault(d["id"], len(id_map)) for d in dense), dtype=np.int64
+    )
+    sparse_ids = np.fromiter(
+        (id_map.setdefault(d["id"], len(id_map)) for d in sparse), dtype=np.int64
+    )
+    scores = [
+        np.fromiter((d["score"] for d in dense), dtype=np.float64),
+        np.fromiter((d["score"] for d in sparse), dtype=np.float64),
+    ]
+    top_ids, _ = engine.fuse(
+        [dense_ids, sparse_ids],
+        scores,
+        [dense_weight, sparse_weight],
+        k,
+        size=len(id_map),
+    )
+    keys = list(id_map)
+    return [keys[i] for i in top_ids]
+
+
+def measure(fn, repeat: int):
+    seconds = timeit.timeit(fn, number=repeat) / repeat
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def report(name: str, seconds: float, peak: int) -> None:
+    print(f"{name:<20} {seconds * 1e6:8.1f} us/call  peak {peak / 1024:6.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--corpus", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    dense, sparse = make_candidates(args.depth, args.corpus, seed=7)
+    engine = FusionEngine("rrf")
+
+    expected = legacy_rrf(dense, sparse, 0.6, 0.4)[: args.k]
+    actual = engine_rrf(engine, dense, sparse, 0.6, 0.4, args.k)
+    print(f"top-{args.k} 일치: {expected == actual}")
+
+    for name, fn in [
+        ("legacy dict RRF", lambda: legacy_rrf(dense, sparse, 0.6, 0.4)[: args.k]),
+        (
+            "FusionEngine rrf",
+            lambda: engine_rrf(engine, dense, sparse, 0.6, 0.4, args.k),
+        ),
+    ]:
+        seconds, peak = measure(fn, args.repeat)
+        report(name, seconds, peak)
+
+    for strategy in ("combsum", "combmnz"):
+        for normalization in FusionEngine.NORMALIZATIONS:
+            engine = FusionEngine(strategy, normalization)
+            seconds, peak = measure(
+                lambda: engine_rrf(engine, dense, sparse, 0.6, 0.4, args.k),
+                args.repeat,
+            )
+            report(f"{strategy}/{normalization}", seconds, peak)
+
+
+if __name__ == "__main__":
+    main()
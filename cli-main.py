@@ -5,12 +5,23 @@ RAG System Main CLI Interface
 추후 MCP 서버로 전환하여 멀티에이전트에서 tool로써 사용 가능하게끔 전환 예정
 """
 
+import time
+
+# 시작 오버헤드 측정 기준 시각 (무거운 import 이전)
+PROCESS_STARTED = time.perf_counter()
+
 import os
 import sys
 import argparse
 from pathlib import Path
-from RagPipeline.crawl import RepositoryCrawler
-from RagPipeline.query import IssueQuerySystem
+
+# langchain / openai / chromadb를 불러오는 모듈은 필요한 서브커맨드에서만 import
+# (ask 서브커맨드는 데몬에 요청만 전달하므로 표준 라이브러리만 사용)
+from RagPipeline.daemon_client import DaemonClient, DaemonUnavailable
+
+
+def elapsed_ms() -> float:
+    return (time.perf_counter() - PROCESS_STARTED) * 1000
 
 
 def main():
@@ -25,6 +36,15 @@ def main():
   # Issue resolution
   python main.py query --issue "ISSUE-2: 데이터 영속성 문제"
   
+  # Batch issue resolution (한 줄에 이슈 하나, "-" 이면 표준입력)
+  python main.py batch --issues issues.txt --concurrency 8 --llm-rpm 60
+  
+  # Warm process (인덱스/클라이언트를 한 번만 로드)
+  python main.py repl
+  python main.py daemon start &
+  python main.py ask --issue "Spring Boot database issue" --stream
+  python main.py daemon stop
+  
   # Custom persist directory
   python main.py crawling --repo https://github.com/riverfrot/sample-spring --persist-dir ./custom_db
   python main.py query --issue "Spring Boot database issue" --persist-dir ./custom_db
@@ -62,6 +82,122 @@ def main():
         default="./chroma_db",
         help="ChromaDB persist directory (default: ./chroma_db)",
     )
+    query_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the semantic answer cache and always generate a new solution",
+    )
+    query_parser.add_argument(
+        "--offline-research",
+        action="store_true",
+        help="Serve external research only from the research cache (no Tavily calls)",
+    )
+    query_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the solution as it is generated and write the report incrementally",
+    )
+
+    # batch 서브커맨드
+    batch_parser = subparsers.add_parser(
+        "batch", help="Resolve many issues concurrently from a file or stdin"
+    )
+    batch_parser.add_argument(
+        "--issues",
+        required=True,
+        help='Issue file, one issue per line or JSONL {"id", "issue"} ("-" = stdin)',
+    )
+    batch_parser.add_argument(
+        "--persist-dir",
+        default="./chroma_db",
+        help="ChromaDB persist directory (default: ./chroma_db)",
+    )
+    batch_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("ISSUE_BATCH_CONCURRENCY", "4")),
+        help="Issues resolved at the same time (default: 4)",
+    )
+    batch_parser.add_argument(
+        "--llm-rpm",
+        type=float,
+        default=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60")),
+        help="LLM requests per minute, 0 = unlimited (default: 60)",
+    )
+    batch_parser.add_argument(
+        "--research-rpm",
+        type=float,
+        default=float(os.getenv("RESEARCH_REQUESTS_PER_MINUTE", "60")),
+        help="Research API requests per minute, 0 = unlimited (default: 60)",
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        default="report/batch",
+        help="Directory for per-issue reports and summary (default: report/batch)",
+    )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the semantic answer cache and always generate new solutions",
+    )
+    batch_parser.add_argument(
+        "--offline-research",
+        action="store_true",
+        help="Serve external research only from the research cache (no Tavily calls)",
+    )
+
+    # repl 서브커맨드
+    repl_parser = subparsers.add_parser(
+        "repl", help="Interactive issue resolution in one warm process"
+    )
+    repl_parser.add_argument(
+        "--persist-dir",
+        default="./chroma_db",
+        help="ChromaDB persist directory (default: ./chroma_db)",
+    )
+    repl_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the semantic answer cache and always generate new solutions",
+    )
+    repl_parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print each solution when it is complete instead of streaming",
+    )
+
+    # daemon 서브커맨드
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Run or control the warm issue resolution daemon"
+    )
+    daemon_parser.add_argument("action", choices=["start", "stop", "status"])
+    daemon_parser.add_argument(
+        "--persist-dir",
+        default="./chroma_db",
+        help="ChromaDB persist directory (default: ./chroma_db)",
+    )
+    daemon_parser.add_argument(
+        "--socket", help="Unix socket path (default: $RAG_DAEMON_SOCKET or tmp dir)"
+    )
+
+    # ask 서브커맨드 (데몬에 질의 전달)
+    ask_parser = subparsers.add_parser(
+        "ask", help="Resolve an issue through the running daemon"
+    )
+    ask_parser.add_argument("--issue", required=True, help="Issue description")
+    ask_parser.add_argument(
+        "--socket", help="Unix socket path (default: $RAG_DAEMON_SOCKET or tmp dir)"
+    )
+    ask_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the semantic answer cache and always generate a new solution",
+    )
+    ask_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the solution as it is generated",
+    )
 
     args = parser.parse_args()
 
@@ -70,12 +206,15 @@ def main():
         return
 
     # 환경 변수 설정
-    os.environ["CHROMA_PERSIST_DIRECTORY"] = args.persist_dir
+    if getattr(args, "persist_dir", None):
+        os.environ["CHROMA_PERSIST_DIRECTORY"] = args.persist_dir
 
     if args.command == "crawling":
         print("Start Repository Crawling...")
 
         try:
+            from RagPipeline.crawl import RepositoryCrawler
+
             crawler = RepositoryCrawler()
             crawler.crawl_repository(args.repo)
 
@@ -86,16 +225,64 @@ def main():
             print(f"Crawling failed: {e}")
             sys.exit(1)
 
+    elif args.command == "batch":
+        print("Starting Batch Issue Resolution...")
+        if args.offline_research:
+            os.environ["RESEARCH_CACHE_OFFLINE"] = "true"
+
+        try:
+            from RagPipeline.batch import resolve_issue_file
+
+            summary = resolve_issue_file(
+                args.issues,
+                concurrency=args.concurrency,
+                llm_per_minute=args.llm_rpm,
+                research_per_minute=args.research_rpm,
+                output_dir=args.output_dir,
+                use_cache=not args.no_cache,
+            )
+            print(
+                f"Resolved {summary['issues']} issues {summary['statuses']} "
+                f"in {summary['wall_seconds']:.1f}s "
+                f"({summary['issues_per_minute']:.1f} issues/min)"
+            )
+
+        except Exception as e:
+            print(f"Batch failed: {e}")
+            sys.exit(1)
+
     elif args.command == "query":
         print("Starting Issue Resolution...")
+        if args.offline_research:
+            os.environ["RESEARCH_CACHE_OFFLINE"] = "true"
 
         try:
+            from RagPipeline.query import IssueQuerySystem
+
             query_system = IssueQuerySystem()
-            result = query_system.resolve_issue(args.issue)
-            
-            # 리포트 생성 및 저장
-            query_system.print_resolution_report(result)
+            if args.stream:
+                result = query_system.resolve_issue_streaming(
+                    args.issue, use_cache=not args.no_cache
+                )
+            else:
+                result = query_system.resolve_issue(
+                    args.issue, use_cache=not args.no_cache
+                )
+
+            # 유사 이슈 캐시 결과인 경우 새로 생성하는 방법 안내
+            if result.get("cache", {}).get("hit"):
+                print(
+                    "Reused cached resolution of a similar issue "
+                    f"(similarity {result['cache']['similarity']:.3f}): "
+                    f"{result['cache']['cached_issue']}"
+                )
+                print("Run again with --no-cache to generate a new solution.")
+
+            # 리포트 생성 및 저장 (스트리밍 모드는 생성 중에 저장됨)
+            if not args.stream:
+                query_system.print_resolution_report(result)
             print(f"Issue resolution completed successfully!")
+            print_overhead(result)
 
         except Exception as e:
             print(f"Query failed: {e}")
@@ -105,5 +292,92 @@ def main():
             sys.exit(1)
 
 
+    elif args.command == "repl":
+        try:
+            from RagPipeline.daemon import run_repl, warm_query_system
+
+            query_system = warm_query_system()
+        except Exception as e:
+            print(f"REPL startup failed: {e}")
+            sys.exit(1)
+        run_repl(
+            query_system,
+            use_cache=not args.no_cache,
+            stream=not args.no_stream,
+            startup_ms=elapsed_ms(),
+        )
+
+    elif args.command == "daemon":
+        client = DaemonClient(args.socket)
+        if args.action == "start":
+            try:
+                from RagPipeline.daemon import IssueDaemon, warm_query_system
+
+                daemon = IssueDaemon(warm_query_system(), client.socket_path)
+                print(f"Daemon warmed up in {elapsed_ms():.0f} ms")
+                daemon.run()
+            except Exception as e:
+                print(f"Daemon failed: {e}")
+                sys.exit(1)
+        else:
+            try:
+                response = client.call("shutdown" if args.action == "stop" else "stats")
+            except DaemonUnavailable as e:
+                print(e)
+                sys.exit(1)
+            print(response)
+
+    elif args.command == "ask":
+        ask_daemon(args)
+
+
+def ask_daemon(args) -> None:
+    """데몬에 이슈를 전달하고 응답을 출력 (무거운 모듈 import 없음)"""
+    connected_ms = None
+    server_ms = None
+    result = {}
+    try:
+        events = DaemonClient(args.socket).resolve(
+            args.issue, use_cache=not args.no_cache, stream=args.stream
+        )
+        for event in events:
+            if connected_ms is None:
+                connected_ms = elapsed_ms()
+            if event["event"] == "context":
+                print("--- Solution (streaming) ---", flush=True)
+            elif event["event"] == "token":
+                print(event["text"], end="", flush=True)
+            elif event["event"] == "error":
+                print(f"Query failed: {event['error']}")
+                sys.exit(1)
+            elif event["event"] == "final":
+                result = event["result"]
+                server_ms = event.get("server_ms")
+                if not args.stream:
+                    print(result["solution"])
+                print(f"\n✅ Resolution report saved to: {event['report']}")
+    except DaemonUnavailable as e:
+        print(e)
+        print("Start it first: python main.py daemon start")
+        sys.exit(1)
+    if connected_ms is not None and server_ms is not None:
+        print(
+            f"client startup {connected_ms:.0f} ms, daemon request {server_ms:.0f} ms"
+        )
+    print_overhead(result)
+
+
+def print_overhead(result) -> None:
+    """프로세스 시작부터 응답까지 시간 중 파이프라인 외 오버헤드(import, 초기화 등)"""
+    pipeline = (result or {}).get("timings", {}).get("total")
+    if pipeline is None:
+        return
+    total = elapsed_ms()
+    print(
+        f"start-to-answer {total:.0f} ms "
+        f"(pipeline {pipeline:.0f} ms, overhead {total - pipeline:.0f} ms)"
+    )
+
+
 if __name__ == "__main__":
     main()
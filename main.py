@@ -3,30 +3,96 @@ RAG System Main MCP 서버
 통합 MCP 서버로 추후 멀티 에이전트에게 도구를 제공하는 역할로써 사용 예정
 """
 
-from fastmcp import FastMCP
+import os
+from typing import List
+from fastmcp import FastMCP, Context
 from src.controllers.repository_controller import RepositoryController
 from src.controllers.memory_controller import MemoryController
 from src.controllers.ensemble_controller import EnsembleRetrievalController
+from src.controllers.symbol_controller import SymbolController
 from src.services.repository_service import RepositoryService
 from src.services.memory_service import MemoryService
 from src.services.ensemble_service import EnsembleRetrievalService
+from src.services.symbol_service import SymbolService
+from src.services.neighbor_expander import NeighborExpander
+from src.services.query_router import QueryRouter
+from src.services.fusion_engine import FusionEngine
 from src.infrastructure.retrievers.dense_retriever import DenseReriever
 from src.infrastructure.retrievers.sparse_retriever import SparseRetriever
+from src.infrastructure.retrievers.sharded_search import (
+    ShardedSearcher,
+    shard_index_dir,
+)
 from src.infrastructure.memory.conversation_store import ConversationStore
+from src.infrastructure.storage.span_store import SpanStore
+from src.infrastructure.storage.positional_index import PositionalIndex
+from src.infrastructure.symbols.symbol_table import SymbolTable
+from src.infrastructure.storage.index_generation import IndexGeneration
+from src.infrastructure.cache.disk_cache import DiskCache
+from src.infrastructure.cache.search_result_cache import SearchResultCache
+from src.infrastructure.embeddings.embedding_coalescer import EmbeddingCoalescer
+from src.infrastructure.concurrency.single_flight import SingleFlight
+from src.infrastructure.concurrency.hedging import Hedger
+from src.infrastructure.concurrency.executors import WorkloadExecutors
 from src.config import settings
+from RagPipeline.query import IssueQuerySystem
 
 
 # Global services and controllers initialization
 config = settings.load_config()
 repo_service = RepositoryService()
 
+# 작업 종류별 전용 실행기 (BM25 점수 / dense 조회 / 임베딩 API 등 I/O)
+executors = WorkloadExecutors.create(
+    workers={
+        "sparse": config.sparse_executor_workers,
+        "dense": config.dense_executor_workers,
+        "io": config.io_executor_workers,
+    },
+    concurrency={
+        "sparse": config.sparse_executor_concurrency,
+        "dense": config.dense_executor_concurrency,
+        "io": config.io_executor_concurrency,
+    },
+)
+
 # 벡터스토어와 문서 로드 (없으면 None으로 초기화)
 try:
     vector_store = repo_service.load_vector_store(config.persist_directory)
     documents = repo_service.load_crawled_documents(config.persist_directory)
+    span_store = SpanStore.for_persist_dir(
+        config.persist_directory, config.span_cache_size
+    )
 
-    dense_retriever = DenseReriever(vector_store)
-    sparse_retriever = SparseRetriever(documents) if documents else None
+    # 동시 요청된 질의 임베딩을 짧은 window 동안 모아 한 번에 요청
+    # 최근 지연시간 p95를 넘긴 임베딩 요청은 한 번 더 보내 먼저 끝난 결과 사용
+    hedger = (
+        Hedger(config.embedding_hedge_percentile, executors=executors)
+        if config.embedding_hedge_percentile > 0
+        else None
+    )
+    coalescer = (
+        EmbeddingCoalescer(
+            repo_service.embeddings,
+            config.embedding_batch_window_ms,
+            config.embedding_batch_max_size,
+            hedger,
+            executors,
+        )
+        if config.embedding_batch_window_ms > 0
+        else None
+    )
+    dense_retriever = DenseReriever(
+        vector_store,
+        span_store,
+        repo_service.embeddings,
+        coalescer,
+        hedger,
+        executors,
+    )
+    sparse_retriever = (
+        SparseRetriever(documents, span_store, executors) if documents else None
+    )
 
     print(f"벡터스토어 로드 완료: {len(documents)} 문서")
 except Exception as e:
@@ -34,19 +100,106 @@ except Exception as e:
     #추후 멀티에이전트에서 먼저 백터스토어에 해당내용이 존재하는지 먼저 확인하는 로직이 개발필요할듯
     print(f"벡터스토어 로드 실패 크롤링이 필요: {e}")
     vector_store = None
+    span_store = None
     dense_retriever = None
     sparse_retriever = None
     documents = []
 
+# 샤딩 검색 (인덱스 행렬을 파일로 내보내고 워커 프로세스들이 mmap으로 공유)
+# http 모드면 세대 값을 Chroma 서버에서 읽어 다른 replica의 크롤링도 반영
+index_generation = IndexGeneration(config.persist_directory, repo_service.remote_store)
+sharded_searcher = None
+if (
+    config.search_shards > 0
+    and dense_retriever is not None
+    and not dense_retriever.is_remote
+):
+    shard_dir = shard_index_dir(config.persist_directory, index_generation.current())
+    if not os.path.isdir(shard_dir):
+        dense_retriever.build_shard_index(shard_dir)
+        if sparse_retriever is not None:
+            sparse_retriever.build_shard_index(shard_dir)
+    elif sparse_retriever is not None and not sparse_retriever.shard_index_current(
+        shard_dir
+    ):
+        # 이전 버전/다른 어휘 배치로 만든 sparse 샤드는 다시 생성
+        print("sparse 샤드 인덱스 불일치, 다시 생성")
+        sparse_retriever.build_shard_index(shard_dir)
+    sharded_searcher = ShardedSearcher(shard_dir, config.search_shards)
+    dense_retriever.use_shards(sharded_searcher, index_generation)
+    if sparse_retriever is not None:
+        sparse_retriever.use_shards(sharded_searcher)
+    print(f"샤딩 검색 활성화: {sharded_searcher.stats()['ranges']}")
+
 # Services 초기화
-ensemble_service = EnsembleRetrievalService(dense_retriever, sparse_retriever)
-conversation_store = ConversationStore(config.memory_db_path)
+symbol_table = SymbolTable.load(config.persist_directory)
+symbol_service = SymbolService(symbol_table, span_store)
+# 검색 결과를 앞뒤 청크/감싸는 함수로 확장 (위치 인덱스 조회, 추가 벡터 검색 없음)
+neighbor_expander = (
+    NeighborExpander(
+        PositionalIndex.build(span_store, symbol_table),
+        span_store,
+        config.expansion_token_budget,
+    )
+    if span_store is not None
+    else None
+)
+query_router = QueryRouter(
+    config.router_overfetch_factor,
+    config.router_max_depth,
+    config.router_dense_overfetch_factor,
+    config.router_sparse_overfetch_factor,
+)
+
+# 검색 결과 캐시 (프로세스 내 LRU+TTL, CACHE_DB_PATH 지정시 프로세스 간 공유 디스크 계층)
+result_cache = None
+if config.result_cache_enabled:
+    result_cache = SearchResultCache(
+        index_generation,
+        max_entries=config.result_cache_size,
+        ttl_seconds=config.result_cache_ttl,
+        max_bytes=config.result_cache_max_bytes,
+        disk=(
+            DiskCache(config.cache_db_path, "search_results", config.result_cache_ttl)
+            if config.cache_db_path
+            else None
+        ),
+    )
+
+ensemble_service = EnsembleRetrievalService(
+    dense_retriever,
+    sparse_retriever,
+    symbol_service,
+    query_router,
+    result_cache,
+    SingleFlight(),
+    index_generation,
+    config.search_latency_budget_ms,
+    FusionEngine(
+        config.fusion_strategy, config.fusion_normalization, config.fusion_rrf_k
+    ),
+)
+conversation_store = ConversationStore(
+    config.memory_db_path, executors, config.memory_db_readers
+)
 memory_service = MemoryService(conversation_store)
 
 # Controllers 초기화
 repo_controller = RepositoryController(repo_service)
 memory_controller = MemoryController(memory_service)
-ensemble_controller = EnsembleRetrievalController(ensemble_service)
+ensemble_controller = EnsembleRetrievalController(ensemble_service, neighbor_expander)
+symbol_controller = SymbolController(symbol_service)
+
+# 이슈 해결 파이프라인은 Tavily 키 등이 필요하므로 첫 호출시 생성
+issue_system = None
+
+
+def get_issue_system() -> IssueQuerySystem:
+    global issue_system
+    if issue_system is None:
+        issue_system = IssueQuerySystem()
+    return issue_system
+
 
 # MCP 서버 생성
 mcp = FastMCP(name="advanced-rag-server")
@@ -66,21 +219,106 @@ def analyze_repository_structure(repository_url: str) -> dict:
 
 
 @mcp.tool
-def search_code(query: str, query_type: str = "general", top_k: int = 5) -> dict:
-    """코드 검색 (dense + sparse 앙상블)"""
-    return ensemble_controller.search(query, query_type, top_k)
+async def search_code(
+    query: str,
+    query_type: str = "general",
+    top_k: int = 5,
+    budget_ms: float = None,
+    expand: str = "none",
+    window: int = 1,
+) -> dict:
+    """코드 검색 (쿼리 라우터가 symbol / sparse / dense / hybrid 중 선택)
+
+    budget_ms 안에 dense 검색이 끝나지 않으면 sparse 결과를 degraded로 반환
+    expand: neighbors(앞뒤 window개 청크) | function(감싸는 함수 전체)로 결과 확장"""
+    return await ensemble_controller.search(
+        query, query_type, top_k, budget_ms, expand, window
+    )
 
 
 @mcp.tool
-def search_with_weights(
+async def search_code_stream(
+    query: str, ctx: Context, query_type: str = "general", top_k: int = 5
+) -> dict:
+    """코드 검색 결과를 단계별로 스트리밍
+
+    sparse 후보, 융합 순위를 로그 알림(extra에 결과)과 진행률로 먼저 보내고
+    본문이 복원된 최종 결과를 반환. 각 결과의 id로 단계간 대조 가능"""
+    final = {}
+    stages = {"sparse": 1, "fused": 2, "final": 3}
+    async for event in ensemble_controller.search_stream(query, query_type, top_k):
+        await ctx.report_progress(stages[event["event"]], 3, event["event"])
+        if event["event"] == "final":
+            final = event
+        else:
+            await ctx.info(f"search_code_stream:{event['event']}", extra=event)
+    return final
+
+
+@mcp.tool
+async def search_code_batch(
+    queries: List[str], query_type: str = "general", top_k: int = 5
+) -> dict:
+    """여러 질의를 한 번에 코드 검색 (임베딩 1회 요청, 질의별로 각각 융합)"""
+    return await ensemble_controller.search_batch(queries, query_type, top_k)
+
+
+@mcp.tool
+async def search_with_weights(
     query: str, dense_weight: float = 0.6, sparse_weight: float = 0.4, top_k: int = 5
 ) -> dict:
     """가중치를 지정한 앙상블 검색"""
-    return ensemble_controller.search_with_weights(
+    return await ensemble_controller.search_with_weights(
         query, dense_weight, sparse_weight, top_k
     )
 
 
+@mcp.tool
+async def resolve_issue_stream(
+    issue: str, ctx: Context, use_cache: bool = True
+) -> dict:
+    """이슈 해결책을 생성되는 대로 스트리밍
+
+    컨텍스트 준비 정보(관련 파일, 소스 상태)는 로그 알림으로, 해결책 조각은 진행률 메시지로
+    먼저 보내고 최종 결과 반환 (timings에 first_token/total, generation_tokens에 토큰 수)"""
+    final = {}
+    pending = []
+    chunks = 0
+    async for event in get_issue_system().astream_resolve_issue(issue, use_cache):
+        if event["event"] == "context":
+            await ctx.info("resolve_issue_stream:context", extra=event)
+        elif event["event"] == "token":
+            chunks += 1
+            pending.append(event["text"])
+            # 토큰마다 알림을 보내지 않도록 줄 단위 또는 일정 길이로 묶어서 전송
+            if "\n" in event["text"] or sum(map(len, pending)) >= 64:
+                await ctx.report_progress(chunks, None, "".join(pending))
+                pending.clear()
+        else:
+            if pending:
+                await ctx.report_progress(chunks, None, "".join(pending))
+            final = event["result"]
+    return final
+
+
+@mcp.tool
+async def get_search_cache_stats() -> dict:
+    """검색 결과 캐시 hit ratio / 메모리 사용량 / 인덱스 세대 조회"""
+    return await ensemble_controller.cache_stats()
+
+
+@mcp.tool
+async def get_executor_stats() -> dict:
+    """작업 종류별(sparse / dense / io) 실행기 대기열 깊이, 대기/실행 시간 조회"""
+    return executors.stats()
+
+
+@mcp.tool
+async def lookup_symbol(name: str, prefix: bool = False, limit: int = 20) -> dict:
+    """심볼 테이블에서 클래스/함수/메서드/상수 정의 위치 조회 (exact, prefix)"""
+    return await symbol_controller.lookup_symbol(name, prefix, limit)
+
+
 @mcp.tool
 def save_conversation(
     user_id: str, conversation_id: str, message: str, response: str
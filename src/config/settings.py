@@ -4,25 +4,114 @@ from dataclasses import dataclass
 
 @dataclass
 class Config:
+    # embedded: 프로세스마다 로컬 Chroma(persist_directory), http: Chroma 서버 공유
+    vector_db_mode: str
     vector_db_host: str
     vector_db_port: int
     vector_db_collection: str
+    vector_db_timeout: float
+    vector_db_max_connections: int
 
     embedding_model: str
     embedding_dimension: int
 
     persist_directory: str
     memory_db_path: str
+    memory_db_readers: int
+
+    span_cache_size: int
+    expansion_token_budget: int
+
+    router_overfetch_factor: int
+    router_max_depth: int
+    router_dense_overfetch_factor: int
+    router_sparse_overfetch_factor: int
+
+    fusion_strategy: str
+    fusion_normalization: str
+    fusion_rrf_k: int
+
+    search_shards: int
+
+    sparse_executor_workers: int
+    dense_executor_workers: int
+    io_executor_workers: int
+    sparse_executor_concurrency: int
+    dense_executor_concurrency: int
+    io_executor_concurrency: int
+
+    result_cache_enabled: bool
+    result_cache_size: int
+    result_cache_ttl: float
+    result_cache_max_bytes: int
+    cache_db_path: str
+
+    embedding_cache_size: int
+    embedding_cache_path: str
+
+    embedding_batch_window_ms: float
+    embedding_batch_max_size: int
+
+    search_latency_budget_ms: float
+    embedding_hedge_percentile: float
 
 
 def load_config() -> Config:
     """환경변수에서 설정 로드"""
     return Config(
+        vector_db_mode=os.getenv("VECTOR_DB_MODE", "embedded"),
         vector_db_host=os.getenv("VECTOR_DB_HOST", "localhost"),
         vector_db_port=int(os.getenv("VECTOR_DB_PORT", "8080")),
         vector_db_collection=os.getenv("VECTOR_DB_COLLECTION", "code_collection"),
+        vector_db_timeout=float(os.getenv("VECTOR_DB_TIMEOUT", "10")),
+        vector_db_max_connections=int(os.getenv("VECTOR_DB_MAX_CONNECTIONS", "32")),
         embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
         embedding_dimension=int(os.getenv("EMBEDDING_DIMENSION", "1536")),
         persist_directory=os.getenv("PERSIST_DIRECTORY", "./chroma_db"),
         memory_db_path=os.getenv("MEMORY_DB_PATH", "conversations.db"),
+        # 대화 저장소 읽기 전용 연결 수 (쓰기는 전용 연결 하나로 직렬화)
+        memory_db_readers=int(os.getenv("MEMORY_DB_READERS", "4")),
+        span_cache_size=int(os.getenv("SPAN_CACHE_SIZE", "32")),
+        # 검색 결과 인접 청크/함수 확장으로 추가되는 최대 토큰 수
+        expansion_token_budget=int(os.getenv("EXPANSION_TOKEN_BUDGET", "1500")),
+        router_overfetch_factor=int(os.getenv("ROUTER_OVERFETCH_FACTOR", "3")),
+        router_max_depth=int(os.getenv("ROUTER_MAX_DEPTH", "50")),
+        # 0이면 ROUTER_OVERFETCH_FACTOR 사용
+        router_dense_overfetch_factor=int(os.getenv("ROUTER_DENSE_OVERFETCH", "0")),
+        router_sparse_overfetch_factor=int(os.getenv("ROUTER_SPARSE_OVERFETCH", "0")),
+        # rrf | combsum | combmnz, 정규화는 minmax | zscore (combsum/combmnz에만 적용)
+        fusion_strategy=os.getenv("FUSION_STRATEGY", "rrf"),
+        fusion_normalization=os.getenv("FUSION_NORMALIZATION", "minmax"),
+        fusion_rrf_k=int(os.getenv("FUSION_RRF_K", "60")),
+        # 0이면 샤딩 없이 서버 프로세스에서 점수 계산
+        search_shards=int(os.getenv("SEARCH_SHARDS", "0")),
+        # 실행기별 스레드 수 / 동시 실행 한도 (한도 0이면 스레드 수와 동일)
+        sparse_executor_workers=int(
+            os.getenv("SPARSE_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1)))
+        ),
+        dense_executor_workers=int(os.getenv("DENSE_EXECUTOR_WORKERS", "4")),
+        io_executor_workers=int(os.getenv("IO_EXECUTOR_WORKERS", "16")),
+        sparse_executor_concurrency=int(os.getenv("SPARSE_EXECUTOR_CONCURRENCY", "0")),
+        dense_executor_concurrency=int(os.getenv("DENSE_EXECUTOR_CONCURRENCY", "0")),
+        io_executor_concurrency=int(os.getenv("IO_EXECUTOR_CONCURRENCY", "0")),
+        result_cache_enabled=os.getenv("RESULT_CACHE_ENABLED", "true").lower()
+        == "true",
+        result_cache_size=int(os.getenv("RESULT_CACHE_SIZE", "512")),
+        result_cache_ttl=float(os.getenv("RESULT_CACHE_TTL", "600")),
+        result_cache_max_bytes=int(
+            os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        ),
+        # 비워두면 디스크 캐시 계층 비활성화 (프로세스 내 캐시만 사용)
+        cache_db_path=os.getenv("CACHE_DB_PATH", ""),
+        embedding_cache_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+        embedding_cache_path=os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.db"),
+        # 0이면 마이크로 배칭 비활성화 (질의마다 바로 임베딩 요청)
+        embedding_batch_window_ms=float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5")),
+        embedding_batch_max_size=int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64")),
+        # 기본 0: 지연 예산 없이 dense 결과를 끝까지 기다림
+        # 예) 300 → dense가 300ms 안에 끝나지 않으면 sparse 결과로 degraded 응답
+        search_latency_budget_ms=float(os.getenv("SEARCH_LATENCY_BUDGET_MS", "0")),
+        # 기본 0: 헤징 비활성화
+        # 예) 95 → 임베딩 호출이 p95 지연을 넘으면 중복 요청 (임베딩 API 비용 증가)
+        embedding_hedge_percentile=float(os.getenv("EMBEDDING_HEDGE_PERCENTILE", "0")),
     )
@@ -1,12 +1,107 @@
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from ..services.ensemble_service import EnsembleRetrievalService
-from ..models.search_models import SearchQuery, RetrievalWeights
+from ..services.neighbor_expander import NeighborExpander
+from ..models.search_models import SearchQuery, RetrievalWeights, QueryType
 
 
 class EnsembleRetrievalController:
 
-    def __init__(self, ensemble_retrieval_service: EnsembleRetrievalService):
+    def __init__(
+        self,
+        ensemble_retrieval_service: EnsembleRetrievalService,
+        expander: Optional[NeighborExpander] = None,
+    ):
         self.ensemble_retrieval_service = ensemble_retrieval_service
+        self.expander = expander
+
+    async def search(
+        self,
+        query: str,
+        query_type: str = "general",
+        k: int = 5,
+        budget_ms: Optional[float] = None,
+        expand: str = "none",
+        window: int = 1,
+    ) -> Dict[str, Any]:
+        """쿼리 라우터가 엔진(symbol, sparse, dense, hybrid)을 선택하는 기본 검색
+
+        budget_ms 안에 dense가 끝나지 않으면 sparse 결과를 degraded로 반환
+        expand가 neighbors / function이면 결과를 인접 청크 / 감싸는 함수로 확장"""
+        try:
+            parsed_type = QueryType(query_type)
+        except ValueError:
+            parsed_type = QueryType.GENERAL
+
+        search_query = SearchQuery(text=query, query_type=parsed_type)
+        result = await self.ensemble_retrieval_service.search(
+            search_query, k, budget_ms=budget_ms
+        )
+        if expand == "none" or self.expander is None:
+            return result.to_dict()
+
+        # 캐시된 결과는 그대로 두고 응답 단계에서만 확장
+        # (병합된 결과는 가장 높은 순위 문서의 융합 점수 사용)
+        ranked = [
+            {**doc, "fused_score": score}
+            for doc, score in zip(result.documents, result.scores)
+        ]
+        documents, expansion = self.expander.expand(
+            ranked, expand, window, content_key="page_content"
+        )
+        return {
+            **result.to_dict(),
+            "documents": documents,
+            "scores": [doc.pop("fused_score") for doc in documents],
+            "total_results": len(documents),
+            "expansion": expansion,
+        }
+
+    async def search_stream(
+        self, query: str, query_type: str = "general", k: int = 5
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """단계별(sparse -> fused -> final) 검색 결과 스트리밍"""
+        try:
+            parsed_type = QueryType(query_type)
+        except ValueError:
+            parsed_type = QueryType.GENERAL
+
+        search_query = SearchQuery(text=query, query_type=parsed_type)
+        async for event in self.ensemble_retrieval_service.search_stream(
+            search_query, k
+        ):
+            yield event
+
+    async def search_batch(
+        self, queries: List[str], query_type: str = "general", k: int = 5
+    ) -> Dict[str, Any]:
+        """여러 질의 일괄 검색 (임베딩 요청 1회, 질의별 결과는 입력 순서대로 반환)"""
+        try:
+            parsed_type = QueryType(query_type)
+        except ValueError:
+            parsed_type = QueryType.GENERAL
+
+        search_queries = [SearchQuery(text=q, query_type=parsed_type) for q in queries]
+        results = await self.ensemble_retrieval_service.search_batch(search_queries, k)
+        return {
+            "results": [
+                {"query": q, **result.to_dict()} for q, result in zip(queries, results)
+            ],
+            "count": len(results),
+        }
+
+    async def cache_stats(self) -> Dict[str, Any]:
+        """검색 결과 / 질의 임베딩 캐시 hit ratio 및 메모리 사용량 조회"""
+        return self.ensemble_retrieval_service.cache_stats()
+
+    async def search_with_weights(
+        self,
+        query: str,
+        dense_weight: float = 0.6,
+        sparse_weight: float = 0.4,
+        k: int = 5,
+    ) -> Dict[str, Any]:
+        """가중치를 직접 지정한 hybrid 검색"""
+        return await self.ensemble_search(query, k, dense_weight, sparse_weight)
 
     async def ensemble_search(
         self,
@@ -36,5 +131,5 @@ class EnsembleRetrievalController:
         return {
             **result.to_dict(),
             "auto_optimized": True,
-            "query_type": "code" if search_query._is_code_query else "semantic",
+            "query_type": "code" if search_query.is_code_query else "semantic",
         }
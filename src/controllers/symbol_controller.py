@@ -0,0 +1,28 @@
+from ..services.symbol_service import SymbolService
+
+
+class SymbolController:
+    """심볼 테이블 조회 MCP 도구 endpoint"""
+
+    def __init__(self, symbol_service: SymbolService):
+        self.symbol_service = symbol_service
+
+    async def lookup_symbol(
+        self, name: str, prefix: bool = False, limit: int = 20
+    ) -> dict:
+        """클래스/인터페이스/함수/메서드/상수 정의 위치 조회
+
+        prefix=True 이면 name으로 시작하는 심볼 전체 조회"""
+        try:
+            symbols = self.symbol_service.lookup(name, prefix, limit)
+            return {
+                "success": True,
+                "message": f"{len(symbols)} symbols found",
+                "data": {
+                    "query": name,
+                    "mode": "prefix" if prefix else "exact",
+                    "symbols": symbols,
+                },
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
@@ -0,0 +1,8 @@
+"""Cache Package
+
+검색/임베딩 등 반복 비용을 줄이기 위한 캐시 구현체들을 포함
+- lru_cache: 프로세스 내 LRU + TTL 캐시
+- disk_cache: 프로세스 간 공유되는 SQLite 기반 디스크 캐시
+- research_cache: 외부 웹 리서치 응답 캐시 (TTL, stale-while-revalidate, offline)
+- resource_pool: 벡터스토어/체인 등 장수명 객체 레지스트리 (LRU + 유휴 제거)
+"""
@@ -0,0 +1,201 @@
+"""
+SQLite 기반 디스크 캐시
+
+여러 MCP 서버 프로세스와 CLI 실행 간에 공유되는 캐시 계층
+하나의 DB 파일을 namespace로 나눠 여러 캐시가 함께 사용할 수 있음
+WAL 모드로 동시 읽기를 허용하고 TTL, namespace별 용량 제한(LRU)을 적용
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=float).encode("utf-8")
+
+
+def _json_decode(payload: bytes) -> Any:
+    return json.loads(payload.decode("utf-8"))
+
+
+class DiskCache:
+    def __init__(
+        self,
+        db_path: str,
+        namespace: str,
+        ttl_seconds: Optional[float] = 3600.0,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        encode: Callable[[Any], bytes] = _json_encode,
+        decode: Callable[[bytes], Any] = _json_decode,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.encode = encode
+        self.decode = decode
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=5.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_table()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _init_table(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed
+                ON cache_entries (namespace, accessed_at)
+            """
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT value, expires_at FROM cache_entries
+                WHERE namespace = ? AND key = ?
+            """,
+                (self.namespace, key),
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                """
+                UPDATE cache_entries SET accessed_at = ?
+                WHERE namespace = ? AND key = ?
+            """,
+                (now, self.namespace, key),
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return self.decode(row[0])
+
+    def put(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        payload = self.encode(value)
+        now = time.time()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = now + ttl if ttl else None
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO cache_entries
+                (namespace, key, value, size, created_at, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                (self.namespace, key, payload, len(payload), now, expires_at, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries
+                WHERE namespace = ?
+            """,
+                (self.namespace,),
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.db_path),
+            "namespace": self.namespace,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        """만료 항목 삭제 후 용량 초과분을 오래 사용되지 않은 순으로 삭제"""
+        self._conn.execute(
+            """
+            DELETE FROM cache_entries
+            WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at < ?
+        """,
+            (self.namespace, now),
+        )
+
+        if self.max_bytes is None:
+            return
+
+        (total_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        if total_bytes <= self.max_bytes:
+            return
+
+        overflow = total_bytes - self.max_bytes
+        rows = self._conn.execute(
+            """
+            SELECT key, size FROM cache_entries
+            WHERE namespace = ? ORDER BY accessed_at ASC
+        """,
+            (self.namespace,),
+        )
+        victims = []
+        for key, size in rows:
+            if overflow <= 0:
+                break
+            victims.append((self.namespace, key))
+            overflow -= size
+
+        self._conn.executemany(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", victims
+        )
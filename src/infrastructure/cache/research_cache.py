@@ -0,0 +1,150 @@
+"""
+외부 웹 리서치(Tavily) 결과 디스크 캐시
+
+(정규화 질의, 검색 파라미터) 기준으로 검색 응답을 DiskCache에 저장
+- ttl_seconds 이내: 그대로 반환
+- 이후 stale_seconds 동안: 이전 응답을 바로 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+- 그 이후: 항목 삭제 (DiskCache TTL), 용량 초과시 오래 사용되지 않은 순으로 삭제
+- offline 모드: 네트워크 호출 없이 캐시에서만 응답 (없으면 ResearchCacheMiss)
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .disk_cache import DiskCache
+
+
+class ResearchCacheMiss(LookupError):
+    """offline 모드에서 캐시에 없는 질의"""
+
+
+def normalize_research_query(query: str) -> str:
+    """대소문자/공백/앞뒤 구두점 차이를 무시하도록 질의 정규화"""
+    return re.sub(r"\s+", " ", query).strip().strip("?!.").strip().lower()
+
+
+def research_key(query: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"query": normalize_research_query(query), "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResearchCache:
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 86400.0,
+        stale_seconds: float = 7 * 86400.0,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        offline: bool = False,
+        executor: Optional[Executor] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.offline = offline
+        # stale 구간까지 보관 후 DiskCache가 만료 처리
+        self.store = DiskCache(
+            db_path,
+            namespace="research",
+            ttl_seconds=ttl_seconds + stale_seconds,
+            max_bytes=max_bytes,
+        )
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="research-refresh"
+        )
+
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def search(
+        self, query: str, params: Dict[str, Any], fetch: Callable[[], Any]
+    ) -> Any:
+        """캐시된 검색 응답 반환, 없으면 fetch() 호출 후 저장"""
+        key = research_key(query, params)
+        entry = self.store.get(key)
+
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age <= self.ttl_seconds:
+                self._count("fresh_hits")
+                return entry["response"]
+            self._count("stale_hits")
+            if not self.offline:
+                self._refresh_in_background(key, query, params, fetch)
+            return entry["response"]
+
+        self._count("misses")
+        if self.offline:
+            raise ResearchCacheMiss(f"research not cached (offline): {query}")
+        return self._fetch_and_store(key, query, params, fetch)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "offline": self.offline,
+                "ttl_seconds": self.ttl_seconds,
+                "stale_seconds": self.stale_seconds,
+                "fresh_hits": self.fresh_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "refreshing": len(self._refreshing),
+                "store": self.store.stats(),
+            }
+
+    def _fetch_and_store(
+        self, key: str, query: str, params: Dict[str, Any], fetch: Callable[[], Any]
+    ) -> Any:
+        response = fetch()
+        self.store.put(
+            key,
+            {
+                "query": normalize_research_query(query),
+                "params": params,
+                "fetched_at": time.time(),
+                "response": response,
+            },
+        )
+        return response
+
+    def _refresh_in_background(
+        self, key: str, query: str, params: Dict[str, Any], fetch: Callable[[], Any]
+    ) -> None:
+        # 같은 키의 갱신은 한 번만 진행
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self._fetch_and_store(key, query, params, fetch)
+                self._count("refreshes")
+            except Exception as e:
+                # 갱신 실패시 기존 stale 응답을 계속 사용
+                print(f"research refresh failed : {e}")
+                self._count("refresh_failures")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self.executor.submit(refresh)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
@@ -0,0 +1,121 @@
+"""
+장수명 리소스 레지스트리
+
+벡터스토어 클라이언트, RAG 체인처럼 생성 비용이 큰 객체를 키별로 한 번만 만들어 재사용
+- 최대 개수 초과시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+- idle_seconds 동안 사용되지 않은 항목은 다음 접근시 제거
+- 같은 키를 동시에 요청해도 factory는 한 번만 실행 (키별 잠금)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ResourcePool(Generic[T]):
+    def __init__(
+        self,
+        max_size: int = 8,
+        idle_seconds: Optional[float] = 600.0,
+        on_evict: Optional[Callable[[T], None]] = None,
+    ):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.on_evict = on_evict
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        # key -> (리소스, 마지막 사용 시각)
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        resource = self._lookup(key)
+        if resource is not None:
+            return resource
+
+        with self._key_lock(key):
+            # 대기 중 다른 스레드가 먼저 생성했으면 재사용
+            resource = self._lookup(key, count_miss=True)
+            if resource is not None:
+                return resource
+
+            resource = factory()
+            with self._lock:
+                self._entries[key] = [resource, time.monotonic()]
+                self._entries.move_to_end(key)
+                evicted = self._evict_locked()
+            self._close(evicted)
+            return resource
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._close([entry[0]])
+
+    def clear(self) -> None:
+        with self._lock:
+            resources = [entry[0] for entry in self._entries.values()]
+            self._entries.clear()
+        self._close(resources)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "idle_seconds": self.idle_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "keys": [
+                    {"key": str(key), "idle": now - entry[1]}
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+    def _lookup(self, key: Hashable, count_miss: bool = False) -> Optional[T]:
+        with self._lock:
+            evicted = self._evict_locked()
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = time.monotonic()
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif count_miss:
+                self.misses += 1
+        self._close(evicted)
+        return entry[0] if entry is not None else None
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _evict_locked(self) -> list:
+        """idle 초과 항목과 최대 개수 초과분 제거 (self._lock 보유 상태에서 호출)"""
+        evicted = []
+        if self.idle_seconds is not None:
+            deadline = time.monotonic() - self.idle_seconds
+            for key in [k for k, e in self._entries.items() if e[1] < deadline]:
+                evicted.append(self._entries.pop(key)[0])
+                self._key_locks.pop(key, None)
+        while len(self._entries) > self.max_size:
+            key, entry = self._entries.popitem(last=False)
+            evicted.append(entry[0])
+            self._key_locks.pop(key, None)
+        self.evictions += len(evicted)
+        return evicted
+
+    def _close(self, resources: list) -> None:
+        if self.on_evict is None:
+            return
+        for resource in resources:
+            self.on_evict(resource)
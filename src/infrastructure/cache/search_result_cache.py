@@ -0,0 +1,109 @@
+"""
+검색 결과 캐시
+
+(정규화된 질의, k, 가중치, 필터, 인덱스 세대)를 키로 사용하는 2단 캐시
+- 1단: 프로세스 내 LRU + TTL
+- 2단: (선택) 프로세스 간 공유 SQLite 디스크 캐시
+크롤링으로 인덱스 세대가 바뀌면 키가 달라지므로 별도 무효화 없이 이전 결과는 사용되지 않음
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from dataclasses import replace
+from typing import Any, Dict, Optional
+from ..storage.index_generation import IndexGeneration
+from .lru_cache import TTLCache
+from .disk_cache import DiskCache
+from ...models.search_models import SearchQuery, SearchResult, RetrievalWeights
+
+
+def normalize_query_text(text: str) -> str:
+    """NFC 정규화 + 공백 정리 (코드 식별자 때문에 대소문자는 유지)"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def search_key(
+    query: SearchQuery,
+    k: int,
+    weights: Optional[RetrievalWeights],
+    filters: Optional[Dict[str, Any]],
+    generation: str,
+) -> str:
+    """검색 요청 식별 키 (결과 캐시, 동시 요청 중복 제거에서 공통 사용)"""
+    payload = {
+        "query": normalize_query_text(query.text),
+        "k": k,
+        "weights": [weights.dense, weights.sparse] if weights else None,
+        "filters": {"query_type": query.query_type.value, **(filters or {})},
+        "generation": generation,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def _result_size(result: SearchResult) -> int:
+    return len(json.dumps(result.to_dict(), ensure_ascii=False, default=float))
+
+
+class SearchResultCache:
+    def __init__(
+        self,
+        generation: IndexGeneration,
+        max_entries: int = 512,
+        ttl_seconds: float = 600.0,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        disk: Optional[DiskCache] = None,
+    ):
+        self.generation = generation
+        self.memory = TTLCache(max_entries, ttl_seconds, max_bytes, _result_size)
+        self.disk = disk
+        self._last_generation: Optional[str] = None
+
+    def make_key(
+        self,
+        query: SearchQuery,
+        k: int,
+        weights: Optional[RetrievalWeights],
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        generation = self.generation.current()
+
+        # 세대가 바뀌면 이전 세대 항목은 더이상 조회되지 않으므로 메모리에서 즉시 해제
+        if self._last_generation is not None and generation != self._last_generation:
+            self.memory.clear()
+        self._last_generation = generation
+
+        return search_key(query, k, weights, filters, generation)
+
+    def get(self, key: str) -> Optional[SearchResult]:
+        result = self.memory.get(key)
+        if result is not None:
+            return replace(result, cache="memory")
+
+        if self.disk is None:
+            return None
+
+        data = self.disk.get(key)
+        if data is None:
+            return None
+
+        result = SearchResult.from_dict(data)
+        result.cache = None
+        self.memory.put(key, result)
+        return replace(result, cache="disk")
+
+    def put(self, key: str, result: SearchResult) -> None:
+        result = replace(result, cache=None)
+        self.memory.put(key, result)
+        if self.disk is not None:
+            self.disk.put(key, result.to_dict())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation.current(),
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
@@ -0,0 +1,208 @@
+"""
+시맨틱 답변 캐시
+
+이슈 설명 임베딩과 해결 결과를 SQLite에 저장하고
+같은 인덱스 세대에서 코사인 유사도가 임계값 이상인 이전 이슈가 있으면 해당 결과를 재사용
+(LLM 생성이 가장 느리고 비싼 단계이므로 거의 동일한 이슈의 재생성을 방지)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    # 다른 프로세스가 저장한 항목도 반영되도록 주기적으로 임베딩 행렬을 다시 로드
+    MATRIX_RELOAD_SECONDS = 60.0
+
+    def __init__(
+        self,
+        db_path: str,
+        threshold: float = 0.95,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = 86400.0,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=5.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._init_table()
+
+        # 세대별 임베딩 행렬 (조회시 한 번의 행렬곱으로 유사도 계산)
+        self._matrix_generation: Optional[str] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_ids: List[int] = []
+        self._matrix_created_at: Optional[np.ndarray] = None
+        self._matrix_loaded_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+
+    def _init_table(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS semantic_answers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    generation TEXT NOT NULL,
+                    issue TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    resolution TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_semantic_answers_generation
+                ON semantic_answers (generation, created_at)
+            """
+            )
+            self._conn.commit()
+
+    def lookup(
+        self, embedding: List[float], generation: str
+    ) -> Optional[Dict[str, Any]]:
+        """임계값 이상으로 유사한 이전 이슈의 결과 반환 (없으면 None)
+
+        반환값: {"issue", "similarity", "created_at", "resolution"}"""
+        query = self._normalize(np.asarray(embedding, dtype=np.float32))
+
+        with self._lock:
+            self._load_matrix(generation)
+            if self._matrix is None or not len(self._matrix_ids):
+                self.misses += 1
+                return None
+
+            # 행렬 로드 이후 TTL이 지난 행은 최고 유사도 후보에서 제외
+            similarities = self._matrix @ query
+            expired = self._matrix_created_at < self._min_created_at()
+            similarities[expired] = -np.inf
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            row = self._conn.execute(
+                """
+                SELECT issue, resolution, created_at FROM semantic_answers
+                WHERE id = ? AND created_at >= ?
+            """,
+                (self._matrix_ids[best], self._min_created_at()),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return {
+            "issue": row[0],
+            "similarity": similarity,
+            "created_at": row[2],
+            "resolution": json.loads(row[1]),
+        }
+
+    def store(
+        self,
+        issue: str,
+        embedding: List[float],
+        generation: str,
+        resolution: Dict[str, Any],
+    ) -> None:
+        vector = self._normalize(np.asarray(embedding, dtype=np.float32))
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO semantic_answers
+                (generation, issue, embedding, resolution, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (
+                    generation,
+                    issue,
+                    vector.tobytes(),
+                    json.dumps(resolution, ensure_ascii=False, default=str),
+                    time.time(),
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+            self._matrix_generation = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM semantic_answers"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def _load_matrix(self, generation: str) -> None:
+        if (
+            self._matrix_generation == generation
+            and time.monotonic() - self._matrix_loaded_at < self.MATRIX_RELOAD_SECONDS
+        ):
+            return
+
+        rows = self._conn.execute(
+            """
+            SELECT id, embedding, created_at FROM semantic_answers
+            WHERE generation = ? AND created_at >= ?
+        """,
+            (generation, self._min_created_at()),
+        ).fetchall()
+
+        self._matrix_ids = [row[0] for row in rows]
+        self._matrix_created_at = np.array([row[2] for row in rows], dtype=np.float64)
+        self._matrix = (
+            np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            if rows
+            else None
+        )
+        self._matrix_generation = generation
+        self._matrix_loaded_at = time.monotonic()
+
+    def _evict(self) -> None:
+        """만료 항목과 최대 개수 초과분(오래된 순) 삭제"""
+        self._conn.execute(
+            "DELETE FROM semantic_answers WHERE created_at < ?",
+            (self._min_created_at(),),
+        )
+        self._conn.execute(
+            """
+            DELETE FROM semantic_answers WHERE id NOT IN (
+                SELECT id FROM semantic_answers ORDER BY created_at DESC LIMIT ?
+            )
+        """,
+            (self.max_entries,),
+        )
+
+    def _min_created_at(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def _normalize(self, vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
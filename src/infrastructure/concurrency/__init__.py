@@ -0,0 +1,8 @@
+"""Concurrency Package
+
+동시 요청 처리를 위한 구현체들을 포함
+- single_flight: 동일한 동시 요청을 한 번만 실행하고 결과를 공유
+- hedging: 느린 요청을 한 번 더 보내 먼저 끝난 결과를 사용
+- executors: 작업 종류별 크기 제한 스레드 풀과 대기열 지표
+- rate_limiter: 외부 API별 분당 요청 수 제한 (토큰 버킷)
+"""
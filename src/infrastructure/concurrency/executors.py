@@ -0,0 +1,146 @@
+"""
+작업 종류별 전용 실행기
+
+CPU 작업(sparse 점수 계산, dense 행렬곱)과 I/O 작업(임베딩 API, 벡터스토어 조회)을
+크기가 정해진 별도 스레드 풀에서 실행해 이벤트 루프를 막지 않고
+한 종류의 무거운 작업이 다른 종류의 요청을 밀어내지 않도록 격리
+풀마다 동시 실행 한도(초과분은 대기열)와 대기열 깊이/대기 시간 지표를 제공
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class WorkloadExecutor:
+    def __init__(
+        self, name: str, max_workers: int, max_concurrency: Optional[int] = None
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-worker"
+        )
+        # 동시 실행 한도 (asyncio 세마포어는 이벤트 루프에 묶이므로 루프별로 생성)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        slots = self._semaphore(loop)
+
+        enqueued_at = time.monotonic()
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await slots.acquire()
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+        started_at = time.monotonic()
+        with self._lock:
+            self.running += 1
+            self._total_wait += started_at - enqueued_at
+        try:
+            return await loop.run_in_executor(
+                self._pool, functools.partial(fn, *args, **kwargs)
+            )
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            slots.release()
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self._total_run += time.monotonic() - started_at
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self.completed
+            avg_wait = self._total_wait / completed if completed else 0.0
+            avg_run = self._total_run / completed if completed else 0.0
+            return {
+                "workers": self.max_workers,
+                "max_concurrency": self.max_concurrency,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": completed,
+                "failed": self.failed,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_wait_ms": avg_wait * 1000,
+                "avg_run_ms": avg_run * 1000,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+
+class WorkloadExecutors:
+    """sparse(BM25 점수), dense(행렬곱/벡터스토어 조회), io(임베딩 API 등) 실행기 묶음"""
+
+    KINDS = ("sparse", "dense", "io")
+
+    def __init__(self, executors: Dict[str, WorkloadExecutor]):
+        self.executors = executors
+
+    @classmethod
+    def create(
+        cls,
+        workers: Dict[str, int],
+        concurrency: Optional[Dict[str, int]] = None,
+    ) -> "WorkloadExecutors":
+        concurrency = concurrency or {}
+        return cls(
+            {
+                kind: WorkloadExecutor(kind, workers[kind], concurrency.get(kind))
+                for kind in cls.KINDS
+            }
+        )
+
+    async def run(self, kind: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await self.executors[kind].run(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {kind: executor.stats() for kind, executor in self.executors.items()}
+
+    def shutdown(self) -> None:
+        for executor in self.executors.values():
+            executor.shutdown()
+
+
+async def run_in(
+    executors: Optional[WorkloadExecutors],
+    kind: str,
+    fn: Callable[..., T],
+    *args,
+    **kwargs,
+) -> T:
+    """전용 실행기가 있으면 해당 종류의 풀에서, 없으면 기본 스레드 풀에서 실행"""
+    if executors is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return await executors.run(kind, fn, *args, **kwargs)
@@ -0,0 +1,92 @@
+"""
+요청 헤징 (hedged request)
+
+동기 호출(임베딩 API 등)을 스레드에서 실행하고, 최근 지연시간의 백분위(기본 p95)만큼
+기다려도 끝나지 않으면 같은 요청을 한 번 더 보내 먼저 끝난 결과를 사용
+꼬리 지연(tail latency)을 줄이는 대신 느린 요청에 한해 API 호출이 한 번 늘어남
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+import numpy as np
+
+from .executors import WorkloadExecutors, run_in
+
+T = TypeVar("T")
+
+
+def _consume_exception(task: asyncio.Future) -> None:
+    # 버려진 쪽 요청의 예외가 "never retrieved" 경고로 남지 않도록 확인 처리
+    if not task.cancelled():
+        task.exception()
+
+
+class Hedger:
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay_ms: float = 50.0,
+        executors: Optional[WorkloadExecutors] = None,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_ms / 1000.0
+        # 지정시 io 실행기에서 요청 실행
+        self.executors = executors
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청까지 대기 시간 (표본이 부족하면 None = 헤징 안함)"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        delay = float(np.percentile(list(self._latencies), self.percentile))
+        return max(delay, self.min_delay_seconds)
+
+    async def run(self, fn: Callable[[], T]) -> T:
+        self.calls += 1
+        start = time.monotonic()
+        primary = asyncio.ensure_future(run_in(self.executors, "io", fn))
+
+        delay = self.hedge_delay()
+        if delay is not None:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if not done:
+                self.hedged += 1
+                hedge = asyncio.ensure_future(run_in(self.executors, "io", fn))
+                for task in (primary, hedge):
+                    task.add_done_callback(_consume_exception)
+                done, _ = await asyncio.wait(
+                    {primary, hedge}, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = done.pop()
+                # 먼저 실패한 쪽이 있으면 나머지 요청 결과를 기다림
+                if winner.exception() is not None:
+                    winner = hedge if winner is primary else primary
+                elif winner is hedge:
+                    self.hedge_wins += 1
+                result = await winner
+                self._latencies.append(time.monotonic() - start)
+                return result
+
+        result = await primary
+        self._latencies.append(time.monotonic() - start)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.hedge_delay()
+        return {
+            "percentile": self.percentile,
+            "hedge_delay_ms": delay * 1000.0 if delay is not None else None,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
@@ -0,0 +1,69 @@
+"""
+분당 요청 수 제한 (토큰 버킷)
+
+외부 API(LLM, 웹 리서치)별로 호출 속도 예산을 두고 초과 요청은 대기시킴
+대기 시간을 예약 방식으로 계산하므로 스레드(acquire)와 이벤트 루프(aacquire)에서 함께 사용 가능
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    def __init__(self, name: str, per_minute: float, burst: Optional[int] = None):
+        self.name = name
+        self.per_minute = per_minute
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.burst = burst or 1
+
+        self._lock = threading.Lock()
+        # 다음 요청이 대기 없이 시작할 수 있는 가장 이른 시각 (버스트만큼 앞당겨 허용)
+        self._next_free = time.monotonic()
+
+        self.acquired = 0
+        self.delayed = 0
+        self._total_wait = 0.0
+
+    def acquire(self) -> float:
+        """요청 한 건 예약 후 차례가 될 때까지 블로킹 대기 (대기한 초 반환)"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "per_minute": self.per_minute,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "avg_wait_ms": (
+                    self._total_wait / self.acquired * 1000 if self.acquired else 0.0
+                ),
+            }
+
+    def _reserve(self) -> float:
+        if self.interval == 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            # 오래 쉬었어도 버스트 이상으로 몰아서 보내지 않도록 하한 적용
+            earliest = now - self.interval * (self.burst - 1)
+            start = max(self._next_free, earliest)
+            self._next_free = start + self.interval
+            wait = max(0.0, start - now)
+
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self._total_wait += wait
+            return wait
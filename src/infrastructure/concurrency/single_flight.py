@@ -0,0 +1,62 @@
+"""
+Single-flight 중복 실행 제거
+
+같은 키로 동시에 들어온 요청은 먼저 들어온 요청(leader)의 실행 하나를 공유
+- 실행은 별도 태스크에서 진행되므로 leader 호출자가 취소되어도 다른 대기자는 결과를 받음
+- 모든 대기자가 취소되면 실행 태스크도 취소
+- 완료 즉시 키를 제거하므로 결과 캐시 역할은 하지 않음
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+        self.calls = 0
+        self.executions = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+
+        flight = self._flights.get(key)
+        if flight is None:
+            self.executions += 1
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            # shield: 한 호출자의 취소가 공유 실행을 취소하지 않도록
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+                # 취소 중인 실행에 새 요청이 합류하지 않도록 즉시 제거
+                self._forget(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "executions": self.executions,
+            "shared": self.calls - self.executions,
+        }
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,5 @@
+"""Embeddings Package
+
+질의 임베딩 호출 비용을 줄이기 위한 임베딩 래퍼 구현체들을 포함
+- cached_embeddings: (model, 정규화 질의) 기준 메모리 + 디스크 캐시
+"""
@@ -0,0 +1,137 @@
+"""
+질의 임베딩 캐시
+
+(model, 정규화된 질의 텍스트)를 키로 질의 임베딩을 캐시
+- 메모리: 항목 수 제한 LRU (float32 배열로 보관)
+- 디스크: 프로세스/재시작 간 공유되는 SQLite 캐시 (선택)
+문서 임베딩(embed_documents, 크롤링용)은 캐시하지 않고 그대로 위임
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai.embeddings import OpenAIEmbeddings
+
+from ..cache.lru_cache import TTLCache
+from ..cache.disk_cache import DiskCache
+from ..cache.search_result_cache import normalize_query_text
+
+
+def _encode_vector(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _decode_vector(payload: bytes) -> np.ndarray:
+    return np.frombuffer(payload, dtype=np.float32)
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        base: Embeddings,
+        model: str,
+        max_entries: int = 2048,
+        disk_path: Optional[str] = None,
+    ):
+        self.base = base
+        self.model = model
+        self.memory = TTLCache(
+            max_entries=max_entries,
+            ttl_seconds=None,
+            size_fn=lambda vector: vector.nbytes,
+        )
+        # 임베딩은 모델이 같으면 바뀌지 않으므로 디스크 계층도 TTL 없이 용량으로만 제한
+        self.disk = (
+            DiskCache(
+                disk_path,
+                "query_embeddings",
+                ttl_seconds=None,
+                encode=_encode_vector,
+                decode=_decode_vector,
+            )
+            if disk_path
+            else None
+        )
+
+    @classmethod
+    def from_config(cls, config, api_key: str) -> "CachedEmbeddings":
+        """설정의 임베딩 모델/캐시 크기/디스크 경로로 OpenAI 임베딩 래핑"""
+        return cls(
+            OpenAIEmbeddings(model=config.embedding_model, api_key=api_key),
+            model=config.embedding_model,
+            max_entries=config.embedding_cache_size,
+            disk_path=config.embedding_cache_path or None,
+        )
+
+    def cache_key(self, text: str) -> str:
+        payload = f"{self.model}\n{normalize_query_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_cached(self, text: str) -> Optional[List[float]]:
+        key = self.cache_key(text)
+        vector = self.memory.get(key)
+        if vector is None and self.disk is not None:
+            vector = self.disk.get(key)
+            if vector is not None:
+                self.memory.put(key, vector)
+        return vector.tolist() if vector is not None else None
+
+    def store(self, text: str, embedding: List[float]) -> None:
+        key = self.cache_key(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        self.memory.put(key, vector)
+        if self.disk is not None:
+            self.disk.put(key, vector)
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self.get_cached(text)
+        if cached is not None:
+            return cached
+
+        embedding = self.base.embed_query(text)
+        self.store(text, embedding)
+        return embedding
+
+    async def aembed_query(self, text: str) -> List[float]:
+        cached = self.get_cached(text)
+        if cached is not None:
+            return cached
+
+        embedding = await self.base.aembed_query(text)
+        self.store(text, embedding)
+        return embedding
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """여러 질의 임베딩 (캐시 미스인 질의만 중복 제거 후 한 번의 요청으로 계산)"""
+        embeddings: List[Optional[List[float]]] = [
+            self.get_cached(text) for text in texts
+        ]
+
+        missing: Dict[str, List[int]] = {}
+        for idx, (text, embedding) in enumerate(zip(texts, embeddings)):
+            if embedding is None:
+                missing.setdefault(normalize_query_text(text), []).append(idx)
+
+        if missing:
+            computed = self.base.embed_documents(list(missing))
+            for (text, indices), embedding in zip(missing.items(), computed):
+                self.store(text, embedding)
+                for idx in indices:
+                    embeddings[idx] = embedding
+
+        return embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.base.aembed_documents(texts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
@@ -0,0 +1,111 @@
+"""
+질의 임베딩 마이크로 배칭
+
+동시에 들어온 단건 질의 임베딩 요청을 짧은 대기 시간(window) 동안 모아
+한 번의 임베딩 API 호출로 처리한 뒤 각 호출자에게 결과를 나눠줌
+대기 중 max_batch_size에 도달하면 즉시 요청
+캐시에 있는 질의는 대기 없이 바로 반환
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..concurrency.hedging import Hedger
+from ..concurrency.executors import WorkloadExecutors, run_in
+
+
+class EmbeddingCoalescer:
+    def __init__(
+        self,
+        embeddings,
+        window_ms: float = 5.0,
+        max_batch_size: int = 64,
+        hedger: Optional[Hedger] = None,
+        executors: Optional[WorkloadExecutors] = None,
+    ):
+        self.embeddings = embeddings
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        # 지정시 느린 배치 요청은 한 번 더 보내 먼저 끝난 결과 사용
+        self.hedger = hedger
+        self.executors = executors
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 실행 중인 배치 태스크 참조 유지 (GC로 중단되지 않도록)
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    async def embed(self, text: str) -> List[float]:
+        self.requests += 1
+
+        get_cached = getattr(self.embeddings, "get_cached", None)
+        if get_cached is not None:
+            cached = get_cached(text)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window_seconds * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": (
+                (self.batched_texts / self.batches) if self.batches else 0.0
+            ),
+        }
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # 대기 중 취소된 호출자는 제외
+        batch = [(text, future) for text, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+
+        self.batches += 1
+        self.batched_texts += len(batch)
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            if self.hedger is not None:
+                vectors = await self.hedger.run(lambda: self._embed_many(texts))
+            else:
+                vectors = await run_in(self.executors, "io", self._embed_many, texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def _embed_many(self, texts: List[str]) -> List[List[float]]:
+        # CachedEmbeddings면 중복 제거 + 캐시 저장까지 함께 처리
+        if hasattr(self.embeddings, "embed_queries"):
+            return self.embeddings.embed_queries(texts)
+        return self.embeddings.embed_documents(texts)
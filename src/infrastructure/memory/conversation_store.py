@@ -1,141 +1,204 @@
 """
 대화 메모리 저장소 구현
+
+SQLite 연결을 요청마다 새로 열지 않고 재사용
+- 쓰기: 전용 스레드 하나 + 전용 연결로 직렬화 (동시 MCP 요청에서도 트랜잭션이 섞이지 않음)
+- 읽기: 읽기 전용 연결 풀, io 실행기(없으면 기본 스레드 풀)에서 실행
+WAL 모드라 저장 중에도 조회가 대기하지 않고, 쓰기 대기가 io 스레드를 점유하지 않음
 """
 
-import sqlite3
+import asyncio
 import json
-from typing import Optional, List
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator, List, Optional
 from ...models.memory_models import Conversation, Interaction
+from ..concurrency.executors import WorkloadExecutors, run_in
 
 
 class ConversationStore:
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        executors: Optional[WorkloadExecutors] = None,
+        readers: int = 4,
+        busy_timeout: float = 5.0,
+    ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.executors = executors
+        self.busy_timeout = busy_timeout
+
+        self._write_lock = threading.Lock()
+        self._write_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memory-writer"
+        )
+        self._writer = self.get_sqlite_connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
         self.init_database()
 
+        # 읽기 연결은 필요할 때 만들어 최대 readers개까지 재사용
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(max(1, readers))
+
     def init_database(self):
-        conn = self.get_sqlite_connect()
-        cursor = conn.cursor()
+        with self._write_lock, self._writer as conn:
+            cursor = conn.cursor()
 
-        # 대화 테이블
-        cursor.execute(
+            # 대화 테이블
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    summary TEXT,
+                    created_date TEXT NOT NULL,
+                    update_date TEXT NOT NULL
+                )
             """
-            CREATE TABLE IF NOT EXISTS conversations (
-                id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                topic TEXT NOT NULL,
-                summary TEXT,
-                created_date TEXT NOT NULL,
-                update_date TEXT NOT NULL
             )
-        """
-        )
 
-        # 상호작용 테이블
-        cursor.execute(
+            # 상호작용 테이블
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS interactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    conversation_id TEXT NOT NULL,
+                    user_message TEXT NOT NULL,
+                    assistant_response TEXT NOT NULL,
+                    search_results TEXT,
+                    timestamp TEXT NOT NULL,
+                    FOREIGN KEY (conversation_id) REFERENCES conversations (id)
+                        ON DELETE CASCADE
+                )
             """
-            CREATE TABLE IF NOT EXISTS interactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                conversation_id TEXT NOT NULL,
-                user_message TEXT NOT NULL,
-                assistant_response TEXT NOT NULL,
-                search_results TEXT,
-                timestamp TEXT NOT NULL,
-                FOREIGN KEY (conversation_id) REFERENCES conversations (id)
-                    ON DELETE CASCADE
             )
-        """
-        )
 
-        conn.commit()
-        conn.close()
+            # 대화별 상호작용 조회 / 사용자별 최근 대화 목록 조회용 인덱스
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_interactions_conversation
+                ON interactions (conversation_id, timestamp)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_conversations_user
+                ON conversations (user_id, update_date)
+            """
+            )
 
     async def save(self, conversation: Conversation) -> None:
-        conn = self.get_sqlite_connect()
-        cursor = conn.cursor()
+        await self._write(self._save, conversation)
 
-        # 대화 정보 저장/업데이트
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO conversations 
-            (id, user_id, topic, summary, created_date, update_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (
-                conversation.id,
-                conversation.user_id,
-                conversation.topic,
-                conversation.summary,
-                conversation.created_date.isoformat(),
-                conversation.update_date.isoformat(),
-            ),
-        )
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        return await run_in(self.executors, "io", self._get, conversation_id)
 
-        # 기존 상호작용 삭제
-        cursor.execute(
-            "DELETE FROM interactions WHERE conversation_id = ?", (conversation.id,)
+    async def get_by_user(
+        self, user_id: str, limit: int = 10, offset: int = 0
+    ) -> List[Conversation]:
+        return await run_in(
+            self.executors, "io", self._get_by_user, user_id, limit, offset
         )
 
-        # 상호작용 저장
-        for interaction in conversation.interactions:
-            search_results_json = None
-            if interaction.search_results:
-                search_results_json = json.dumps(interaction.search_results)
+    async def delete(self, conversation_id: str) -> bool:
+        return await self._write(self._delete, conversation_id)
+
+    async def remove_old_conversations(self, user_id: str, days_old: int = 30) -> int:
+        return await self._write(self._remove_old_conversations, user_id, days_old)
+
+    async def _write(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._write_pool, fn, *args)
+
+    def _save(self, conversation: Conversation) -> None:
+        with self._write_lock, self._writer as conn:
+            cursor = conn.cursor()
 
+            # 대화 정보 저장/업데이트
             cursor.execute(
                 """
-                INSERT INTO interactions 
-                (conversation_id, user_message, assistant_response, 
-                 search_results, timestamp)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT OR REPLACE INTO conversations
+                (id, user_id, topic, summary, created_date, update_date)
+                VALUES (?, ?, ?, ?, ?, ?)
             """,
                 (
                     conversation.id,
-                    interaction.user_message,
-                    interaction.assistant_response,
-                    search_results_json,
-                    interaction.timestamp.isoformat(),
+                    conversation.user_id,
+                    conversation.topic,
+                    conversation.summary,
+                    conversation.created_date.isoformat(),
+                    conversation.update_date.isoformat(),
                 ),
             )
 
-        conn.commit()
-        conn.close()
+            # 기존 상호작용 삭제
+            cursor.execute(
+                "DELETE FROM interactions WHERE conversation_id = ?", (conversation.id,)
+            )
 
-    async def get(self, conversation_id: str) -> Optional[Conversation]:
-        conn = self.get_sqlite_connect()
-        cursor = conn.cursor()
+            # 상호작용 저장
+            rows = []
+            for interaction in conversation.interactions:
+                search_results_json = None
+                if interaction.search_results:
+                    search_results_json = json.dumps(interaction.search_results)
+                rows.append(
+                    (
+                        conversation.id,
+                        interaction.user_message,
+                        interaction.assistant_response,
+                        search_results_json,
+                        interaction.timestamp.isoformat(),
+                    )
+                )
+
+            cursor.executemany(
+                """
+                INSERT INTO interactions
+                (conversation_id, user_message, assistant_response,
+                 search_results, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
 
-        # 대화 정보 조회
-        cursor.execute(
-            """
-            SELECT id, user_id, topic, summary, created_date, update_date
-            FROM conversations 
-            WHERE id = ?
-        """,
-            (conversation_id,),
-        )
+    def _get(self, conversation_id: str) -> Optional[Conversation]:
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
-        conv_row = cursor.fetchone()
-        if not conv_row:
-            conn.close()
-            return None
+            # 대화 정보 조회
+            cursor.execute(
+                """
+                SELECT id, user_id, topic, summary, created_date, update_date
+                FROM conversations
+                WHERE id = ?
+            """,
+                (conversation_id,),
+            )
 
-        # 상호작용 조회
-        cursor.execute(
-            """
-            SELECT user_message, assistant_response, search_results, timestamp
-            FROM interactions 
-            WHERE conversation_id = ?
-            ORDER BY timestamp ASC
-        """,
-            (conversation_id,),
-        )
+            conv_row = cursor.fetchone()
+            if not conv_row:
+                return None
 
-        interaction_rows = cursor.fetchall()
-        conn.close()
+            # 상호작용 조회
+            cursor.execute(
+                """
+                SELECT user_message, assistant_response, search_results, timestamp
+                FROM interactions
+                WHERE conversation_id = ?
+                ORDER BY timestamp ASC
+            """,
+                (conversation_id,),
+            )
+
+            interaction_rows = cursor.fetchall()
 
         # Conversation 객체 재구성
         interactions = []
@@ -167,25 +230,24 @@ class ConversationStore:
 
         return conversation
 
-    async def get_by_user(
-        self, user_id: str, limit: int = 10, offset: int = 0
-    ) -> List[Conversation]:
-        conn = self.get_sqlite_connect()
-        cursor = conn.cursor()
+    def _get_by_user(self, user_id: str, limit: int, offset: int) -> List[Conversation]:
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT id, user_id, topic, summary, created_date, update_date
-            FROM conversations 
-            WHERE user_id = ?
-            ORDER BY update_date DESC
-            LIMIT ? OFFSET ?
-        """,
-            (user_id, limit, offset),
-        )
+            cursor.execute(
+                """
+                SELECT id, user_id, topic, summary, created_date, update_date
+                FROM conversations
+                WHERE user_id = ?
+                ORDER BY update_date DESC
+                LIMIT ? OFFSET ?
+            """,
+                (user_id, limit, offset),
+            )
+            rows = cursor.fetchall()
 
         conversations = []
-        for row in cursor.fetchall():
+        for row in rows:
             conversation = Conversation(
                 id=row[0],
                 user_id=row[1],
@@ -197,44 +259,71 @@ class ConversationStore:
             )
             conversations.append(conversation)
 
-        conn.close()
         return conversations
 
-    async def delete(self, conversation_id: str) -> bool:
-        conn = self.get_sqlite_connect()
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
-        deleted_rows = cursor.rowcount
-
-        conn.commit()
-        conn.close()
+    def _delete(self, conversation_id: str) -> bool:
+        with self._write_lock, self._writer as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+            )
+            deleted_rows = cursor.rowcount
 
         return deleted_rows > 0
 
-    async def remove_old_conversations(self, user_id: str, days_old: int = 30) -> int:
+    def _remove_old_conversations(self, user_id: str, days_old: int) -> int:
         cutoff_date = datetime.now().replace(microsecond=0)
         cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_old)
 
-        conn = self.get_sqlite_connect()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            DELETE FROM conversations 
-            WHERE user_id = ? AND update_date < ?
-        """,
-            (user_id, cutoff_date.isoformat()),
-        )
-
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with self._write_lock, self._writer as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE FROM conversations
+                WHERE user_id = ? AND update_date < ?
+            """,
+                (user_id, cutoff_date.isoformat()),
+            )
+            deleted_count = cursor.rowcount
 
         return deleted_count
 
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """읽기 연결 대여 (풀이 비어 있으면 새로 열고, 사용 후 반납)"""
+        with self._reader_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self.get_sqlite_connect()
+                conn.execute("PRAGMA query_only=ON")
+            try:
+                yield conn
+            finally:
+                # 읽기 트랜잭션을 끝내야 WAL 체크포인트가 진행됨
+                conn.rollback()
+                self._readers.put(conn)
+
     def get_sqlite_connect(self):
-        return sqlite3.connect(self.db_path)
+        """스레드 간 공유 가능한 연결 (WAL 읽기/쓰기용 pragma 적용)"""
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout, check_same_thread=False
+        )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8192")  # 8MB
+        return conn
 
     def commit(self, conn):
         conn.commit()
+
+    def close(self) -> None:
+        self._write_pool.shutdown(wait=True)
+        with self._write_lock:
+            self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                return
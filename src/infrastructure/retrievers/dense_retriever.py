@@ -1,22 +1,263 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
+import threading
+import numpy as np
+from ..storage.span_store import SpanStore
+from ..storage.index_generation import IndexGeneration
+from ..embeddings.embedding_coalescer import EmbeddingCoalescer
+from ..concurrency.hedging import Hedger
+from .sharded_search import ShardedSearcher, write_dense_index
+from ..concurrency.executors import WorkloadExecutors, run_in
 
 
 class DenseReriever:
-    def __init__(self, vector_store):
+    def __init__(
+        self,
+        vector_store,
+        span_store: Optional[SpanStore] = None,
+        embeddings=None,
+        coalescer: Optional[EmbeddingCoalescer] = None,
+        hedger: Optional[Hedger] = None,
+        executors: Optional[WorkloadExecutors] = None,
+    ):
         self.vector_store = vector_store
+        self.span_store = span_store
+        # 지정시 질의 임베딩을 직접 계산 (CachedEmbeddings로 캐시 적용)
+        self.embeddings = embeddings
+        # 지정시 동시 요청된 질의 임베딩을 모아 한 번에 요청
+        self.coalescer = coalescer
+        self.hedger = hedger
+        # 벡터스토어 조회/행렬곱은 dense, 임베딩 API 호출은 io 실행기에서 실행
+        self.executors = executors
 
-    async def search(self, query: str, k: int) -> List[Dict[str, Any]]:
-        results = await asyncio.to_thread(
-            self.vector_store.similarity_search_with_score, query, k
+        # 배치 검색용 정규화 임베딩 행렬 (첫 배치 검색시 로드, 컬렉션 크기 변경시 재로드)
+        self._matrix_lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_docs: List[Dict[str, Any]] = []
+        self._matrix_count = -1
+
+        # Chroma 서버(ChromaHttpStore)는 비동기 클라이언트로 직접 조회
+        self.is_remote = getattr(vector_store, "is_remote", False)
+
+        # 지정시 점수 계산을 워커 프로세스 샤드에 분산
+        # 결과 점수는 모든 경로에서 코사인 유사도 (클수록 유사)
+        self.sharded: Optional[ShardedSearcher] = None
+        self._index_generation: Optional[IndexGeneration] = None
+        self._sharded_generation: Optional[str] = None
+
+    async def search(
+        self,
+        query: str,
+        k: int,
+        embedding: Optional[List[float]] = None,
+        materialize: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """dense 검색
+
+        embedding이 주어지면 질의 임베딩 호출 없이 해당 벡터로 바로 검색
+        materialize=False면 span 기반 청크 원문 복원을 생략"""
+        if embedding is None and self.coalescer is not None:
+            embedding = await self.coalescer.embed(query)
+        elif embedding is None and self.embeddings is not None:
+            embedding = await self._embed_query(query)
+
+        if embedding is not None and self._shards_current():
+            hits = await self.sharded.adense(self._normalize([embedding]), k)
+            return self._results(hits[0], self._matrix_docs, materialize)
+
+        if embedding is not None and self.is_remote:
+            # Chroma 서버는 커넥션 풀 비동기 클라이언트로 바로 조회 (실행기 불필요)
+            results = (await self.vector_store.aquery([embedding], k))[0]
+        elif embedding is not None:
+            results = await run_in(
+                self.executors,
+                "dense",
+                self.vector_store.similarity_search_by_vector_with_relevance_scores,
+                embedding,
+                k,
+            )
+        else:
+            results = await run_in(
+                self.executors,
+                "dense",
+                self.vector_store.similarity_search_with_score,
+                query,
+                k,
+            )
+
+        return [self._result(doc, score, materialize) for doc, score in results]
+
+    def _result(self, doc, score: float, materialize: bool = True) -> Dict[str, Any]:
+        return {
+            "id": doc.metadata.get("chunk_id"),
+            "page_content": (
+                self._materialize(doc.page_content, doc.metadata)
+                if materialize
+                else doc.page_content
+            ),
+            "metadata": doc.metadata,
+            "score": self._similarity(score),
+            "source": "dense",
+        }
+
+    def _similarity(self, distance: float) -> float:
+        """Chroma 거리(작을수록 유사)를 행렬/샤드 경로와 같은 코사인 유사도로 변환
+
+        임베딩은 단위 벡터로 가정: l2(제곱 거리) = 2 - 2cos, cosine/ip = 1 - cos"""
+        if self.is_remote:
+            space = self.vector_store.distance_space
+        else:
+            metadata = self.vector_store._collection.metadata or {}
+            space = metadata.get("hnsw:space", "l2")
+        return 1.0 - distance / 2 if space == "l2" else 1.0 - distance
+
+    async def _embed_query(self, query: str) -> List[float]:
+        if self.hedger is None:
+            return await run_in(
+                self.executors, "io", self.embeddings.embed_query, query
+            )
+        return await self.hedger.run(lambda: self.embeddings.embed_query(query))
+
+    async def search_batch(
+        self, queries: List[str], k: int, embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """여러 질의를 한 번의 임베딩 요청과 한 번의 행렬곱으로 검색 (점수는 코사인 유사도)"""
+        if not queries:
+            return []
+        if embeddings is None:
+            embeddings = await run_in(
+                self.executors, "io", self._embed_queries, queries
+            )
+        if self._shards_current():
+            hits = await self.sharded.adense(self._normalize(embeddings), k)
+            return [self._results(h, self._matrix_docs) for h in hits]
+        if self.is_remote:
+            # 서버에 질의 임베딩을 한 번에 보내 조회
+            batch = await self.vector_store.aquery(embeddings, k)
+            return [
+                [self._result(doc, score) for doc, score in results]
+                for results in batch
+            ]
+        return await run_in(
+            self.executors, "dense", self._search_matrix, embeddings, k
         )
 
+    def build_shard_index(self, index_dir: str) -> None:
+        """샤딩 검색용 정규화 임베딩 행렬 파일 저장 (행 순서는 _matrix_docs와 동일)"""
+        matrix, _ = self._load_matrix()
+        if matrix is not None:
+            write_dense_index(index_dir, matrix)
+
+    def use_shards(
+        self,
+        searcher: ShardedSearcher,
+        index_generation: Optional[IndexGeneration] = None,
+    ) -> None:
+        """샤드 파일이 현재 컬렉션과 같은 행 수일 때만 샤딩 사용
+
+        샤드 결과의 행 번호를 _matrix_docs로 복원하므로 기존 샤드 디렉터리로 재시작한
+        경우에도 행렬/문서 목록을 먼저 로드"""
+        matrix, _ = self._load_matrix()
+        rows = searcher.rows["dense"]
+        if matrix is None or matrix.shape[0] != rows:
+            if rows:
+                print(f"dense 샤드 행 수 불일치 ({rows} != {self._matrix_count}), 샤딩 미사용")
+            self.sharded = None
+            return
+        self.sharded = searcher
+        self._index_generation = index_generation
+        if index_generation is not None:
+            self._sharded_generation = index_generation.current()
+
+    def _shards_current(self) -> bool:
+        """샤드 파일 생성 이후 인덱스 세대가 바뀌었으면 (프로세스 내 재크롤링) 샤딩 중단
+
+        검색마다 컬렉션 행 수를 세지 않고 세대 파일 mtime만 확인 (이벤트 루프 블로킹 방지)"""
+        if self.sharded is None:
+            return False
+        if (
+            self._index_generation is not None
+            and self._index_generation.current() != self._sharded_generation
+        ):
+            self.sharded = None
+            return False
+        return True
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        if hasattr(self.embeddings, "embed_queries"):
+            return self.embeddings.embed_queries(queries)
+        return self.embeddings.embed_documents(queries)
+
+    def _search_matrix(
+        self, embeddings: List[List[float]], k: int
+    ) -> List[List[Dict[str, Any]]]:
+        matrix, docs = self._load_matrix()
+        if matrix is None:
+            return [[] for _ in embeddings]
+
+        # (질의 x 문서) 유사도를 한 번에 계산
+        scores = self._normalize(embeddings) @ matrix.T
+
+        k = min(k, matrix.shape[0])
+        results = []
+        for row in scores:
+            candidates = np.argpartition(row, -k)[-k:]
+            top_k_indices = candidates[np.argsort(row[candidates])[::-1]]
+            hits = [(int(idx), float(row[idx])) for idx in top_k_indices]
+            results.append(self._results(hits, docs))
+        return results
+
+    def _normalize(self, embeddings: List[List[float]]) -> np.ndarray:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _results(
+        self,
+        hits: List[Tuple[int, float]],
+        docs: List[Dict[str, Any]],
+        materialize: bool = True,
+    ) -> List[Dict[str, Any]]:
         return [
             {
-                "page_content": doc.page_content,
-                "metadata": doc.metadata,
+                "id": docs[idx]["metadata"].get("chunk_id"),
+                "page_content": (
+                    self._materialize(docs[idx]["content"], docs[idx]["metadata"])
+                    if materialize
+                    else docs[idx]["content"]
+                ),
+                "metadata": docs[idx]["metadata"],
                 "score": score,
                 "source": "dense",
             }
-            for doc, score in results
+            for idx, score in hits
         ]
+
+    def _load_matrix(self):
+        collection = self.vector_store._collection
+        with self._matrix_lock:
+            count = collection.count()
+            if count != self._matrix_count:
+                data = collection.get(include=["embeddings", "metadatas", "documents"])
+                embeddings = data.get("embeddings")
+                if count and embeddings is not None and len(embeddings):
+                    matrix = np.asarray(embeddings, dtype=np.float32)
+                    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                    self._matrix = matrix / np.where(norms == 0, 1, norms)
+                    self._matrix_docs = [
+                        {"content": content or "", "metadata": metadata or {}}
+                        for content, metadata in zip(
+                            data["documents"], data["metadatas"]
+                        )
+                    ]
+                else:
+                    self._matrix = None
+                    self._matrix_docs = []
+                self._matrix_count = count
+            return self._matrix, self._matrix_docs
+
+    def _materialize(self, content: str, metadata: Dict[str, Any]) -> str:
+        # span 기반 청크는 Chroma에 원문이 없으므로 span store에서 복원
+        if self.span_store is None:
+            return content
+        return self.span_store.materialize(content, metadata)
@@ -0,0 +1,217 @@
+"""
+샤딩된 scatter-gather 검색
+
+dense 임베딩 행렬과 BM25 가중치 행렬(CSR)을 .npy 파일로 저장하고
+워커 프로세스들이 mmap으로 공유해 각자 담당 행 범위(샤드)의 top-k를 계산
+메인 프로세스는 질의를 모든 샤드에 동시에 보내고 샤드별 top-k를 병합
+(점수 계산이 GIL에 묶이지 않으므로 대용량 코퍼스에서 코어 수만큼 처리량 확장)
+
+질의 임베딩/토큰화와 결과 문서 복원은 메인 프로세스의 retriever가 담당
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# (전역 문서 번호, 점수) 목록
+ShardHits = List[Tuple[int, float]]
+
+# 워커 프로세스별 mmap 핸들 (디렉터리별로 한 번만 열기)
+_WORKER_INDEXES: Dict[str, Dict[str, Any]] = {}
+
+
+def write_dense_index(index_dir: str, matrix: np.ndarray) -> None:
+    """정규화된 (문서 x 차원) 임베딩 행렬 저장"""
+    path = Path(index_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / "dense.npy", np.ascontiguousarray(matrix, dtype=np.float32))
+
+
+def write_sparse_index(
+    index_dir: str, matrix: sparse.csr_matrix, vocabulary: Optional[str] = None
+) -> None:
+    """(문서 x 어휘) BM25 가중치 CSR 행렬 저장
+
+    vocabulary: 어휘 → 열 번호 매핑의 해시 (재시작시 같은 열 배치인지 검증용)"""
+    path = Path(index_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / "sparse_data.npy", matrix.data.astype(np.float32))
+    np.save(path / "sparse_indices.npy", matrix.indices.astype(np.int32))
+    np.save(path / "sparse_indptr.npy", matrix.indptr.astype(np.int64))
+    with open(path / "sparse_meta.json", "w", encoding="utf-8") as f:
+        json.dump({"shape": list(matrix.shape), "vocabulary": vocabulary}, f)
+
+
+def read_sparse_meta(index_dir: str) -> Optional[Dict[str, Any]]:
+    path = Path(index_dir) / "sparse_meta.json"
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _open_index(index_dir: str) -> Dict[str, Any]:
+    index = _WORKER_INDEXES.get(index_dir)
+    if index is not None:
+        return index
+
+    path = Path(index_dir)
+    index = {}
+    if (path / "dense.npy").exists():
+        index["dense"] = np.load(path / "dense.npy", mmap_mode="r")
+    if (path / "sparse_meta.json").exists():
+        with open(path / "sparse_meta.json", encoding="utf-8") as f:
+            index["sparse_shape"] = tuple(json.load(f)["shape"])
+        for name in ("data", "indices", "indptr"):
+            index[f"sparse_{name}"] = np.load(
+                path / f"sparse_{name}.npy", mmap_mode="r"
+            )
+    _WORKER_INDEXES[index_dir] = index
+    return index
+
+
+def _top_k(scores: np.ndarray, k: int, offset: int, positive_only: bool) -> ShardHits:
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    candidates = np.argpartition(scores, -k)[-k:]
+    order = candidates[np.argsort(scores[candidates])[::-1]]
+    return [
+        (offset + int(idx), float(scores[idx]))
+        for idx in order
+        if not positive_only or scores[idx] > 0
+    ]
+
+
+def _dense_shard(
+    index_dir: str, start: int, end: int, queries: np.ndarray, k: int
+) -> List[ShardHits]:
+    matrix = _open_index(index_dir)["dense"][start:end]
+    scores = queries @ matrix.T
+    return [_top_k(row, k, start, positive_only=False) for row in scores]
+
+
+def _sparse_shard(
+    index_dir: str, start: int, end: int, query_terms: List[List[int]], k: int
+) -> List[ShardHits]:
+    index = _open_index(index_dir)
+    indptr = index["sparse_indptr"]
+    lo, hi = int(indptr[start]), int(indptr[end])
+    # mmap 배열 슬라이스로 샤드 행만 CSR로 구성 (복사 없이 view 사용)
+    matrix = sparse.csr_matrix(
+        (
+            index["sparse_data"][lo:hi],
+            index["sparse_indices"][lo:hi],
+            np.asarray(indptr[start : end + 1]) - lo,
+        ),
+        shape=(end - start, index["sparse_shape"][1]),
+        copy=False,
+    )
+
+    rows = [row for row, terms in enumerate(query_terms) for _ in terms]
+    cols = [col for terms in query_terms for col in terms]
+    query_matrix = sparse.csr_matrix(
+        (np.ones(len(cols), dtype=np.float32), (rows, cols)),
+        shape=(len(query_terms), matrix.shape[1]),
+    )
+    scores = (query_matrix @ matrix.T).toarray()
+    return [_top_k(row, k, start, positive_only=True) for row in scores]
+
+
+def _warm_up(index_dir: str) -> int:
+    _open_index(index_dir)
+    return os.getpid()
+
+
+class ShardedSearcher:
+    def __init__(self, index_dir: str, shards: int):
+        self.index_dir = str(index_dir)
+        self.shards = max(1, shards)
+
+        # 인덱스 종류(dense/sparse)별 샤드 파일의 행 수와 샤드 행 범위
+        index = _open_index(self.index_dir)
+        self.rows = {
+            "dense": index["dense"].shape[0] if "dense" in index else 0,
+            "sparse": index.get("sparse_shape", (0, 0))[0],
+        }
+        self.ranges = {kind: self._split(rows) for kind, rows in self.rows.items()}
+        _WORKER_INDEXES.pop(self.index_dir, None)
+
+        # main.py는 모듈 최상단에서 서버를 초기화하므로 spawn(메인 모듈 재실행) 대신 fork 사용
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.shards, mp_context=multiprocessing.get_context("fork")
+        )
+        # 이벤트 루프 시작 전에 워커를 모두 띄우고 인덱스를 mmap으로 열어둠
+        warm_ups = [
+            self.executor.submit(_warm_up, self.index_dir) for _ in range(self.shards)
+        ]
+        self.worker_pids = sorted({f.result() for f in warm_ups})
+
+    def has(self, kind: str) -> bool:
+        return bool(self.ranges[kind])
+
+    def dense(self, queries: np.ndarray, k: int) -> List[ShardHits]:
+        """정규화된 질의 임베딩 (질의 x 차원) → 질의별 전역 top-k"""
+        futures = self._scatter("dense", np.asarray(queries, np.float32), k)
+        return self._gather([f.result() for f in futures], k, len(queries))
+
+    def sparse(self, query_terms: List[List[int]], k: int) -> List[ShardHits]:
+        """질의별 어휘 열 번호 목록 → 질의별 전역 top-k"""
+        futures = self._scatter("sparse", query_terms, k)
+        return self._gather([f.result() for f in futures], k, len(query_terms))
+
+    async def adense(self, queries: np.ndarray, k: int) -> List[ShardHits]:
+        futures = self._scatter("dense", np.asarray(queries, np.float32), k)
+        return self._gather(await self._wait(futures), k, len(queries))
+
+    async def asparse(self, query_terms: List[List[int]], k: int) -> List[ShardHits]:
+        futures = self._scatter("sparse", query_terms, k)
+        return self._gather(await self._wait(futures), k, len(query_terms))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "index_dir": self.index_dir,
+            "shards": self.shards,
+            "ranges": self.ranges,
+            "worker_pids": self.worker_pids,
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _split(self, num_rows: int) -> List[Tuple[int, int]]:
+        bounds = np.linspace(0, num_rows, min(self.shards, num_rows) + 1)
+        bounds = bounds.astype(np.int64)
+        return [(int(bounds[i]), int(bounds[i + 1])) for i in range(len(bounds) - 1)]
+
+    def _scatter(self, kind: str, queries, k: int) -> List[Future]:
+        fn = _dense_shard if kind == "dense" else _sparse_shard
+        return [
+            self.executor.submit(fn, self.index_dir, start, end, queries, k)
+            for start, end in self.ranges[kind]
+        ]
+
+    async def _wait(self, futures: Sequence[Future]) -> List[List[ShardHits]]:
+        return await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+
+    def _gather(
+        self, shard_results: List[List[ShardHits]], k: int, num_queries: int
+    ) -> List[ShardHits]:
+        merged = []
+        for q in range(num_queries):
+            hits = [hit for shard in shard_results for hit in shard[q]]
+            hits.sort(key=lambda hit: hit[1], reverse=True)
+            merged.append(hits[:k])
+        return merged
+
+
+def shard_index_dir(persist_dir: str, generation: str) -> str:
+    """인덱스 세대별 샤드 파일 디렉터리 (재크롤링시 새 디렉터리에 다시 생성)"""
+    return os.path.join(persist_dir, "shards", generation or "initial")
@@ -0,0 +1,62 @@
+from typing import Any, List
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+class SpanHydratingRetriever(BaseRetriever):
+    """span 기반으로 저장된 청크의 원문을 복원하는 retriever 래퍼
+
+    Chroma에는 빈 문서만 저장되므로 RetrievalQA 체인에 넘기기 전에 원문을 채움"""
+
+    base_retriever: BaseRetriever
+    span_store: Any
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        docs = self.base_retriever.invoke(
+            query, config={"callbacks": run_manager.get_child()}
+        )
+        return [
+            Document(
+                page_content=self.span_store.materialize(doc.page_content, doc.metadata),
+                metadata=doc.metadata,
+            )
+            for doc in docs
+        ]
+
+
+class ContextPackingRetriever(BaseRetriever):
+    """검색 결과를 토큰 예산 안으로 패킹하는 retriever 래퍼
+
+    겹치는 청크를 병합한(packer에 compressor가 있으면 질의 기준으로 압축한) 블록을 반환
+    각 문서 metadata["packing"]에 packed/raw 토큰 수 등 패킹 통계 포함"""
+
+    base_retriever: BaseRetriever
+    packer: Any
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        docs = self.base_retriever.invoke(
+            query, config={"callbacks": run_manager.get_child()}
+        )
+        packed = self.packer.pack(
+            [{"content": doc.page_content, "metadata": doc.metadata} for doc in docs],
+            query=query,
+        )
+        stats = packed.stats()
+        return [
+            Document(
+                page_content=block.content,
+                metadata={
+                    **block.metadata,
+                    "chunk_indices": block.chunk_indices,
+                    "tokens": block.tokens,
+                    "truncated": block.truncated,
+                    "packing": stats,
+                },
+            )
+            for block in packed.blocks
+        ]
@@ -1,38 +1,171 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
+import hashlib
 from rank_bm25 import BM25Okapi
+from scipy import sparse
 import numpy as np
 import re
+from ..storage.span_store import SpanStore
+from .sharded_search import ShardedSearcher, read_sparse_meta, write_sparse_index
+from ..concurrency.executors import WorkloadExecutors, run_in
 
 
 class SparseRetriever:
-    def __init__(self, documents: List[str]):
-        self.tokenized_docs = [self._tokenize(doc) for doc in documents]
-        self.bm25 = BM25Okapi(self.tokenized_docs)
+    def __init__(
+        self,
+        documents: List[Union[str, Dict[str, Any]]],
+        span_store: Optional[SpanStore] = None,
+        executors: Optional[WorkloadExecutors] = None,
+    ):
+        self.span_store = span_store
+        self.executors = executors
         self.documents = documents
+        # 토큰화 결과는 BM25 통계 계산에만 쓰고 보관하지 않음
+        # (span 기반 청크는 원문도 메모리에 올리지 않고 검색 결과에서만 복원)
+        bm25 = BM25Okapi([self._tokenize(self._get_text(doc)) for doc in documents])
+        self.vocabulary, self.doc_term_weights = self._build_weight_matrix(bm25)
+        # 지정시 점수 계산을 워커 프로세스 샤드에 분산
+        self.sharded: Optional[ShardedSearcher] = None
 
-    async def search(self, query: str, k: int) -> List[Dict[str, Any]]:
-        tokenized_query = self._tokenize(query)
+    def _build_weight_matrix(self, bm25: BM25Okapi):
+        """BM25 점수를 (문서 x 어휘) 희소 가중치 행렬로 미리 계산
 
-        scores = self.bm25.get_scores(tokenized_query)
-        top_k_indices = np.argsort(scores)[::-1][:k]
+        질의 토큰은 중복 제거되므로 점수는 (질의 x 어휘) 0/1 행렬과의 곱 한 번으로 계산됨
+        rank_bm25의 get_scores와 동일한 점수이면서 질의 여러 개를 한 번에 처리 가능
+        어휘 열 번호는 정렬된 용어 순서로 부여 (해시 시드와 무관하게 재시작 후에도 동일)"""
+        vocabulary = {term: col for col, term in enumerate(sorted(bm25.idf))}
+        rows, cols, values = [], [], []
 
+        doc_len = np.asarray(bm25.doc_len, dtype=np.float64)
+        length_norm = bm25.k1 * (1 - bm25.b + bm25.b * doc_len / bm25.avgdl)
+
+        for doc_idx, freqs in enumerate(bm25.doc_freqs):
+            for term, tf in freqs.items():
+                rows.append(doc_idx)
+                cols.append(vocabulary[term])
+                values.append(
+                    bm25.idf[term] * tf * (bm25.k1 + 1) / (tf + length_norm[doc_idx])
+                )
+
+        matrix = sparse.csr_matrix(
+            (values, (rows, cols)),
+            shape=(len(bm25.doc_freqs), len(vocabulary)),
+            dtype=np.float32,
+        )
+        return vocabulary, matrix
+
+    async def search(
+        self, query: str, k: int, materialize: bool = True
+    ) -> List[Dict[str, Any]]:
+        return (await self.asearch_batch([query], k, materialize))[0]
+
+    async def asearch_batch(
+        self, queries: List[str], k: int, materialize: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """BM25 점수 계산을 이벤트 루프 밖(sparse 전용 실행기)에서 수행"""
+        return await run_in(
+            self.executors, "sparse", self.search_batch, queries, k, materialize
+        )
+
+    def search_batch(
+        self, queries: List[str], k: int, materialize: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """여러 질의를 한 번의 희소 행렬곱으로 점수 계산 후 질의별 top-k 반환
+
+        materialize=False면 span 기반 청크 원문 복원을 생략 (스트리밍 검색의 중간 결과용)"""
+        query_terms = [self._query_terms(query) for query in queries]
+        if self.sharded is not None:
+            hits = self.sharded.sparse(query_terms, k)
+            return [self._results(query_hits, materialize) for query_hits in hits]
+
+        scores = (self._query_matrix(query_terms) @ self.doc_term_weights.T).toarray()
+        return [self._results(self._top_k(row, k), materialize) for row in scores]
+
+    def build_shard_index(self, index_dir: str) -> None:
+        """샤딩 검색용 BM25 가중치 행렬 파일 저장"""
+        write_sparse_index(
+            index_dir, self.doc_term_weights, self._vocabulary_digest()
+        )
+
+    def shard_index_current(self, index_dir: str) -> bool:
+        """저장된 샤드 파일이 현재 가중치 행렬과 같은 크기/어휘 열 배치인지 확인"""
+        meta = read_sparse_meta(index_dir)
+        return (
+            meta is not None
+            and tuple(meta["shape"]) == self.doc_term_weights.shape
+            and meta.get("vocabulary") == self._vocabulary_digest()
+        )
+
+    def use_shards(self, searcher: ShardedSearcher) -> None:
+        """샤드 파일이 현재 인덱스와 일치할 때만 샤딩 사용"""
+        if not searcher.has("sparse"):
+            self.sharded = None
+        elif not self.shard_index_current(searcher.index_dir):
+            print("sparse 샤드 인덱스 불일치, 샤딩 미사용")
+            self.sharded = None
+        else:
+            self.sharded = searcher
+
+    def _vocabulary_digest(self) -> str:
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        return hashlib.sha256("\n".join(terms).encode("utf-8")).hexdigest()
+
+    def _query_terms(self, query: str) -> List[int]:
+        terms = (self.vocabulary.get(token) for token in self._tokenize(query))
+        return [col for col in terms if col is not None]
+
+    def _query_matrix(self, query_terms: List[List[int]]) -> sparse.csr_matrix:
+        rows = [row for row, terms in enumerate(query_terms) for _ in terms]
+        cols = [col for terms in query_terms for col in terms]
+
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(query_terms), len(self.vocabulary)),
+        )
+
+    def _top_k(self, scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        if k < len(scores):
+            candidates = np.argpartition(scores, -k)[-k:]
+        else:
+            candidates = np.arange(len(scores))
+        top_k_indices = candidates[np.argsort(scores[candidates])[::-1]]
+        return [(int(idx), float(scores[idx])) for idx in top_k_indices]
+
+    def _results(
+        self, hits: List[Tuple[int, float]], materialize: bool = True
+    ) -> List[Dict[str, Any]]:
         results = []
 
-        for idx in top_k_indices:
-            if scores[idx] > 0:
+        for idx, score in hits:
+            if score > 0:
+                doc = self.documents[idx]
+                metadata = doc.get("metadata", {}) if isinstance(doc, dict) else {}
                 results.append(
                     {
-                        "page_content": self.documents[idx],
-                        "metadata": {"index": idx},
-                        "score": scores[idx],
+                        "id": metadata.get("chunk_id"),
+                        "page_content": (
+                            self._get_text(doc) if materialize else self._raw_text(doc)
+                        ),
+                        "metadata": {**metadata, "index": idx},
+                        "score": score,
                         "source": "sparse",
                     }
                 )
         return results
 
+    def _raw_text(self, doc: Union[str, Dict[str, Any]]) -> str:
+        return doc if isinstance(doc, str) else doc.get("content", "")
+
+    def _get_text(self, doc: Union[str, Dict[str, Any]]) -> str:
+        if isinstance(doc, str):
+            return doc
+        content = doc.get("content", "")
+        if self.span_store is None:
+            return content
+        return self.span_store.materialize(content, doc.get("metadata", {}))
+
     def _tokenize(self, text: str) -> List[str]:
         # 코드 토큰 (함수명, 클래스명) 보존
         code_tokens = re.findall(r"\b[a-zA-Z_][a-zA-Z0-9_]*\b", text)
         # 그외 토큰
         word_tokens = text.lower().split()
-        return list(set(code_tokens + word_tokens))
+        return list(dict.fromkeys(code_tokens + word_tokens))
@@ -0,0 +1,6 @@
+"""Storage Package
+
+청크 원문 저장소 구현체들을 포함
+- span_store: 파일 원문 1회 압축 저장 + (file_id, start, end) span 기반 청크
+- positional_index: 파일 → 순서대로 정렬된 청크 위치 (인접 청크/함수 범위 조회)
+"""
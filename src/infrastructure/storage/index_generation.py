@@ -0,0 +1,72 @@
+"""
+인덱스 세대(generation) 관리
+
+크롤링으로 인덱스가 바뀔 때마다 persist 디렉토리의 세대 값을 갱신하여
+세대를 키에 포함하는 캐시들이 자동으로 무효화되도록 함
+공유 Chroma 서버(http 모드)를 쓰면 세대 값도 서버에 두어 다른 replica의 캐시까지 무효화
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class IndexGeneration:
+    FILE_NAME = "index_generation"
+    # 공유 세대 값 재조회 주기 (검색마다 서버에 요청하지 않도록)
+    SHARED_REFRESH_SECONDS = 5.0
+
+    def __init__(self, persist_dir: str, shared: Optional[Any] = None):
+        self.path = Path(persist_dir) / self.FILE_NAME
+        self._cached_value: Optional[str] = None
+        self._cached_mtime: Optional[int] = None
+
+        # read_generation() / write_generation(value)를 제공하는 공유 저장소
+        self.shared = shared
+        self._shared_value: Optional[str] = None
+        self._shared_checked_at = 0.0
+
+    def current(self) -> str:
+        """현재 세대 값 (파일 mtime이 바뀐 경우에만 다시 읽음)"""
+        if self.shared is not None:
+            return self._current_shared()
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return "0"
+
+        if mtime != self._cached_mtime:
+            self._cached_value = self.path.read_text(encoding="utf-8").strip() or "0"
+            self._cached_mtime = mtime
+        return self._cached_value
+
+    def bump(self) -> str:
+        """크롤링 완료 후 호출하여 새 세대 기록"""
+        value = f"{time.time_ns():x}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(value, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+        if self.shared is not None:
+            self.shared.write_generation(value)
+            self._shared_value = value
+            self._shared_checked_at = time.monotonic()
+        return value
+
+    def _current_shared(self) -> str:
+        now = time.monotonic()
+        if (
+            self._shared_value is None
+            or now - self._shared_checked_at >= self.SHARED_REFRESH_SECONDS
+        ):
+            try:
+                self._shared_value = self.shared.read_generation() or "0"
+            except Exception as e:
+                # 조회 실패시 마지막으로 읽은 값 유지
+                print(f"공유 인덱스 세대 조회 실패: {e}")
+                self._shared_value = self._shared_value or "0"
+            self._shared_checked_at = now
+        return self._shared_value
@@ -0,0 +1,104 @@
+"""
+청크 위치 인덱스
+
+span 저장소 manifest(파일별 청크 span 목록)로 파일 → 순서대로 정렬된 청크 위치를 구성
+검색 결과 청크의 앞뒤 청크나 감싸는 함수 범위를 벡터 검색 없이 dict 조회로 계산
+(청크 id는 크롤링시 부여한 "{file_id}:{chunk_index}" 형식)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ...models.symbol_models import Symbol
+
+
+class PositionalIndex:
+    FUNCTION_KINDS = ("function", "method")
+
+    def __init__(
+        self,
+        files: Dict[str, Dict[str, Any]],
+        symbols: Iterable[Symbol] = (),
+        generation: str = "0",
+    ):
+        # 구성에 사용한 인덱스 세대 (재크롤링 후에는 다시 구성해야 함)
+        self.generation = generation
+        self._spans: Dict[str, List[Tuple[int, int]]] = {}
+        self._file_ids: Dict[str, str] = {}
+        for file_id, entry in files.items():
+            self._spans[file_id] = [tuple(span) for span in entry["spans"]]
+            self._file_ids[entry["source"]] = file_id
+
+        # 파일별 함수/메서드 정의 (시작 위치 순)
+        self._functions: Dict[str, List[Symbol]] = {}
+        for symbol in symbols:
+            if symbol.kind in self.FUNCTION_KINDS and symbol.file_id in self._spans:
+                self._functions.setdefault(symbol.file_id, []).append(symbol)
+        for functions in self._functions.values():
+            functions.sort(key=lambda symbol: symbol.span_start)
+
+    @classmethod
+    def build(cls, span_store: Any, symbol_table: Any = None) -> "PositionalIndex":
+        symbols = symbol_table.symbols() if symbol_table is not None else ()
+        files = span_store.files()
+        return cls(files, symbols, span_store.generation())
+
+    def file_id(self, metadata: Dict[str, Any]) -> Optional[str]:
+        """청크 메타데이터의 file_id (없으면 source로 조회)"""
+        file_id = metadata.get("file_id") or self._file_ids.get(
+            metadata.get("source", "")
+        )
+        return file_id if file_id in self._spans else None
+
+    def chunk_ids(self, file_id: str) -> List[str]:
+        return [f"{file_id}:{i}" for i in range(len(self._spans.get(file_id, [])))]
+
+    def window(
+        self, file_id: str, chunk_index: int, before: int = 1, after: int = 1
+    ) -> Optional[Tuple[int, int]]:
+        """chunk_index 기준 앞뒤 청크까지의 (start, end) 원문 위치"""
+        spans = self._spans.get(file_id)
+        if not spans or not 0 <= chunk_index < len(spans):
+            return None
+        located = [
+            span
+            for span in spans[max(chunk_index - before, 0) : chunk_index + after + 1]
+            if span[1] > span[0]  # 원문에서 위치를 찾지 못한 청크는 (0, 0)
+        ]
+        if not located:
+            return None
+        return min(s for s, _ in located), max(e for _, e in located)
+
+    def enclosing(
+        self, file_id: str, start: int, end: int
+    ) -> Optional[Tuple[int, int]]:
+        """[start, end)와 겹치는 함수/메서드 정의 전체를 포함하는 (start, end)"""
+        overlapping = [
+            symbol
+            for symbol in self._functions.get(file_id, [])
+            if symbol.span_start < end and start < symbol.span_end
+        ]
+        if not overlapping:
+            return None
+        return (
+            min(start, min(symbol.span_start for symbol in overlapping)),
+            max(end, max(symbol.span_end for symbol in overlapping)),
+        )
+
+    def chunk_range(self, file_id: str, start: int, end: int) -> Tuple[int, int]:
+        """[start, end)에 포함되는 첫 번째/마지막 chunk_index
+
+        chunk_overlap 구간만 겹치는 청크는 제외 (청크 중앙이 범위 안에 있는 것만 포함)
+        구간이 한 청크보다 작으면 겹치는 청크 사용"""
+        spans = [
+            (i, s, e) for i, (s, e) in enumerate(self._spans.get(file_id, [])) if e > s
+        ]
+        indices = [i for i, s, e in spans if start <= (s + e) // 2 < end] or [
+            i for i, s, e in spans if s < end and start < e
+        ]
+        return (indices[0], indices[-1]) if indices else (-1, -1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._spans),
+            "chunks": sum(len(spans) for spans in self._spans.values()),
+            "functions": sum(len(f) for f in self._functions.values()),
+        }
@@ -0,0 +1,258 @@
+"""
+청크 원문 span 저장소
+
+청크마다 텍스트 복사본을 저장하면 chunk_overlap 구간이 두 번씩 저장되고
+Chroma와 sparse retriever 메모리에 같은 내용이 또 올라감
+파일 원문은 한 번만 압축(zstd, 미설치시 zlib)해서 저장하고
+청크는 (file_id, start, end) span으로만 표현하여 필요할 때 복원
+재크롤링으로 인덱스 세대가 바뀌면 manifest를 다시 읽고 압축 해제 캐시를 비움
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd 미설치 환경에서는 zlib으로 대체
+    zstandard = None
+
+from .index_generation import IndexGeneration
+
+
+class SpanStore:
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, root_dir: str, cache_size: int = 32):
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+
+        # 자주 조회되는 파일은 압축 해제된 상태로 LRU 보관
+        self._hot_files: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        # persist 디렉토리(spans/의 상위)의 인덱스 세대 기준으로 manifest 갱신 여부 판단
+        self._index_generation = IndexGeneration(str(self.root_dir.parent))
+        self._generation = self._index_generation.current()
+        self._manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+
+    @classmethod
+    def for_persist_dir(cls, persist_dir: str, cache_size: int = 32) -> "SpanStore":
+        """벡터스토어 persist 디렉토리 하위(spans/)에 저장소 생성"""
+        return cls(os.path.join(persist_dir, "spans"), cache_size)
+
+    @staticmethod
+    def file_id_for(source: str) -> str:
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def locate_chunks(text: str, chunks: List[str]) -> List[Optional[Tuple[int, int]]]:
+        """splitter가 만든 청크들의 원문 내 (start, end) 위치 계산
+
+        청크는 원문 순서대로 생성되므로 직전 청크 시작 위치 이후부터 탐색
+        원문에서 찾을 수 없는 청크는 None (호출측에서 원문을 그대로 저장)"""
+        spans = []
+        cursor = 0
+        for chunk in chunks:
+            start = text.find(chunk, cursor)
+            if start < 0:
+                start = text.find(chunk)
+            if start < 0:
+                spans.append(None)
+                continue
+            spans.append((start, start + len(chunk)))
+            cursor = start + 1
+        return spans
+
+    def put_file(self, source: str, text: str, spans: List[Tuple[int, int]]) -> str:
+        """파일 원문을 압축 저장하고 file_id 반환 (manifest 반영은 save 호출시)"""
+        file_id = self.file_id_for(source)
+        raw = text.encode("utf-8")
+        codec, payload = self._compress(raw)
+
+        (self.root_dir / f"{file_id}.{codec}").write_bytes(payload)
+
+        with self._lock:
+            self._manifest[file_id] = {
+                "source": source,
+                "codec": codec,
+                "raw_size": len(raw),
+                "stored_size": len(payload),
+                "spans": [list(span) for span in spans],
+            }
+            self._hot_files.pop(file_id, None)
+
+        return file_id
+
+    def remove_file(self, source: str) -> None:
+        """파일의 manifest 항목 제거 (재크롤링시 이전 span이 새 원문을 가리키지 않도록)"""
+        file_id = self.file_id_for(source)
+        with self._lock:
+            entry = self._manifest.pop(file_id, None)
+            self._hot_files.pop(file_id, None)
+        if entry is not None:
+            (self.root_dir / f"{file_id}.{entry['codec']}").unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """manifest를 원자적으로 기록"""
+        with self._lock:
+            data = json.dumps(self._manifest)
+
+        tmp_path = self.root_dir / f"{self.MANIFEST_FILE}.tmp"
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, self.root_dir / self.MANIFEST_FILE)
+
+    def generation(self) -> str:
+        """현재 읽고 있는 manifest의 인덱스 세대 (바뀌었으면 먼저 다시 읽음)"""
+        self._refresh()
+        return self._generation
+
+    def get_file(self, file_id: str) -> str:
+        self._refresh()
+        with self._lock:
+            text = self._hot_files.get(file_id)
+            if text is not None:
+                self._hot_files.move_to_end(file_id)
+                return text
+            entry = self._manifest.get(file_id)
+
+        if entry is None:
+            raise KeyError(f"Unknown file id: {file_id}")
+
+        payload = (self.root_dir / f"{file_id}.{entry['codec']}").read_bytes()
+        text = self._decompress(entry["codec"], payload).decode("utf-8")
+
+        with self._lock:
+            self._hot_files[file_id] = text
+            self._hot_files.move_to_end(file_id)
+            while len(self._hot_files) > self.cache_size:
+                self._hot_files.popitem(last=False)
+
+        return text
+
+    def get_span(self, file_id: str, start: int, end: int) -> str:
+        return self.get_file(file_id)[start:end]
+
+    def materialize(self, content: Optional[str], metadata: Dict[str, Any]) -> str:
+        """검색 결과 청크의 원문 복원
+
+        span 메타데이터가 없는 (기존 방식으로 저장된) 청크는 content를 그대로 반환"""
+        if content or "file_id" not in metadata:
+            return content or ""
+        try:
+            return self.get_span(
+                metadata["file_id"], metadata["span_start"], metadata["span_end"]
+            )
+        except (KeyError, OSError) as e:
+            print(f"span 복원 실패 {metadata.get('chunk_id')}: {e}")
+            return ""
+
+    def expand_lines(
+        self, file_id: str, start: int, end: int, before: int = 0, after: int = 0
+    ) -> Dict[str, Any]:
+        """span을 줄 단위로 확장 (청크 경계에서 잘린 코드 주변 확인용)"""
+        text = self.get_file(file_id)
+
+        # 현재 줄의 시작으로 이동 후 before 줄만큼 위로 확장
+        line_start = text.rfind("\n", 0, start) + 1
+        for _ in range(before):
+            if line_start == 0:
+                break
+            line_start = text.rfind("\n", 0, line_start - 1) + 1
+
+        # 현재 줄의 끝으로 이동 후 after 줄만큼 아래로 확장
+        line_end = text.find("\n", end)
+        line_end = len(text) if line_end < 0 else line_end
+        for _ in range(after):
+            if line_end >= len(text):
+                break
+            next_end = text.find("\n", line_end + 1)
+            line_end = len(text) if next_end < 0 else next_end
+
+        return {
+            "file_id": file_id,
+            "start": line_start,
+            "end": line_end,
+            "content": text[line_start:line_end],
+        }
+
+    def adjacent_chunks(
+        self, file_id: str, chunk_index: int, before: int = 1, after: int = 1
+    ) -> Dict[str, Any]:
+        """인접 청크까지 하나의 연속 span으로 병합하여 반환 (overlap 중복 없음)"""
+        self._refresh()
+        with self._lock:
+            entry = self._manifest.get(file_id)
+        if entry is None:
+            raise KeyError(f"Unknown file id: {file_id}")
+
+        spans = entry["spans"]
+        first = max(chunk_index - before, 0)
+        last = min(chunk_index + after, len(spans) - 1)
+        start, end = spans[first][0], spans[last][1]
+
+        return {
+            "file_id": file_id,
+            "source": entry["source"],
+            "first_chunk": first,
+            "last_chunk": last,
+            "start": start,
+            "end": end,
+            "content": self.get_span(file_id, start, end),
+        }
+
+    def files(self) -> Dict[str, Dict[str, Any]]:
+        """file_id → manifest 항목 (source, spans 등) 사본"""
+        self._refresh()
+        with self._lock:
+            return dict(self._manifest)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            raw_bytes = sum(e["raw_size"] for e in self._manifest.values())
+            stored_bytes = sum(e["stored_size"] for e in self._manifest.values())
+            return {
+                "files": len(self._manifest),
+                "raw_bytes": raw_bytes,
+                "stored_bytes": stored_bytes,
+                "compression_ratio": (stored_bytes / raw_bytes) if raw_bytes else 0.0,
+                "hot_files": len(self._hot_files),
+                "codec": "zst" if zstandard is not None else "zz",
+            }
+
+    def _refresh(self) -> None:
+        """다른 프로세스(크롤링)가 인덱스를 다시 만들었으면 manifest 재로드, 캐시 비움
+
+        크롤러는 manifest 저장 후 세대를 갱신하므로 새 세대에서는 새 manifest를 읽음"""
+        generation = self._index_generation.current()
+        if generation == self._generation:
+            return
+        manifest = self._load_manifest()
+        with self._lock:
+            self._manifest = manifest
+            self._hot_files.clear()
+            self._generation = generation
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        manifest_path = self.root_dir / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            return {}
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _compress(self, raw: bytes) -> Tuple[str, bytes]:
+        if zstandard is not None:
+            return "zst", zstandard.ZstdCompressor(level=9).compress(raw)
+        return "zz", zlib.compress(raw, 9)
+
+    def _decompress(self, codec: str, payload: bytes) -> bytes:
+        if codec == "zst":
+            if zstandard is None:
+                raise RuntimeError("zstandard package is required to read this index")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zlib.decompress(payload)
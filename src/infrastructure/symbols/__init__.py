@@ -0,0 +1,6 @@
+"""Symbols Package
+
+크롤링 단계에서 추출한 코드 심볼 테이블 구현체들을 포함
+- symbol_extractor: 언어별 (Kotlin, Java, Python, TS/JS) 정의 추출
+- symbol_table: 이름 → 파일/라인/청크 매핑 (exact, prefix 조회)
+"""
@@ -0,0 +1,276 @@
+"""
+코드 심볼 추출기
+
+정규식 기반으로 Kotlin, Java, Python, TS/JS 파일에서
+클래스, 인터페이스, 함수, 메서드, 상수 정의와 라인 범위를 추출
+(파서 의존성 없이 크롤링 단계에서 빠르게 처리하는 것이 목적이라 100% 정확하지는 않음)
+"""
+
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+from ...models.symbol_models import Symbol
+
+
+LANGUAGE_BY_EXTENSION = {
+    ".kt": "kotlin",
+    ".kts": "kotlin",
+    ".java": "java",
+    ".py": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+}
+
+# 선언처럼 보이지만 제어문/호출인 경우 제외
+_NON_DECLARATION_WORDS = {
+    "if",
+    "for",
+    "while",
+    "switch",
+    "catch",
+    "return",
+    "new",
+    "else",
+    "when",
+    "try",
+    "synchronized",
+    "throw",
+    "super",
+    "this",
+    "await",
+    "yield",
+    "function",
+}
+
+_JS_PATTERNS = [
+    (
+        "class",
+        r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(?P<name>[A-Za-z_$][\w$]*)",
+    ),
+    ("interface", r"^\s*(?:export\s+)?interface\s+(?P<name>[A-Za-z_$][\w$]*)"),
+    (
+        "function",
+        r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(?P<name>[A-Za-z_$][\w$]*)\s*\(",
+    ),
+    (
+        "function",
+        r"^\s*(?:export\s+)?(?:const|let|var)\s+(?P<name>[A-Za-z_$][\w$]*)\s*(?::[^=]+)?="
+        r"\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*(?::\s*[^=]+)?=>|[A-Za-z_$][\w$]*\s*=>)",
+    ),
+    (
+        "constant",
+        r"^\s*(?:export\s+)?const\s+(?P<name>[A-Z][A-Z0-9_]*)\s*(?::[^=]+)?=",
+    ),
+    (
+        "function",
+        r"^\s+(?:(?:public|private|protected|static|async|override|get|set)\s+)*"
+        r"(?P<name>[A-Za-z_$][\w$]*)\s*(?:<[^>]*>)?\s*\([^)]*\)\s*(?::\s*[^{=]+)?\{\s*$",
+    ),
+]
+
+_PATTERNS = {
+    "kotlin": [
+        (
+            "class",
+            r"^\s*(?:(?:public|private|internal|protected|open|abstract|sealed|data|enum"
+            r"|inner|annotation|value)\s+)*class\s+(?P<name>[A-Za-z_]\w*)",
+        ),
+        (
+            "interface",
+            r"^\s*(?:(?:public|private|internal|protected|sealed|fun)\s+)*interface\s+(?P<name>[A-Za-z_]\w*)",
+        ),
+        (
+            "class",
+            r"^\s*(?:(?:public|private|internal|protected|data)\s+)*object\s+(?P<name>[A-Za-z_]\w*)",
+        ),
+        (
+            "function",
+            r"^\s*(?:(?:public|private|internal|protected|open|override|abstract|suspend"
+            r"|inline|operator|infix|tailrec|external)\s+)*fun\s+(?:<[^>]*>\s*)?"
+            r"(?:[\w.<>?]+\.)?(?P<name>[A-Za-z_]\w*)\s*\(",
+        ),
+        (
+            "constant",
+            r"^\s*(?:(?:public|private|internal|protected)\s+)*const\s+val\s+(?P<name>[A-Za-z_]\w*)",
+        ),
+    ],
+    "java": [
+        (
+            "class",
+            r"^\s*(?:(?:public|private|protected|static|final|abstract|sealed|non-sealed)\s+)*"
+            r"(?:class|enum|record)\s+(?P<name>[A-Za-z_]\w*)",
+        ),
+        (
+            "interface",
+            r"^\s*(?:(?:public|private|protected|static|sealed)\s+)*@?interface\s+(?P<name>[A-Za-z_]\w*)",
+        ),
+        (
+            "constant",
+            r"^\s*(?:(?:public|private|protected)\s+)?static\s+final\s+[\w<>\[\],.?\s]+?\s+"
+            r"(?P<name>[A-Z][A-Z0-9_]*)\s*=",
+        ),
+        (
+            "function",
+            r"^\s*(?:(?:public|private|protected|static|final|abstract|synchronized|native|default)\s+)*"
+            r"(?:<[^>]+>\s+)?(?P<type>[\w<>\[\],.?]+)\s+(?P<name>[A-Za-z_]\w*)\s*\([^=]*$",
+        ),
+    ],
+    "python": [
+        ("class", r"^\s*class\s+(?P<name>[A-Za-z_]\w*)"),
+        ("function", r"^\s*(?:async\s+)?def\s+(?P<name>[A-Za-z_]\w*)\s*\("),
+        ("constant", r"^(?P<name>[A-Z][A-Z0-9_]*)\s*(?::\s*[^=]+)?=(?!=)"),
+    ],
+    "typescript": _JS_PATTERNS,
+    "javascript": _JS_PATTERNS,
+}
+
+_COMPILED = {
+    language: [(kind, re.compile(pattern)) for kind, pattern in patterns]
+    for language, patterns in _PATTERNS.items()
+}
+
+_STRING_LITERAL = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'")
+
+# 블록 끝을 찾을 때 선언 라인에서 탐색할 최대 라인 수
+MAX_BLOCK_LINES = 2000
+
+
+def extract_symbols(
+    source: str,
+    text: str,
+    file_id: Optional[str] = None,
+    chunk_spans: Optional[List[Optional[Tuple[int, int]]]] = None,
+) -> List[Symbol]:
+    """파일 원문에서 심볼 정의 추출
+
+    chunk_spans가 주어지면 정의 구간과 가장 많이 겹치는 청크의 chunk_id를 함께 기록"""
+    language = LANGUAGE_BY_EXTENSION.get(Path(source).suffix.lower())
+    if language is None:
+        return []
+
+    lines = text.split("\n")
+    line_offsets = [0]
+    for line in lines:
+        line_offsets.append(line_offsets[-1] + len(line) + 1)
+
+    symbols = []
+    for idx, line in enumerate(lines):
+        match = _match_declaration(language, line)
+        if match is None:
+            continue
+
+        kind, name = match
+        end_idx = idx if kind == "constant" else _block_end(lines, idx, language)
+        span_start = line_offsets[idx]
+        span_end = min(line_offsets[end_idx + 1] - 1, len(text))
+
+        symbols.append(
+            Symbol(
+                name=name,
+                qualified_name=name,
+                kind=kind,
+                language=language,
+                source=source,
+                line_start=idx + 1,
+                line_end=end_idx + 1,
+                span_start=span_start,
+                span_end=span_end,
+                file_id=file_id,
+                chunk_id=_best_chunk_id(file_id, chunk_spans, span_start, span_end),
+            )
+        )
+
+    _assign_containers(symbols)
+    return symbols
+
+
+def _match_declaration(language: str, line: str) -> Optional[Tuple[str, str]]:
+    for kind, pattern in _COMPILED[language]:
+        match = pattern.match(line)
+        if match is None:
+            continue
+
+        name = match.group("name")
+        declared_type = match.groupdict().get("type")
+        if name in _NON_DECLARATION_WORDS or declared_type in _NON_DECLARATION_WORDS:
+            continue
+        return kind, name
+    return None
+
+
+def _block_end(lines: List[str], idx: int, language: str) -> int:
+    """선언의 마지막 라인 인덱스 (python은 들여쓰기, 그 외는 중괄호 기준)"""
+    if language == "python":
+        indent = len(lines[idx]) - len(lines[idx].lstrip())
+        end = idx
+        for j in range(idx + 1, min(len(lines), idx + MAX_BLOCK_LINES)):
+            if not lines[j].strip():
+                continue
+            if len(lines[j]) - len(lines[j].lstrip()) <= indent:
+                break
+            end = j
+        return end
+
+    depth = 0
+    opened = False
+    for j in range(idx, min(len(lines), idx + MAX_BLOCK_LINES)):
+        line = _STRING_LITERAL.sub('""', lines[j]).split("//")[0]
+        for ch in line:
+            if ch == "{":
+                depth += 1
+                opened = True
+            elif ch == "}":
+                depth -= 1
+
+        if opened and depth <= 0:
+            return j
+        if not opened:
+            stripped = line.strip()
+            # 본문 없는 선언 (추상 메서드, expression body 등)
+            if stripped.endswith(";") or "=" in stripped:
+                return j
+            if j - idx >= 5:
+                return idx
+
+    return idx if not opened else min(len(lines) - 1, idx + MAX_BLOCK_LINES - 1)
+
+
+def _best_chunk_id(
+    file_id: Optional[str],
+    chunk_spans: Optional[List[Optional[Tuple[int, int]]]],
+    start: int,
+    end: int,
+) -> Optional[str]:
+    if file_id is None or not chunk_spans:
+        return None
+
+    best_index, best_overlap = None, 0
+    for i, span in enumerate(chunk_spans):
+        if span is None:
+            continue
+        overlap = min(span[1], max(end, start + 1)) - max(span[0], start)
+        if overlap > best_overlap:
+            best_index, best_overlap = i, overlap
+
+    return f"{file_id}:{best_index}" if best_index is not None else None
+
+
+def _assign_containers(symbols: List[Symbol]) -> None:
+    """클래스/인터페이스 범위 안의 심볼에 Outer.Inner.name 형태의 qualified_name 부여"""
+    containers: List[Symbol] = []
+
+    for symbol in symbols:  # line_start 오름차순
+        # 현재 라인보다 먼저 끝난 컨테이너 제거
+        while containers and containers[-1].line_end < symbol.line_start:
+            containers.pop()
+
+        if containers:
+            parent = containers[-1]
+            symbol.qualified_name = f"{parent.qualified_name}.{symbol.name}"
+            if symbol.kind == "function":
+                symbol.kind = "method"
+
+        if symbol.kind in ("class", "interface") and symbol.line_end > symbol.line_start:
+            containers.append(symbol)
@@ -0,0 +1,121 @@
+"""
+심볼 테이블
+
+심볼명 → 파일/라인 범위/chunk_id 매핑을 persist 디렉토리에 JSON으로 저장하고
+exact 조회는 해시 조회로, prefix 조회는 정렬된 키에 대한 이진 탐색으로 처리
+"""
+
+import bisect
+import json
+import os
+import re
+from typing import Dict, List, Optional
+from ...models.symbol_models import Symbol
+
+# `UserRepository.save`, `Foo::bar`, `save()` 처럼 식별자만으로 된 질의
+IDENTIFIER_PATTERN = re.compile(
+    r"^[A-Za-z_$][\w$]*(?:(?:\.|::|#)[A-Za-z_$][\w$]*)*(?:\(\))?$"
+)
+
+
+class SymbolTable:
+    FILE_NAME = "symbols.json"
+
+    def __init__(self, symbols: Optional[List[Symbol]] = None):
+        self._by_source: Dict[str, List[Symbol]] = {}
+        for symbol in symbols or []:
+            self._by_source.setdefault(symbol.source, []).append(symbol)
+
+        self._index: Dict[str, List[Symbol]] = {}
+        self._lower_index: Dict[str, List[Symbol]] = {}
+        self._sorted_keys: List[str] = []
+        self._dirty = True
+
+    @classmethod
+    def load(cls, persist_dir: str) -> "SymbolTable":
+        """persist 디렉토리에서 심볼 테이블 로드 (없으면 빈 테이블)"""
+        path = os.path.join(persist_dir, cls.FILE_NAME)
+        if not os.path.exists(path):
+            return cls()
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls([Symbol.from_dict(item) for item in data.get("symbols", [])])
+
+    def save(self, persist_dir: str) -> None:
+        os.makedirs(persist_dir, exist_ok=True)
+        path = os.path.join(persist_dir, self.FILE_NAME)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"symbols": [s.to_dict() for s in self.symbols()]}, f)
+        os.replace(tmp_path, path)
+
+    def set_file_symbols(self, source: str, symbols: List[Symbol]) -> None:
+        """파일 단위로 심볼 교체 (재크롤링시 이전 심볼 제거)"""
+        if symbols:
+            self._by_source[source] = list(symbols)
+        else:
+            self._by_source.pop(source, None)
+        self._dirty = True
+
+    def symbols(self) -> List[Symbol]:
+        return [s for symbols in self._by_source.values() for s in symbols]
+
+    def lookup(
+        self, name: str, limit: int = 20, ignore_case: bool = False
+    ) -> List[Symbol]:
+        """정확히 일치하는 심볼 조회
+
+        ignore_case면 대소문자 구분 결과가 없을 때 대소문자 무시하고 재조회"""
+        self._ensure_index()
+        matches = self._index.get(name)
+        if not matches and ignore_case:
+            matches = self._lower_index.get(name.lower())
+        return (matches or [])[:limit]
+
+    def lookup_prefix(self, prefix: str, limit: int = 20) -> List[Symbol]:
+        """prefix로 시작하는 심볼 조회 (대소문자 무시)"""
+        self._ensure_index()
+        prefix = prefix.lower()
+
+        results: List[Symbol] = []
+        seen = set()
+        pos = bisect.bisect_left(self._sorted_keys, prefix)
+        while pos < len(self._sorted_keys) and len(results) < limit:
+            key = self._sorted_keys[pos]
+            if not key.startswith(prefix):
+                break
+            for symbol in self._lower_index[key]:
+                if id(symbol) not in seen:
+                    seen.add(id(symbol))
+                    results.append(symbol)
+            pos += 1
+
+        return results[:limit]
+
+    def __len__(self) -> int:
+        return sum(len(symbols) for symbols in self._by_source.values())
+
+    def _ensure_index(self) -> None:
+        if not self._dirty:
+            return
+
+        index: Dict[str, List[Symbol]] = {}
+        lower_index: Dict[str, List[Symbol]] = {}
+        for symbol in self.symbols():
+            for key in self._keys_for(symbol):
+                index.setdefault(key, []).append(symbol)
+                lower_index.setdefault(key.lower(), []).append(symbol)
+
+        self._index = index
+        self._lower_index = lower_index
+        self._sorted_keys = sorted(lower_index)
+        self._dirty = False
+
+    def _keys_for(self, symbol: Symbol) -> List[str]:
+        # name, qualified_name 및 Outer.Inner.method -> Inner.method 같은 suffix도 키로 사용
+        parts = symbol.qualified_name.split(".")
+        keys = {".".join(parts[i:]) for i in range(len(parts))}
+        keys.add(symbol.name)
+        return list(keys)
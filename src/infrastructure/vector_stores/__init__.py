@@ -1,4 +1,6 @@
 """Vector Stores Package
 
 벡터 데이터베이스 구현체들을 포함
+- chroma_store: 임베디드 Chroma 청크 적재 유틸
+- chroma_http_store: Chroma 서버 공유용 커넥션 풀 클라이언트
 """
@@ -0,0 +1,252 @@
+"""
+Chroma 서버 클라이언트 (client-server 모드)
+
+여러 MCP 서버 프로세스가 임베디드 Chroma를 각자 여는 대신 하나의 Chroma 서버 인덱스를 공유
+- 조회: 프로세스 수명 동안 유지되는 httpx.AsyncClient (keep-alive 커넥션 풀, 타임아웃)
+  동시 요청은 풀의 여러 커넥션(HTTP/2 사용 가능시 하나의 커넥션에 다중화)으로 병렬 처리
+- 시작시 문서 로드/크롤링 적재: 이벤트 루프 밖에서 쓰는 동기 httpx.Client
+- 인덱스 세대: "{collection}_meta" 컬렉션 메타데이터에 저장해 모든 replica가 공유
+Chroma REST API v2 (/api/v2/tenants/{tenant}/databases/{database}/collections) 사용
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from langchain_core.documents import Document
+
+
+def _has_http2() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ChromaHttpStore:
+    # DenseReriever 등이 임베디드 Chroma와 구분하는 표시
+    is_remote = True
+    GENERATION_KEY = "index_generation"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        collection: str,
+        tenant: str = "default_tenant",
+        database: str = "default_database",
+        timeout: float = 10.0,
+        max_connections: int = 32,
+        ssl: bool = False,
+    ):
+        self.base_url = f"{'https' if ssl else 'http'}://{host}:{port}"
+        self.collection_name = collection
+        self.meta_collection_name = f"{collection}_meta"
+        self.collections_path = (
+            f"/api/v2/tenants/{tenant}/databases/{database}/collections"
+        )
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        )
+        self.http2 = _has_http2()
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._collection_id: Optional[str] = None
+        # 컬렉션 거리 함수 (hnsw:space, 미지정시 Chroma 기본값 l2)
+        self.distance_space = "l2"
+
+    @classmethod
+    def from_config(cls, config) -> "ChromaHttpStore":
+        return cls(
+            host=config.vector_db_host,
+            port=config.vector_db_port,
+            collection=config.vector_db_collection,
+            timeout=config.vector_db_timeout,
+            max_connections=config.vector_db_max_connections,
+        )
+
+    # ---- 비동기 (검색 경로) ----
+
+    async def asimilarity_search_by_vector_with_relevance_scores(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        return (await self.aquery([embedding], k))[0]
+
+    async def aquery(
+        self, embeddings: List[List[float]], k: int
+    ) -> List[List[Tuple[Document, float]]]:
+        """여러 질의 임베딩을 한 번의 요청으로 조회 (질의별 (문서, 거리) 목록)
+
+        임베디드 Chroma의 similarity_search_with_score와 같은 거리 (작을수록 유사)"""
+        data = await self._arequest(
+            "POST",
+            "query",
+            {
+                "query_embeddings": [list(map(float, e)) for e in embeddings],
+                "n_results": k,
+                "include": ["documents", "metadatas", "distances"],
+            },
+        )
+        return [
+            [
+                (
+                    Document(page_content=content or "", metadata=metadata or {}),
+                    distance,
+                )
+                for content, metadata, distance in zip(
+                    data["documents"][q], data["metadatas"][q], data["distances"][q]
+                )
+            ]
+            for q in range(len(embeddings))
+        ]
+
+    async def acount(self) -> int:
+        return await self._arequest("GET", "count")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---- 동기 (시작시 문서 로드, 크롤링 적재) ----
+
+    def get_all(self, batch_size: int = 1000) -> Dict[str, List[Any]]:
+        """전체 청크 (ids, documents, metadatas) 조회"""
+        result: Dict[str, List[Any]] = {"ids": [], "documents": [], "metadatas": []}
+        with self._sync_client() as client:
+            offset = 0
+            while True:
+                data = self._request(
+                    client,
+                    "POST",
+                    "get",
+                    {
+                        "limit": batch_size,
+                        "offset": offset,
+                        "include": ["documents", "metadatas"],
+                    },
+                )
+                for key in result:
+                    result[key].extend(data[key] or [])
+                if len(data["ids"]) < batch_size:
+                    return result
+                offset += batch_size
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        documents: List[str],
+    ) -> None:
+        with self._sync_client() as client:
+            self._request(
+                client,
+                "POST",
+                "upsert",
+                {
+                    "ids": ids,
+                    "embeddings": embeddings,
+                    "metadatas": metadatas,
+                    "documents": documents,
+                },
+            )
+
+    def delete(self, where: Dict[str, Any]) -> None:
+        with self._sync_client() as client:
+            self._request(client, "POST", "delete", {"where": where})
+
+    def count(self) -> int:
+        with self._sync_client() as client:
+            return self._request(client, "GET", "count")
+
+    def read_generation(self) -> Optional[str]:
+        """공유 인덱스 세대 (크롤링한 적이 없으면 None)"""
+        with self._sync_client() as client:
+            data = self._get_or_create(client, self.meta_collection_name)
+        return (data.get("metadata") or {}).get(self.GENERATION_KEY)
+
+    def write_generation(self, value: str) -> None:
+        with self._sync_client() as client:
+            data = self._get_or_create(client, self.meta_collection_name)
+            response = client.put(
+                f"{self.collections_path}/{data['id']}",
+                json={"new_metadata": {self.GENERATION_KEY: value}},
+            )
+            response.raise_for_status()
+
+    # ---- 내부 ----
+
+    async def _arequest(
+        self, method: str, action: str, payload: Optional[Dict] = None
+    ) -> Any:
+        client = self._async_client()
+        if self._collection_id is None:
+            self._collection_id = await self._aresolve_collection(client)
+
+        response = await client.request(
+            method, self._action_path(action), json=payload
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _aresolve_collection(self, client: httpx.AsyncClient) -> str:
+        response = await client.post(
+            self.collections_path,
+            json={"name": self.collection_name, "get_or_create": True},
+        )
+        response.raise_for_status()
+        return self._read_collection(response.json())
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # AsyncClient 커넥션은 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 다시 생성
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _sync_client(self) -> httpx.Client:
+        return httpx.Client(
+            base_url=self.base_url, timeout=self.timeout, limits=self.limits
+        )
+
+    def _request(
+        self,
+        client: httpx.Client,
+        method: str,
+        action: str,
+        payload: Optional[Dict] = None,
+    ) -> Any:
+        if self._collection_id is None:
+            self._collection_id = self._read_collection(
+                self._get_or_create(client, self.collection_name)
+            )
+
+        response = client.request(method, self._action_path(action), json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def _get_or_create(self, client: httpx.Client, name: str) -> Dict[str, Any]:
+        response = client.post(
+            self.collections_path, json={"name": name, "get_or_create": True}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _action_path(self, action: str) -> str:
+        return f"{self.collections_path}/{self._collection_id}/{action}"
+
+    def _read_collection(self, data: Dict[str, Any]) -> str:
+        self.distance_space = (data.get("metadata") or {}).get("hnsw:space", "l2")
+        return data["id"]
@@ -0,0 +1,44 @@
+"""
+ChromaDB 청크 저장 유틸
+
+span 기반으로 저장된 청크는 원문을 SpanStore에만 두고
+Chroma에는 임베딩과 메타데이터(빈 문서)만 저장
+단 공유 Chroma 서버(http 모드)는 다른 replica에 span 저장소가 없으므로 원문도 저장
+"""
+
+from typing import Any, Dict, List
+
+
+def write_chunks(
+    vectorstore, embeddings, documents: List[Dict[str, Any]], batch_size: int = 500
+) -> None:
+    """청크 임베딩 후 chunk_id 기준으로 upsert (재크롤링시 중복 적재 방지)
+
+    임베디드 Chroma는 내부 collection, Chroma 서버(ChromaHttpStore)는 store에 직접 upsert
+    재크롤링으로 파일의 청크 수가 줄면 남는 이전 청크가 새 원문을 가리키므로
+    적재 전에 대상 파일의 기존 청크를 모두 삭제"""
+    collection = getattr(vectorstore, "_collection", vectorstore)
+    store_text = getattr(vectorstore, "is_remote", False)
+
+    sources = list(dict.fromkeys(doc["metadata"]["source"] for doc in documents))
+    for offset in range(0, len(sources), batch_size):
+        batch_sources = sources[offset : offset + batch_size]
+        collection.delete(where={"source": {"$in": batch_sources}})
+
+    for offset in range(0, len(documents), batch_size):
+        batch = documents[offset : offset + batch_size]
+
+        vectors = embeddings.embed_documents([doc["content"] for doc in batch])
+
+        collection.upsert(
+            ids=[doc["metadata"]["chunk_id"] for doc in batch],
+            embeddings=vectors,
+            metadatas=[doc["metadata"] for doc in batch],
+            # span 메타데이터가 있는 청크는 원문을 중복 저장하지 않음 (로컬 Chroma)
+            documents=[
+                doc["content"]
+                if store_text or "file_id" not in doc["metadata"]
+                else ""
+                for doc in batch
+            ],
+        )
@@ -17,8 +17,11 @@ class SearchQuery:
     conversation_id: Optional[str] = None
 
     @property
-    def _is_code_query(self, query_text: str) -> bool:
+    def is_code_query(self) -> bool:
         """코드 관련 쿼리 판단"""
+        if self.query_type != QueryType.GENERAL:
+            return self.query_type == QueryType.CODE
+
         code_indicators = [
             "function",
             "class",
@@ -29,7 +32,7 @@ class SearchQuery:
             "await",
             "=>",
         ]
-        return any(indicator in query_text.lower() for indicator in code_indicators)
+        return any(indicator in self.text.lower() for indicator in code_indicators)
 
 
 @dataclass
@@ -56,6 +59,46 @@ class RetrievalWeights:
         return cls(dense=0.8, sparse=0.2)
 
 
+@dataclass
+class RoutingDecision:
+    """쿼리 라우터 결정 결과
+
+    route: symbol | sparse | dense | hybrid
+    engines: 실제로 실행할 검색 엔진 목록
+    *_depth: 엔진별 over-fetch 개수 (fusion 전 후보 수)"""
+
+    route: str
+    query_class: str
+    engines: List[str]
+    dense_depth: int
+    sparse_depth: int
+    weights: RetrievalWeights
+    reason: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "query_class": self.query_class,
+            "engines": self.engines,
+            "dense_depth": self.dense_depth,
+            "sparse_depth": self.sparse_depth,
+            "weights": {"dense": self.weights.dense, "sparse": self.weights.sparse},
+            "reason": self.reason,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoutingDecision":
+        return cls(
+            route=data["route"],
+            query_class=data["query_class"],
+            engines=data["engines"],
+            dense_depth=data["dense_depth"],
+            sparse_depth=data["sparse_depth"],
+            weights=RetrievalWeights(**data["weights"]),
+            reason=data["reason"],
+        )
+
+
 @dataclass
 class SearchResult:
     documents: List[Dict[str, Any]]
@@ -63,6 +106,11 @@ class SearchResult:
     method: str
     weights_used: RetrievalWeights
     total_time: float
+    routing: Optional[RoutingDecision] = None
+    cache: Optional[str] = None
+    # 지연 예산 초과로 일부 엔진 결과 없이 응답한 경우 True
+    degraded: bool = False
+    degraded_reason: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Dict타입으로 변환"""
@@ -76,4 +124,27 @@ class SearchResult:
             },
             "processing_time": self.total_time,
             "total_results": len(self.documents),
+            "routing": self.routing.to_dict() if self.routing else None,
+            "cache": self.cache,
+            "degraded": self.degraded,
+            "degraded_reason": self.degraded_reason,
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchResult":
+        """to_dict 결과로부터 복원 (디스크 캐시용)"""
+        return cls(
+            documents=data["documents"],
+            scores=data["scores"],
+            method=data["method"],
+            weights_used=RetrievalWeights(**data["weights"]),
+            total_time=data["processing_time"],
+            routing=(
+                RoutingDecision.from_dict(data["routing"])
+                if data.get("routing")
+                else None
+            ),
+            cache=data.get("cache"),
+            degraded=data.get("degraded", False),
+            degraded_reason=data.get("degraded_reason"),
+        )
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any
+
+
+@dataclass
+class Symbol:
+    """크롤링시 추출한 코드 심볼 (클래스, 인터페이스, 함수, 메서드, 상수)"""
+
+    name: str
+    qualified_name: str
+    kind: str
+    language: str
+    source: str
+    line_start: int
+    line_end: int
+    span_start: int
+    span_end: int
+    file_id: Optional[str] = None
+    chunk_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Symbol":
+        return cls(**data)
@@ -0,0 +1,146 @@
+"""
+질의 기반 추출식 컨텍스트 압축
+
+LLM 호출 없이 청크에서 질의와 어휘가 겹치는 줄만 남겨 프롬프트를 줄임
+- 줄 점수: 줄에 등장하는 질의 용어의 idf 합 (idf는 압축 대상 전체 줄 기준)
+- 점수 상위 줄(keep_ratio 비율, 최고 점수의 min_score_ratio 이상)과 앞뒤 context_lines 줄을 유지
+- 유지된 줄을 감싸는 함수/클래스 시그니처 줄을 함께 유지
+- 생략된 구간은 "..." 한 줄로 표시
+질의 용어가 전혀 등장하지 않는 청크는 근거가 없으므로 그대로 둠
+"""
+
+import math
+import re
+import time
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+# 식별자(camelCase/snake_case 분리 포함)와 한글 단어
+_TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*|[가-힣]+|\d+")
+_CAMEL_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# Kotlin/Java/Python/JS 함수, 클래스 선언
+_SIGNATURE_PATTERN = re.compile(
+    r"^\s*(?:@\w+(?:\([^)]*\))?\s*)*"
+    r"(?:(?:public|private|protected|internal|override|open|abstract|data|"
+    r"suspend|static|final|export|async|sealed|inline)\s+)*"
+    r"(?:def|class|fun|interface|object|enum|function|record)\b"
+    r"|^\s*(?:(?:public|private|protected|static|final|abstract|synchronized)\s+)+"
+    r"[\w<>\[\],. ?]+\s+\w+\s*\("
+)
+
+
+def tokenize_terms(text: str) -> Set[str]:
+    """소문자 용어 집합 (findUserById → find, user, by, id, finduserbyid)"""
+    terms = set()
+    for token in _TOKEN_PATTERN.findall(text):
+        lowered = token.lower()
+        terms.add(lowered)
+        parts = _CAMEL_PATTERN.findall(token)
+        if len(parts) > 1:
+            terms.update(part.lower() for part in parts)
+    return {term for term in terms if len(term) > 1}
+
+
+class ContextCompressor:
+    def __init__(
+        self,
+        keep_ratio: float = 0.4,
+        context_lines: int = 1,
+        min_lines: int = 8,
+        min_score_ratio: float = 0.3,
+    ):
+        self.keep_ratio = keep_ratio
+        # 흔한 용어 하나만 겹치는 줄은 제외
+        self.min_score_ratio = min_score_ratio
+        self.context_lines = context_lines
+        # 이보다 짧은 청크는 압축하지 않음
+        self.min_lines = min_lines
+
+    def compress(
+        self, query: str, texts: Sequence[str]
+    ) -> Tuple[List[str], Dict[str, Any]]:
+        """질의와 관련된 줄만 남긴 텍스트 목록(입력 순서 유지)과 압축 통계 반환"""
+        started = time.perf_counter()
+        query_terms = tokenize_terms(query)
+        chunk_lines = [text.split("\n") for text in texts]
+        line_terms = [[tokenize_terms(line) for line in lines] for lines in chunk_lines]
+        idf = self._idf(query_terms, line_terms)
+
+        compressed = []
+        for text, lines, terms in zip(texts, chunk_lines, line_terms):
+            scores = [sum(idf[t] for t in line & query_terms) for line in terms]
+            if len(lines) < self.min_lines or not any(scores):
+                compressed.append(text)
+            else:
+                compressed.append(self._extract(lines, scores))
+
+        input_chars = sum(len(text) for text in texts)
+        output_chars = sum(len(text) for text in compressed)
+        return compressed, {
+            "input_chars": input_chars,
+            "output_chars": output_chars,
+            "ratio": (output_chars / input_chars) if input_chars else 1.0,
+            "compressed_chunks": sum(a != b for a, b in zip(texts, compressed)),
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    def _idf(
+        self, query_terms: Set[str], line_terms: List[List[Set[str]]]
+    ) -> Dict[str, float]:
+        total = sum(len(lines) for lines in line_terms) or 1
+        counts = dict.fromkeys(query_terms, 0)
+        for lines in line_terms:
+            for terms in lines:
+                for term in terms & query_terms:
+                    counts[term] += 1
+        return {
+            term: math.log(1 + (total - n + 0.5) / (n + 0.5))
+            for term, n in counts.items()
+        }
+
+    def _extract(self, lines: List[str], scores: List[float]) -> str:
+        non_blank = sum(1 for line in lines if line.strip())
+        budget = max(1, math.ceil(non_blank * self.keep_ratio))
+        threshold = max(scores) * self.min_score_ratio
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0 and score >= threshold),
+            key=lambda i: scores[i],
+            reverse=True,
+        )[:budget]
+
+        keep = set()
+        for i in ranked:
+            low = max(0, i - self.context_lines)
+            high = min(len(lines), i + self.context_lines + 1)
+            keep.update(range(low, high))
+            signature = self._enclosing_signature(lines, i)
+            if signature is not None:
+                keep.add(signature)
+
+        output = []
+        previous = -1
+        for i in sorted(keep):
+            if not lines[i].strip():
+                continue
+            if self._omitted(lines, previous + 1, i):
+                output.append("...")
+            output.append(lines[i])
+            previous = i
+        if self._omitted(lines, previous + 1, len(lines)):
+            output.append("...")
+        return "\n".join(output)
+
+    def _omitted(self, lines: List[str], start: int, end: int) -> bool:
+        return any(line.strip() for line in lines[start:end])
+
+    def _enclosing_signature(self, lines: List[str], index: int):
+        """index 줄보다 들여쓰기가 얕은 가장 가까운 선언 줄 (없으면 None)"""
+        indent = len(lines[index]) - len(lines[index].lstrip())
+        for i in range(index - 1, -1, -1):
+            line = lines[i]
+            if not line.strip():
+                continue
+            line_indent = len(line) - len(line.lstrip())
+            if line_indent < indent and _SIGNATURE_PATTERN.match(line):
+                return i
+        return None
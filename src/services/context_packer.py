@@ -0,0 +1,251 @@
+"""
+토큰 예산 기반 컨텍스트 패킹
+
+LLM 프롬프트에 넣을 검색 청크를 tiktoken 토큰 수 기준 예산 안에 채움
+- 같은 파일의 겹치거나 인접한 청크는 하나의 블록으로 병합 (chunk_overlap 중복 제거)
+- 내용이 같은 청크는 한 번만 포함
+- 블록은 소속 청크 중 가장 높은 순위(입력 순서 = 융합 점수 순서) 기준으로 정렬
+- 예산을 넘는 마지막 블록은 남은 토큰만큼 잘라서 포함
+- compressor 지정시 병합된 블록을 질의 기준으로 추출 압축한 뒤 예산 적용
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+
+def _token_counter(model: str) -> Callable[[str], int]:
+    """모델 인코딩 기준 토큰 수 계산 함수 (인코딩을 불러올 수 없으면 근사치 사용)"""
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # 오프라인 환경 등에서 BPE 파일을 받을 수 없는 경우
+            print(f"tiktoken encoding unavailable ({type(e).__name__}), approximating")
+            encoding = None
+        if encoding is not None:
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+    return lambda text: (len(text) + 3) // 4
+
+
+@dataclass
+class PackedBlock:
+    source: str
+    header: str
+    body: str
+    rank: int
+    chunk_indices: List[int]
+    metadata: Dict[str, Any]
+    raw_tokens: int
+    content: str = ""
+    tokens: int = 0
+    truncated: bool = False
+
+
+@dataclass
+class PackedContext:
+    blocks: List[PackedBlock] = field(default_factory=list)
+    text: str = ""
+    budget: int = 0
+    raw_tokens: int = 0
+    packed_tokens: int = 0
+    input_chunks: int = 0
+    duplicate_chunks: int = 0
+    dropped_blocks: int = 0
+    compression: Optional[Dict[str, Any]] = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "budget": self.budget,
+            "raw_tokens": self.raw_tokens,
+            "packed_tokens": self.packed_tokens,
+            "saved_tokens": max(self.raw_tokens - self.packed_tokens, 0),
+            "input_chunks": self.input_chunks,
+            "blocks": len(self.blocks),
+            "duplicate_chunks": self.duplicate_chunks,
+            "dropped_blocks": self.dropped_blocks,
+        }
+        if self.compression is not None:
+            stats["compression"] = self.compression
+        return stats
+
+
+class ContextPacker:
+    # 예산이 이보다 적게 남으면 다음 블록을 잘라 넣지 않음
+    MIN_TRUNCATED_TOKENS = 64
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        model: str = "gpt-4",
+        span_store: Any = None,
+        separator: str = "\n\n",
+        compressor: Any = None,
+    ):
+        self.max_tokens = max_tokens
+        self.span_store = span_store
+        self.compressor = compressor
+        self.separator = separator
+        self.count_tokens = _token_counter(model)
+
+    def pack(
+        self,
+        chunks: Sequence[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        query: Optional[str] = None,
+    ) -> PackedContext:
+        """관련도 순으로 정렬된 {"content", "metadata"} 청크 목록을 예산 안에 패킹
+
+        query가 주어지고 compressor가 있으면 블록을 질의 관련 줄 위주로 압축"""
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        packed = PackedContext(budget=budget, input_chunks=len(chunks))
+
+        unique = []
+        seen = set()
+        for rank, chunk in enumerate(chunks):
+            content = chunk.get("content") or ""
+            packed.raw_tokens += self.count_tokens(content)
+            digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+            if digest in seen:
+                packed.duplicate_chunks += 1
+                continue
+            seen.add(digest)
+            unique.append((rank, chunk))
+
+        blocks = sorted(self._merge(unique), key=lambda block: block.rank)
+        if self.compressor is not None and query:
+            bodies, packed.compression = self.compressor.compress(
+                query, [block.body for block in blocks]
+            )
+            for block, body in zip(blocks, bodies):
+                block.body = body
+        for block in blocks:
+            block.content = f"{block.header}\n{block.body}"
+            block.tokens = self.count_tokens(block.content)
+
+        used = 0
+        separator_tokens = self.count_tokens(self.separator)
+        for block in blocks:
+            cost = block.tokens + (separator_tokens if packed.blocks else 0)
+            remaining = budget - used
+            if cost > remaining:
+                if remaining - separator_tokens < self.MIN_TRUNCATED_TOKENS:
+                    packed.dropped_blocks += 1
+                    continue
+                self._truncate(block, remaining - separator_tokens)
+                cost = block.tokens + (separator_tokens if packed.blocks else 0)
+            packed.blocks.append(block)
+            used += cost
+
+        packed.text = self.separator.join(block.content for block in packed.blocks)
+        packed.packed_tokens = self.count_tokens(packed.text)
+        return packed
+
+    def _merge(self, chunks: List[tuple]) -> List[PackedBlock]:
+        """같은 파일의 청크를 위치 순으로 정렬해 겹치거나 맞닿은 것끼리 병합"""
+        by_file: Dict[str, List[tuple]] = {}
+        for rank, chunk in chunks:
+            metadata = chunk.get("metadata") or {}
+            key = metadata.get("file_id") or metadata.get("source") or f"#{rank}"
+            by_file.setdefault(key, []).append((rank, chunk))
+
+        blocks = []
+        for members in by_file.values():
+            members.sort(key=lambda item: self._position(item[1]))
+            group = [members[0]]
+            for item in members[1:]:
+                if self._touches(group[-1][1], item[1]):
+                    group.append(item)
+                else:
+                    blocks.append(self._block(group))
+                    group = [item]
+            blocks.append(self._block(group))
+        return blocks
+
+    def _position(self, chunk: Dict[str, Any]) -> tuple:
+        metadata = chunk.get("metadata") or {}
+        return (
+            metadata.get("span_start", -1),
+            metadata.get("chunk_index", 0),
+        )
+
+    def _touches(self, prev: Dict[str, Any], chunk: Dict[str, Any]) -> bool:
+        prev_meta, meta = prev.get("metadata") or {}, chunk.get("metadata") or {}
+        if "span_end" in prev_meta and "span_start" in meta:
+            return meta["span_start"] <= prev_meta["span_end"]
+        # span 정보가 없는 청크는 연속된 chunk_index를 인접한 것으로 간주
+        if "chunk_index" in prev_meta and "chunk_index" in meta:
+            return meta["chunk_index"] - prev_meta["chunk_index"] <= 1
+        return False
+
+    def _block(self, group: List[tuple]) -> PackedBlock:
+        rank = min(r for r, _ in group)
+        best = next(chunk for r, chunk in group if r == rank)
+        metadata = dict(best.get("metadata") or {})
+        contents = [chunk.get("content") or "" for _, chunk in group]
+
+        body = self._merged_span(group)
+        if body is None:
+            body = contents[0]
+            for text in contents[1:]:
+                body += text[self._overlap(body, text) :]
+
+        source = metadata.get("source", "Unknown")
+        header = f"# {source}"
+        if metadata.get("file_type"):
+            header += f" ({metadata['file_type']})"
+
+        return PackedBlock(
+            source=source,
+            header=header,
+            body=body,
+            rank=rank,
+            chunk_indices=[
+                (chunk.get("metadata") or {}).get("chunk_index", 0)
+                for _, chunk in group
+            ],
+            metadata=metadata,
+            raw_tokens=sum(self.count_tokens(text) for text in contents),
+        )
+
+    def _merged_span(self, group: List[tuple]) -> Optional[str]:
+        """span 기반 청크는 span store에서 병합된 구간 원문을 한 번에 복원"""
+        if self.span_store is None:
+            return None
+        metas = [chunk.get("metadata") or {} for _, chunk in group]
+        if not all("file_id" in m and "span_start" in m for m in metas):
+            return None
+        start = min(m["span_start"] for m in metas)
+        end = max(m["span_end"] for m in metas)
+        try:
+            return self.span_store.get_span(metas[0]["file_id"], start, end)
+        except (KeyError, OSError):
+            return None
+
+    def _overlap(self, left: str, right: str, max_overlap: int = 1000) -> int:
+        """left의 끝과 right의 시작이 겹치는 최대 길이 (splitter chunk_overlap 제거용)"""
+        for size in range(min(len(left), len(right), max_overlap), 0, -1):
+            if left.endswith(right[:size]):
+                return size
+        return 0
+
+    def _truncate(self, block: PackedBlock, max_tokens: int) -> None:
+        """블록 끝부분을 잘라 max_tokens 이하로 줄임 (줄 단위 이분 탐색)"""
+        lines = block.content.split("\n")
+        low, high = 0, len(lines)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count_tokens("\n".join(lines[:mid] + ["..."])) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        block.content = "\n".join(lines[:low] + ["..."])
+        block.tokens = self.count_tokens(block.content)
+        block.truncated = True
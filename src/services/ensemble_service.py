@@ -1,34 +1,383 @@
 import asyncio
 import time
-from typing import List, Dict, Any, Optional
-from ..models.search_models import SearchQuery, SearchResult, RetrievalWeights
+import numpy as np
+from dataclasses import replace
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
+from ..models.search_models import (
+    SearchQuery,
+    SearchResult,
+    RetrievalWeights,
+    RoutingDecision,
+)
 from ..infrastructure.retrievers.dense_retriever import DenseReriever
 from ..infrastructure.retrievers.sparse_retriever import SparseRetriever
+from .symbol_service import SymbolService
+from ..infrastructure.cache.search_result_cache import SearchResultCache, search_key
+from ..infrastructure.concurrency.single_flight import SingleFlight
+from ..infrastructure.storage.index_generation import IndexGeneration
+from .query_router import QueryRouter
+from .fusion_engine import FusionEngine
 
 
 class EnsembleRetrievalService:
+    ROUTE_METHODS = {
+        "hybrid": "ensemble_rrf",
+        "dense": "dense_only",
+        "sparse": "sparse_only",
+        "none": "no_retriever",
+    }
+
     def __init__(
-        self, dense_retriever: DenseReriever, sparse_retriever: SparseRetriever
+        self,
+        dense_retriever: DenseReriever,
+        sparse_retriever: SparseRetriever,
+        symbol_service: Optional[SymbolService] = None,
+        router: Optional[QueryRouter] = None,
+        result_cache: Optional[SearchResultCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        index_generation: Optional[IndexGeneration] = None,
+        latency_budget_ms: Optional[float] = None,
+        fusion: Optional[FusionEngine] = None,
     ):
         self.dense_retriever = dense_retriever
         self.sparse_retriever = sparse_retriever
+        self.symbol_service = symbol_service
+        self.router = router or QueryRouter()
+        self.result_cache = result_cache
+        self.single_flight = single_flight
+        self.index_generation = index_generation
+        # 요청별 지연 예산 기본값 (None/0이면 dense 결과를 끝까지 기다림)
+        self.latency_budget_ms = latency_budget_ms
+        self._background: Set[asyncio.Future] = set()
+        self.fusion = fusion or FusionEngine()
 
     async def search(
+        self,
+        query: SearchQuery,
+        k: int = 5,
+        weights: Optional[RetrievalWeights] = None,
+        budget_ms: Optional[float] = None,
+    ) -> SearchResult:
+        """검색
+
+        budget_ms(미지정시 서비스 기본값) 안에 dense가 끝나지 않으면 sparse 결과로 degraded 응답"""
+        if budget_ms is None:
+            budget_ms = self.latency_budget_ms
+        cache_key = None
+        if self.result_cache is not None:
+            # 동일 질의 반복시 임베딩/검색 없이 캐시에서 응답 (인덱스 세대가 키에 포함됨)
+            start_time = time.time()
+            cache_key = self.result_cache.make_key(query, k, weights)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return replace(cached, total_time=time.time() - start_time)
+
+        if self.single_flight is None:
+            return await self._search_and_store(
+                query, k, weights, cache_key, budget_ms
+            )
+
+        # 같은 요청이 동시에 들어오면 한 번만 실행하고 결과 공유 (캐시 미사용/콜드 캐시에도 적용)
+        # 지연 예산이 다르면 degraded 여부가 달라지므로 예산도 키에 포함
+        flight_key = search_key(
+            query, k, weights, {"budget_ms": budget_ms}, self._generation()
+        )
+        return await self.single_flight.do(
+            flight_key,
+            lambda: self._search_and_store(query, k, weights, cache_key, budget_ms),
+        )
+
+    async def _search_and_store(
+        self,
+        query: SearchQuery,
+        k: int,
+        weights: Optional[RetrievalWeights],
+        cache_key: Optional[str],
+        budget_ms: Optional[float] = None,
+    ) -> SearchResult:
+        result = await self._search(query, k, weights, budget_ms)
+        # degraded 결과는 캐시하지 않음 (다음 요청에서 dense 포함 결과를 받을 수 있도록)
+        if cache_key is not None and not result.degraded:
+            self.result_cache.put(cache_key, result)
+        return result
+
+    def _generation(self) -> str:
+        if self.index_generation is None:
+            return ""
+        return self.index_generation.current()
+
+    async def search_stream(
         self, query: SearchQuery, k: int = 5, weights: Optional[RetrievalWeights] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """단계별 검색 결과 스트리밍
+
+        - sparse: BM25가 끝나는 즉시 후보 순위 (본문 없음)
+        - fused: dense 결과까지 RRF로 융합한 순위 (본문 없음)
+        - final: 상위 k개 본문을 복원한 최종 결과 (search와 같은 형식)
+        각 결과의 id로 클라이언트가 이전 단계 결과와 대조 가능"""
+        start_time = time.time()
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(query, k, weights)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                result = replace(cached, total_time=time.time() - start_time)
+                yield {"event": "final", **result.to_dict()}
+                return
+
+        decision, symbol_result = self._route(query, k, weights, start_time)
+        if symbol_result is not None:
+            yield {"event": "final", **symbol_result.to_dict()}
+            return
+
+        dense_task = asyncio.ensure_future(
+            self._retrieve(decision, "dense", query.text, materialize=False)
+        )
+        try:
+            sparse_results = await self._retrieve(
+                decision, "sparse", query.text, materialize=False
+            )
+            if sparse_results:
+                yield {
+                    "event": "sparse",
+                    "results": self._stream_entries(
+                        sparse_results, [doc["score"] for doc in sparse_results], k
+                    ),
+                    "elapsed": time.time() - start_time,
+                }
+            dense_results = await dense_task
+        finally:
+            # 클라이언트가 중간에 스트림을 닫으면 dense 검색도 중단
+            if not dense_task.done():
+                dense_task.cancel()
+
+        result = self._fuse(decision, dense_results, sparse_results, k, start_time)
+        yield {
+            "event": "fused",
+            "results": self._stream_entries(result.documents, result.scores, k),
+            "method": result.method,
+            "routing": decision.to_dict(),
+            "elapsed": time.time() - start_time,
+        }
+
+        result = replace(
+            result,
+            documents=[self._materialize_doc(doc) for doc in result.documents],
+            total_time=time.time() - start_time,
+        )
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result)
+        yield {"event": "final", **result.to_dict()}
+
+    def _stream_entries(
+        self, documents: List[Dict[str, Any]], scores: List[float], k: int
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": self._doc_key(doc),
+                "rank": rank,
+                "score": score,
+                "source": doc.get("source"),
+                "metadata": doc.get("metadata", {}),
+            }
+            for rank, (doc, score) in enumerate(zip(documents[:k], scores[:k]))
+        ]
+
+    def _materialize_doc(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        span_store = getattr(self.sparse_retriever, "span_store", None) or getattr(
+            self.dense_retriever, "span_store", None
+        )
+        if span_store is None:
+            return doc
+        content = span_store.materialize(
+            doc.get("page_content", ""), doc.get("metadata", {})
+        )
+        return {**doc, "page_content": content}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        embeddings = getattr(self.dense_retriever, "embeddings", None)
+        coalescer = getattr(self.dense_retriever, "coalescer", None)
+        hedger = getattr(self.dense_retriever, "hedger", None)
+        return {
+            "results": self.result_cache.stats() if self.result_cache else None,
+            "query_embeddings": (
+                embeddings.stats() if hasattr(embeddings, "stats") else None
+            ),
+            "embedding_batches": coalescer.stats() if coalescer else None,
+            "single_flight": self.single_flight.stats() if self.single_flight else None,
+            "embedding_hedging": hedger.stats() if hedger else None,
+        }
+
+    async def search_batch(
+        self,
+        queries: List[SearchQuery],
+        k: int = 5,
+        weights: Optional[RetrievalWeights] = None,
+    ) -> List[SearchResult]:
+        """여러 질의 일괄 검색
+
+        dense가 필요한 질의는 한 번의 임베딩 요청 + 한 번의 행렬곱으로,
+        sparse가 필요한 질의는 한 번의 희소 행렬곱으로 처리한 뒤 질의별로 각각 RRF 융합"""
+        start_time = time.time()
+        results: List[Optional[SearchResult]] = [None] * len(queries)
+        cache_keys: List[Optional[str]] = [None] * len(queries)
+        decisions: Dict[int, RoutingDecision] = {}
+
+        for idx, query in enumerate(queries):
+            if self.result_cache is not None:
+                cache_keys[idx] = self.result_cache.make_key(query, k, weights)
+                cached = self.result_cache.get(cache_keys[idx])
+                if cached is not None:
+                    results[idx] = replace(cached, total_time=time.time() - start_time)
+                    continue
+
+            decision, symbol_result = self._route(query, k, weights, start_time)
+            if symbol_result is not None:
+                results[idx] = symbol_result
+            else:
+                decisions[idx] = decision
+
+        dense_batch, sparse_batch = await asyncio.gather(
+            self._retrieve_batch(queries, decisions, "dense"),
+            self._retrieve_batch(queries, decisions, "sparse"),
+        )
+
+        for idx, decision in decisions.items():
+            results[idx] = self._fuse(
+                decision,
+                dense_batch.get(idx, []),
+                sparse_batch.get(idx, []),
+                k,
+                start_time,
+            )
+
+        if self.result_cache is not None:
+            for idx, result in enumerate(results):
+                if result.cache is None:
+                    self.result_cache.put(cache_keys[idx], result)
+
+        return results
+
+    async def _search(
+        self,
+        query: SearchQuery,
+        k: int,
+        weights: Optional[RetrievalWeights],
+        budget_ms: Optional[float] = None,
     ) -> SearchResult:
         start_time = time.time()
 
-        if weights is None:
-            weights = self._get_optimal_wieghts(query)
+        decision, symbol_result = self._route(query, k, weights, start_time)
+        if symbol_result is not None:
+            return symbol_result
+
+        if not budget_ms or "dense" not in decision.engines:
+            dense_results, sparse_results = await asyncio.gather(
+                self._retrieve(decision, "dense", query.text),
+                self._retrieve(decision, "sparse", query.text),
+            )
+            return self._fuse(decision, dense_results, sparse_results, k, start_time)
+
+        return await self._search_within_budget(
+            query, decision, k, start_time, budget_ms / 1000.0
+        )
+
+    async def _search_within_budget(
+        self,
+        query: SearchQuery,
+        decision: RoutingDecision,
+        k: int,
+        start_time: float,
+        budget: float,
+    ) -> SearchResult:
+        """dense가 지연 예산 안에 끝나지 않으면 sparse 결과만으로 degraded 응답"""
+        dense_task = asyncio.ensure_future(
+            self._retrieve(decision, "dense", query.text)
+        )
+        handed_off = False
+        try:
+            sparse_results = await self._retrieve(decision, "sparse", query.text)
+            remaining = budget - (time.time() - start_time)
+            done, _ = await asyncio.wait({dense_task}, timeout=max(remaining, 0))
+
+            reason = None
+            if not done:
+                reason = "dense_timeout"
+            elif dense_task.exception() is not None:
+                reason = "dense_error"
+            else:
+                return self._fuse(
+                    decision, dense_task.result(), sparse_results, k, start_time
+                )
 
-        dense_task = self.dense_retriever.search(query.text, k)
-        sparse_task = self.sparse_retriever.search(query.text, k)
+            # dense-only 라우트였다면 BM25로 대체 검색 (BM25는 임베딩 호출이 없어 빠름)
+            if "sparse" not in decision.engines and self.sparse_retriever is not None:
+                sparse_results = await self.sparse_retriever.search(
+                    query.text, decision.dense_depth
+                )
 
-        dense_results, sparse_results = await asyncio.gather(dense_task, sparse_task)
+            if not sparse_results and reason == "dense_timeout":
+                # 대체할 결과가 없으면 예산을 넘기더라도 dense 결과를 기다림
+                return self._fuse(decision, await dense_task, [], k, start_time)
+            if reason == "dense_timeout":
+                # 늦게 끝난 임베딩도 캐시에 저장되도록 백그라운드에서 마저 실행
+                self._background.add(dense_task)
+                dense_task.add_done_callback(self._finish_background)
+                handed_off = True
+        finally:
+            # 백그라운드로 넘기지 않은 dense 태스크는 어떤 경로로 나가든 정리
+            if not handed_off and not dense_task.done():
+                dense_task.cancel()
 
-        # RRF
-        combined_results = self._combine_with_rrf(
-            dense_results, sparse_results, weights, k
+        result = self._fuse(decision, [], sparse_results, k, start_time)
+        return replace(
+            result, method="sparse_fallback", degraded=True, degraded_reason=reason
+        )
+
+    def _finish_background(self, task: asyncio.Future) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def _route(
+        self,
+        query: SearchQuery,
+        k: int,
+        weights: Optional[RetrievalWeights],
+        start_time: float,
+    ) -> Tuple[RoutingDecision, Optional[SearchResult]]:
+        """실행할 엔진 결정 (심볼 테이블에서 바로 응답 가능하면 해당 결과도 반환)"""
+        # 쿼리별로 실행할 엔진과 over-fetch 깊이 결정 (식별자 질의는 임베딩 호출 생략)
+        available = self._available_engines()
+        decision = self.router.restrict(self.router.route(query, k, weights), available)
+
+        # 알려진 심볼명 자체를 질의한 경우 임베딩/검색 없이 심볼 테이블에서 바로 응답
+        if "symbol" in decision.engines:
+            symbol_docs = self.symbol_service.resolve_query(query.text, k)
+            if symbol_docs:
+                return decision, SearchResult(
+                    documents=symbol_docs,
+                    scores=[doc["score"] for doc in symbol_docs],
+                    method="symbol_lookup",
+                    weights_used=decision.weights,
+                    total_time=time.time() - start_time,
+                    routing=decision,
+                )
+            available = [e for e in available if e != "symbol"]
+            decision = self.router.restrict(decision, available)
+
+        return decision, None
+
+    def _fuse(
+        self,
+        decision: RoutingDecision,
+        dense_results: List[Dict[str, Any]],
+        sparse_results: List[Dict[str, Any]],
+        k: int,
+        start_time: float,
+    ) -> SearchResult:
+        combined_results = self._combine_results(
+            dense_results, sparse_results, decision.weights, k
         )
 
         processing_time = time.time() - start_time
@@ -36,49 +385,109 @@ class EnsembleRetrievalService:
         return SearchResult(
             documents=combined_results["documents"],
             scores=combined_results["scores"],
-            method="ensemble_rrf",
-            weights_used=weights,
+            method=self._method(decision),
+            weights_used=decision.weights,
             total_time=processing_time,
+            routing=decision,
         )
 
-    def _get_optimal_wieghts(self, query: SearchQuery) -> RetrievalWeights:
-        if query.is_code_query:
-            return RetrievalWeights.for_code_search()
-        return RetrievalWeights.for_semantic_search()
+    def _method(self, decision: RoutingDecision) -> str:
+        if decision.route == "hybrid":
+            return f"ensemble_{self.fusion.strategy}"
+        return self.ROUTE_METHODS.get(decision.route, decision.route)
+
+    def _available_engines(self) -> List[str]:
+        engines = []
+        if self.symbol_service is not None and len(self.symbol_service.symbol_table):
+            engines.append("symbol")
+        if self.dense_retriever is not None:
+            engines.append("dense")
+        if self.sparse_retriever is not None:
+            engines.append("sparse")
+        return engines
 
-    def _combine_with_rrf(
+    async def _retrieve(
+        self,
+        decision: RoutingDecision,
+        engine: str,
+        text: str,
+        materialize: bool = True,
+    ) -> List[Dict[str, Any]]:
+        if engine not in decision.engines:
+            return []
+        if engine == "dense":
+            return await self.dense_retriever.search(
+                text, decision.dense_depth, materialize=materialize
+            )
+        return await self.sparse_retriever.search(
+            text, decision.sparse_depth, materialize=materialize
+        )
+
+    async def _retrieve_batch(
+        self,
+        queries: List[SearchQuery],
+        decisions: Dict[int, RoutingDecision],
+        engine: str,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """engine이 필요한 질의들을 모아 한 번에 검색 (가장 깊은 depth로 조회 후 질의별로 자름)"""
+        targets = [idx for idx, d in decisions.items() if engine in d.engines]
+        if not targets:
+            return {}
+
+        texts = [queries[idx].text for idx in targets]
+        if engine == "dense":
+            depths = [decisions[idx].dense_depth for idx in targets]
+            batch = await self.dense_retriever.search_batch(texts, max(depths))
+        else:
+            depths = [decisions[idx].sparse_depth for idx in targets]
+            batch = await self.sparse_retriever.asearch_batch(texts, max(depths))
+
+        return {
+            idx: docs[:depth] for idx, docs, depth in zip(targets, batch, depths)
+        }
+
+    def _doc_key(self, doc: Dict[str, Any]) -> str:
+        # chunk_id가 없는 이전 인덱스는 본문 앞부분으로 식별
+        return doc.get("id") or doc.get("page_content", "")[:50]
+
+    def _combine_results(
         self,
         dense_results: List[Dict],
         sparse_results: List[Dict],
         weights: RetrievalWeights,
-        k: int = 60,
+        k: int,
     ) -> Dict[str, List]:
-        doc_scores = {}
-
-        # Dense 가중치 취합 하여 doc_scoredp 저장
-        for rank, doc in enumerate(dense_results):
-            doc_id = doc.get("id", doc.get("page_content", "")[:50])
-            rrf_score = weights.dense / (k + rank + 1)
-            doc_scores[doc_id] = {
-                "score": doc_scores.get(doc_id, {}).get("score", 0) + rrf_score,
-                "document": doc,
-            }
+        """문서 키를 정수 id로 바꿔 융합 엔진(NumPy)으로 상위 k개 계산"""
+        id_map: Dict[str, int] = {}
+        documents: List[Dict] = []
 
-        # Sparse 가중취 취합하여 doc_scoredp 저장
-        for rank, doc in enumerate(sparse_results):
-            doc_id = doc.get("id", doc.get("page_content", "")[:50])
-            rrf_score = weights.sparse / (k + rank + 1)
-            if doc_id in doc_scores:
-                doc_scores[doc_id]["score"] += rrf_score
-            else:
-                doc_scores[doc_id] = {"score": rrf_score, "document": doc}
+        def to_ids(results: List[Dict]) -> np.ndarray:
+            ids = np.empty(len(results), dtype=np.int64)
+            for rank, doc in enumerate(results):
+                doc_id = id_map.setdefault(self._doc_key(doc), len(id_map))
+                # 양쪽에 모두 있는 문서는 dense 쪽 결과를 대표로 사용
+                if doc_id == len(documents):
+                    documents.append(doc)
+                ids[rank] = doc_id
+            return ids
 
-        # dense, sparse 중 점수 기준으로 정렬
-        sorted_results = sorted(
-            doc_scores.values(), key=lambda x: x["score"], reverse=True
+        dense_ids, sparse_ids = to_ids(dense_results), to_ids(sparse_results)
+        top_ids, top_scores = self.fusion.fuse(
+            [dense_ids, sparse_ids],
+            [self._scores(dense_results), self._scores(sparse_results)],
+            [weights.dense, weights.sparse],
+            k,
+            size=len(id_map),
         )
 
         return {
-            "documents": [item["document"] for item in sorted_results],
-            "scores": [item["score"] for item in sorted_results],
+            "documents": [documents[i] for i in top_ids],
+            "scores": top_scores.tolist(),
         }
+
+    def _scores(self, results: List[Dict]) -> np.ndarray:
+        return np.fromiter(
+            (doc.get("score", 0.0) for doc in results),
+            dtype=np.float64,
+            count=len(results),
+        )
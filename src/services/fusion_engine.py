@@ -0,0 +1,90 @@
+"""
+검색 결과 점수 융합
+
+검색 엔진별 결과를 정수 id 배열과 점수 배열로 받아 NumPy로 융합
+- rrf: 순위 기반 Reciprocal Rank Fusion (weight / (rrf_k + rank))
+- combsum: 엔진별 점수 정규화 후 가중합
+- combmnz: combsum x 해당 문서를 반환한 엔진 수
+점수는 모두 클수록 관련도가 높다고 가정 (dense 코사인 유사도, BM25 score)
+(DenseReriever가 Chroma 거리를 코사인 유사도로 변환해 반환)
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class FusionEngine:
+    STRATEGIES = ("rrf", "combsum", "combmnz")
+    NORMALIZATIONS = ("minmax", "zscore")
+
+    def __init__(
+        self, strategy: str = "rrf", normalization: str = "minmax", rrf_k: int = 60
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"지원하지 않는 융합 방식: {strategy}")
+        if normalization not in self.NORMALIZATIONS:
+            raise ValueError(f"지원하지 않는 정규화 방식: {normalization}")
+        self.strategy = strategy
+        self.normalization = normalization
+        self.rrf_k = rrf_k
+
+    def fuse(
+        self,
+        ids: Sequence[np.ndarray],
+        scores: Sequence[np.ndarray],
+        weights: Sequence[float],
+        top_k: int,
+        size: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """엔진별 (id 배열, 점수 배열, 가중치)를 융합해 상위 top_k의 (id, 점수) 반환
+
+        id는 0..size-1 범위의 연속된 정수(모두 후보)이며 각 배열은 엔진이 반환한 순위 순서
+        size 미지정시 가장 큰 id + 1"""
+        if size is None:
+            size = max((int(a.max()) + 1 for a in ids if len(a)), default=0)
+        if size == 0 or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        fused = np.zeros(size, dtype=np.float64)
+        hits = np.zeros(size, dtype=np.int64) if self.strategy == "combmnz" else None
+
+        for doc_ids, doc_scores, weight in zip(ids, scores, weights):
+            if not len(doc_ids) or not weight:
+                continue
+            if self.strategy == "rrf":
+                contrib = weight / (self.rrf_k + np.arange(1, len(doc_ids) + 1))
+            else:
+                contrib = weight * self._normalize(doc_scores)
+            # 같은 엔진 안에서 id가 중복되어도 누적되도록 bincount 사용
+            fused += np.bincount(doc_ids, weights=contrib, minlength=size)
+            if hits is not None:
+                hits += np.bincount(doc_ids, minlength=size) > 0
+
+        if hits is not None:
+            fused *= hits
+
+        # 가중치가 0인 엔진만 반환한 문서도 후보에 포함 (기존 RRF와 동일하게 점수 0)
+        negated = -fused
+        if top_k < size:
+            candidates = np.argpartition(negated, top_k - 1)[:top_k]
+            order = candidates[np.argsort(negated[candidates], kind="stable")]
+        else:
+            order = np.argsort(negated, kind="stable")
+        return order, fused[order]
+
+    def _normalize(self, scores: np.ndarray) -> np.ndarray:
+        scores = np.asarray(scores, dtype=np.float64)
+        if self.normalization == "minmax":
+            low, high = scores.min(), scores.max()
+            if high == low:
+                return np.ones_like(scores)
+            return (scores - low) / (high - low)
+
+        # 반환하지 않은 문서는 0점이므로 z-score를 최솟값 기준으로 옮겨 음수가 없게 함
+        # (평균 아래로 반환된 문서가 반환되지 않은 문서보다 낮아지지 않도록)
+        std = scores.std()
+        if std == 0:
+            return np.ones_like(scores)
+        z = (scores - scores.mean()) / std
+        return z - z.min()
@@ -0,0 +1,206 @@
+"""
+검색 결과 인접 청크 확장
+
+청크 경계에서 코드가 잘리는 문제를 줄이기 위해 검색된 청크를 위치 인덱스로 확장
+- neighbors: 앞뒤 window개 청크까지 확장
+- function: 청크와 겹치는 함수/메서드 정의 전체로 확장
+추가 검색 없이 PositionalIndex 조회 + span 저장소에서 원문 복원
+(재크롤링으로 인덱스 세대가 바뀌면 위치 인덱스와 심볼 테이블을 다시 구성)
+- 같은 파일에서 겹치거나 맞닿는 결과는 더 높은 순위 결과 하나로 병합
+- 이미 포함된 구간 안의 청크는 중복으로 제외
+- 확장으로 늘어나는 토큰 합이 예산을 넘으면 해당 청크는 확장하지 않음
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..infrastructure.storage.positional_index import PositionalIndex
+from ..infrastructure.symbols.symbol_table import SymbolTable
+from .context_packer import _token_counter
+
+EXPANSION_MODES = ("none", "neighbors", "function")
+
+
+class NeighborExpander:
+    def __init__(
+        self,
+        index: PositionalIndex,
+        span_store: Any,
+        max_tokens: int = 1500,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ):
+        self.index = index
+        self.span_store = span_store
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens or _token_counter("gpt-4")
+
+    def expand(
+        self,
+        docs: Sequence[Dict[str, Any]],
+        mode: str = "neighbors",
+        window: int = 1,
+        max_tokens: Optional[int] = None,
+        content_key: str = "content",
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """순위순 검색 결과를 확장한 결과 목록(순위 유지)과 확장 통계 반환
+
+        span 정보가 없는 결과는 그대로 유지"""
+        if mode not in EXPANSION_MODES:
+            raise ValueError(f"unknown expansion mode: {mode}")
+        started = time.perf_counter()
+        self._ensure_current()
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        stats = {
+            "mode": mode,
+            "window": window,
+            "budget": budget,
+            "input": len(docs),
+            "expanded": 0,
+            "deduped": 0,
+            "over_budget": 0,
+            "added_tokens": 0,
+        }
+
+        # 출력 순서대로의 항목: 원본 문서 또는 병합 구간 {"doc", "file_id", "start", ...}
+        entries: List[Optional[Dict[str, Any]]] = []
+        by_file: Dict[str, List[int]] = {}
+        for doc in docs:
+            metadata = doc.get("metadata") or {}
+            file_id = self.index.file_id(metadata)
+            if mode == "none" or file_id is None or "span_start" not in metadata:
+                entries.append({"doc": doc})
+                continue
+
+            start, end = metadata["span_start"], metadata["span_end"]
+            chunk_index = metadata.get("chunk_index", -1)
+            blocks = [entries[i] for i in by_file.get(file_id, []) if entries[i]]
+            containing = next(
+                (b for b in blocks if b["start"] <= start and end <= b["end"]), None
+            )
+            if containing is not None:
+                containing["hits"].append(chunk_index)
+                stats["deduped"] += 1
+                continue
+
+            target = self._target(file_id, chunk_index, start, end, mode, window)
+            covered = [(b["start"], b["end"]) for b in blocks] + [(start, end)]
+            cost = self._added_tokens(file_id, covered, target)
+            if stats["added_tokens"] + cost > budget:
+                target = (start, end)
+                stats["over_budget"] += 1
+            else:
+                stats["added_tokens"] += cost
+                if target != (start, end):
+                    stats["expanded"] += 1
+
+            self._merge(entries, by_file, doc, file_id, chunk_index, target)
+
+        expanded = [self._to_doc(e, mode, content_key) for e in entries if e]
+        stats["output"] = len(expanded)
+        stats["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        return expanded, stats
+
+    def _ensure_current(self) -> None:
+        if self.index.generation == self.span_store.generation():
+            return
+        persist_dir = str(self.span_store.root_dir.parent)
+        self.index = PositionalIndex.build(
+            self.span_store, SymbolTable.load(persist_dir)
+        )
+
+    def _target(
+        self,
+        file_id: str,
+        chunk_index: int,
+        start: int,
+        end: int,
+        mode: str,
+        window: int,
+    ) -> Tuple[int, int]:
+        if mode == "function":
+            target = self.index.enclosing(file_id, start, end)
+        else:
+            target = self.index.window(file_id, chunk_index, window, window)
+        if target is None:
+            return start, end
+        return min(target[0], start), max(target[1], end)
+
+    def _added_tokens(
+        self, file_id: str, covered: List[Tuple[int, int]], target: Tuple[int, int]
+    ) -> int:
+        """target 구간 중 이미 포함된 구간(+ 원래 청크)을 제외한 부분의 토큰 수"""
+        text = self.span_store.get_file(file_id)
+        cursor, tokens = target[0], 0
+        for start, end in sorted(covered):
+            if end <= cursor or start >= target[1]:
+                continue
+            if start > cursor:
+                tokens += self.count_tokens(text[cursor:start])
+            cursor = max(cursor, end)
+        if cursor < target[1]:
+            tokens += self.count_tokens(text[cursor : target[1]])
+        return tokens
+
+    def _merge(
+        self,
+        entries: List[Optional[Dict[str, Any]]],
+        by_file: Dict[str, List[int]],
+        doc: Dict[str, Any],
+        file_id: str,
+        chunk_index: int,
+        target: Tuple[int, int],
+    ) -> None:
+        """target과 겹치거나 맞닿는 기존 구간을 가장 앞(높은 순위) 구간으로 병합"""
+        start, end = target
+        touching = [
+            i
+            for i in by_file.get(file_id, [])
+            if entries[i] and entries[i]["start"] <= end and start <= entries[i]["end"]
+        ]
+        if not touching:
+            by_file.setdefault(file_id, []).append(len(entries))
+            entries.append(
+                {
+                    "doc": doc,
+                    "file_id": file_id,
+                    "start": start,
+                    "end": end,
+                    "hits": [chunk_index],
+                }
+            )
+            return
+
+        block = entries[touching[0]]
+        block["start"] = min(start, block["start"])
+        block["end"] = max(end, block["end"])
+        block["hits"].append(chunk_index)
+        for i in touching[1:]:
+            other = entries[i]
+            block["start"] = min(block["start"], other["start"])
+            block["end"] = max(block["end"], other["end"])
+            block["hits"].extend(other["hits"])
+            entries[i] = None
+
+    def _to_doc(self, entry: Dict[str, Any], mode: str, content_key: str):
+        doc = entry["doc"]
+        if "file_id" not in entry:
+            return doc
+
+        file_id, start, end = entry["file_id"], entry["start"], entry["end"]
+        first, last = self.index.chunk_range(file_id, start, end)
+        metadata = dict(doc.get("metadata") or {})
+        metadata.update(
+            {
+                "span_start": start,
+                "span_end": end,
+                "chunk_index": first,
+                "chunk_range": [first, last],
+                "expanded_from": sorted(entry["hits"]),
+                "expansion": mode,
+            }
+        )
+        return {
+            **doc,
+            content_key: self.span_store.get_span(file_id, start, end),
+            "metadata": metadata,
+        }
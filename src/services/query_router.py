@@ -0,0 +1,171 @@
+import re
+from typing import List, Optional
+from ..infrastructure.symbols.symbol_table import IDENTIFIER_PATTERN
+from ..models.search_models import (
+    SearchQuery,
+    QueryType,
+    RetrievalWeights,
+    RoutingDecision,
+)
+
+
+class QueryRouter:
+    """쿼리 분류 후 실행할 검색 엔진과 엔진별 over-fetch 깊이 결정
+
+    네트워크 호출 없이 정규식/토큰 통계만으로 판단
+    - identifier: `UserRepository.save` 같은 식별자 → 심볼 조회, 실패시 sparse
+    - code: 식별자 위주의 짧은 질의 → sparse (임베딩 API 호출 생략)
+    - semantic: 한글 등 BM25 토큰이 거의 없는 자연어 → dense
+    - mixed: 그 외 → hybrid (dense + sparse)"""
+
+    LATIN_TOKEN_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+    HANGUL_PATTERN = re.compile(r"[가-힣]")
+    CODE_TOKEN_PATTERN = re.compile(
+        r"^(?:[a-z]+[A-Z]\w*|[A-Z][a-z0-9]+[A-Z]\w*|\w+_\w+|[A-Z][A-Z0-9_]{2,}"
+        r"|\w+(?:\.|::|#)\w+(?:\(\))?|\w+\(\))$"
+    )
+
+    # 짧은 코드 질의는 sparse만으로 충분하다고 판단하는 최대 토큰 수
+    MAX_SPARSE_ONLY_TOKENS = 3
+
+    def __init__(
+        self,
+        overfetch_factor: int = 3,
+        max_depth: int = 50,
+        dense_overfetch_factor: Optional[int] = None,
+        sparse_overfetch_factor: Optional[int] = None,
+    ):
+        self.overfetch_factor = overfetch_factor
+        self.max_depth = max_depth
+        # hybrid 융합시 엔진별 후보 깊이 (미지정시 overfetch_factor 사용)
+        self.dense_overfetch_factor = dense_overfetch_factor or overfetch_factor
+        self.sparse_overfetch_factor = sparse_overfetch_factor or overfetch_factor
+
+    def classify(self, query: SearchQuery) -> str:
+        text = query.text.strip()
+
+        if query.query_type == QueryType.CODE:
+            return "identifier" if IDENTIFIER_PATTERN.match(text) else "code"
+        if query.query_type == QueryType.SEMANTIC:
+            return "semantic"
+
+        if IDENTIFIER_PATTERN.match(text):
+            return "identifier"
+
+        tokens = text.split()
+        code_tokens = [t for t in tokens if self.CODE_TOKEN_PATTERN.match(t)]
+        if tokens and len(tokens) <= self.MAX_SPARSE_ONLY_TOKENS:
+            if len(code_tokens) == len(tokens):
+                return "code"
+
+        hangul_chars = len(self.HANGUL_PATTERN.findall(text))
+        latin_tokens = self.LATIN_TOKEN_PATTERN.findall(text)
+        if hangul_chars and not latin_tokens:
+            return "semantic"
+
+        return "mixed"
+
+    def route(
+        self,
+        query: SearchQuery,
+        k: int,
+        weights: Optional[RetrievalWeights] = None,
+    ) -> RoutingDecision:
+        """weights를 직접 지정한 경우는 hybrid 검색 요청으로 간주"""
+        query_class = self.classify(query)
+        dense_depth = self._depth(k, self.dense_overfetch_factor)
+        sparse_depth = self._depth(k, self.sparse_overfetch_factor)
+
+        if weights is not None:
+            return RoutingDecision(
+                route="hybrid",
+                query_class=query_class,
+                engines=["dense", "sparse"],
+                dense_depth=dense_depth,
+                sparse_depth=sparse_depth,
+                weights=weights,
+                reason="explicit weights: dense + sparse fusion",
+            )
+        if query_class == "identifier":
+            return RoutingDecision(
+                route="symbol",
+                query_class=query_class,
+                engines=["symbol", "sparse"],
+                dense_depth=0,
+                sparse_depth=k,
+                weights=RetrievalWeights(dense=0.0, sparse=1.0),
+                reason="identifier query: symbol lookup, sparse fallback",
+            )
+        if query_class == "code":
+            return RoutingDecision(
+                route="sparse",
+                query_class=query_class,
+                engines=["sparse"],
+                dense_depth=0,
+                sparse_depth=k,
+                weights=RetrievalWeights(dense=0.0, sparse=1.0),
+                reason="short code-token query: lexical match is sufficient",
+            )
+        if query_class == "semantic":
+            return RoutingDecision(
+                route="dense",
+                query_class=query_class,
+                engines=["dense"],
+                dense_depth=k,
+                sparse_depth=0,
+                weights=RetrievalWeights(dense=1.0, sparse=0.0),
+                reason="natural-language query without code tokens",
+            )
+
+        weights = (
+            RetrievalWeights.for_code_search()
+            if query.is_code_query
+            else RetrievalWeights.for_semantic_search()
+        )
+        return RoutingDecision(
+            route="hybrid",
+            query_class=query_class,
+            engines=["dense", "sparse"],
+            dense_depth=dense_depth,
+            sparse_depth=sparse_depth,
+            weights=weights,
+            reason="mixed query: dense + sparse fusion",
+        )
+
+    def restrict(
+        self, decision: RoutingDecision, available: List[str]
+    ) -> RoutingDecision:
+        """사용 불가능한 엔진(로드 실패, 심볼 미존재 등)을 제외하고 결정 보정
+
+        검색 엔진이 하나도 남지 않으면 사용 가능한 엔진으로 대체"""
+        engines = [e for e in decision.engines if e in available]
+        search_engines = [e for e in engines if e != "symbol"]
+        if not search_engines:
+            search_engines = [e for e in ("sparse", "dense") if e in available][:1]
+        engines = (["symbol"] if "symbol" in engines else []) + search_engines
+
+        if engines == decision.engines:
+            return decision
+
+        if len(search_engines) > 1:
+            route, weights = "hybrid", decision.weights
+        elif search_engines == ["dense"]:
+            route, weights = "dense", RetrievalWeights(dense=1.0, sparse=0.0)
+        elif search_engines == ["sparse"]:
+            route, weights = "sparse", RetrievalWeights(dense=0.0, sparse=1.0)
+        else:
+            route, weights = ("symbol" if engines else "none"), decision.weights
+
+        depth = max(decision.dense_depth, decision.sparse_depth)
+        return RoutingDecision(
+            route=route,
+            query_class=decision.query_class,
+            engines=engines,
+            dense_depth=depth if "dense" in engines else 0,
+            sparse_depth=depth if "sparse" in engines else 0,
+            weights=weights,
+            reason=f"{decision.reason} (fallback: {route})",
+        )
+
+    def _depth(self, k: int, factor: int) -> int:
+        return max(k, min(k * factor, self.max_depth))
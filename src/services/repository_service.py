@@ -15,8 +15,16 @@ from dotenv import load_dotenv
 from datetime import datetime
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
-from langchain_openai.embeddings import OpenAIEmbeddings
 from ..models.repository_model import RepositoryMetadata
+from ..infrastructure.storage.span_store import SpanStore
+from ..infrastructure.vector_stores.chroma_store import write_chunks
+from ..infrastructure.vector_stores.chroma_http_store import ChromaHttpStore
+from ..infrastructure.symbols.symbol_extractor import extract_symbols
+from ..infrastructure.symbols.symbol_table import SymbolTable
+from ..infrastructure.storage.index_generation import IndexGeneration
+from ..infrastructure.embeddings.cached_embeddings import CachedEmbeddings
+from ..infrastructure.cache.resource_pool import ResourcePool
+from ..config import settings
 
 load_dotenv()
 
@@ -32,9 +40,11 @@ class RepositoryService:
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-        # OpenAI text-embedding-3-small 사용
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small", api_key=self.openai_api_key
+        self.config = settings.load_config()
+
+        # OpenAI text-embedding-3-small 사용 (질의 임베딩은 메모리 + 디스크 캐시)
+        self.embeddings = CachedEmbeddings.from_config(
+            self.config, self.openai_api_key
         )
 
         # 텍스트 스플리터 설정 (코드에 최적화??)
@@ -47,6 +57,20 @@ class RepositoryService:
 
         self.chroma_persist_dir = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
 
+        # persist 디렉토리별 Chroma 클라이언트를 한 번만 열어 재사용
+        # (서버 시작시 로드, crawl_repository 적재, 문서 로드가 같은 스토어 공유)
+        # 검색 중인 스토어를 버리지 않도록 유휴 시간으로는 제거하지 않음
+        self.stores = ResourcePool(
+            max_size=int(os.getenv("RAG_POOL_SIZE", "8")), idle_seconds=None
+        )
+
+        # VECTOR_DB_MODE=http면 로컬 Chroma 대신 공유 Chroma 서버 사용
+        self.remote_store = (
+            ChromaHttpStore.from_config(self.config)
+            if self.config.vector_db_mode == "http"
+            else None
+        )
+
     def _clone_repository(
         self,
         repository_metadata: RepositoryMetadata,
@@ -117,8 +141,16 @@ class RepositoryService:
 
         return files
 
-    def _process_files_to_chunks(self, file_paths: List[str]) -> List[Dict[str, Any]]:
-        """파일을 청크로 분할하고 메타데이터 추가"""
+    def _process_files_to_chunks(
+        self,
+        file_paths: List[str],
+        span_store: SpanStore,
+        symbol_table: SymbolTable,
+    ) -> List[Dict[str, Any]]:
+        """파일을 청크로 분할하고 메타데이터 추가
+
+        파일 원문은 span_store에 한 번만 저장하고 청크는 (file_id, start, end) span으로 기록
+        클래스/함수 등 심볼 정의는 symbol_table에 함께 기록"""
         print(f"Processing {len(file_paths)} files into chunks...")
 
         documents = []
@@ -128,34 +160,48 @@ class RepositoryService:
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                     content = f.read()
 
+                # 이전 크롤링의 span 제거 후 다시 기록
+                span_store.remove_file(file_path)
                 if not content.strip():
                     continue
 
                 # 파일 내용을 청크로 분할
                 chunks = self.text_splitter.split_text(content)
-                for i, chunk in enumerate(chunks):
-                    documents.append(
-                        {
-                            "content": chunk,
-                            "metadata": {
-                                "source": file_path,
-                                "chunk_index": i,
-                                "total_chunks": len(chunks),
-                                "file_type": Path(file_path).suffix,
-                                "file_name": Path(file_path).name,
-                                "relative_path": str(
-                                    Path(file_path).relative_to(
-                                        Path(file_path).parts[0]
-                                    )
-                                ),
-                            },
-                        }
-                    )
+                spans = span_store.locate_chunks(content, chunks)
+                file_id = span_store.put_file(
+                    file_path, content, [span or (0, 0) for span in spans]
+                )
+                symbol_table.set_file_symbols(
+                    file_path, extract_symbols(file_path, content, file_id, spans)
+                )
+
+                for i, (chunk, span) in enumerate(zip(chunks, spans)):
+                    metadata = {
+                        "source": file_path,
+                        "chunk_id": f"{file_id}:{i}",
+                        "chunk_index": i,
+                        "total_chunks": len(chunks),
+                        "file_type": Path(file_path).suffix,
+                        "file_name": Path(file_path).name,
+                        "relative_path": str(
+                            Path(file_path).relative_to(Path(file_path).parts[0])
+                        ),
+                    }
+                    if span is not None:
+                        metadata.update(
+                            {
+                                "file_id": file_id,
+                                "span_start": span[0],
+                                "span_end": span[1],
+                            }
+                        )
+                    documents.append({"content": chunk, "metadata": metadata})
 
             except Exception as e:
                 print(f"Error processing {file_path}: {e}")
                 continue
 
+        span_store.save()
         print(f"{len(documents)} document chunks 생성완료")
         return documents
 
@@ -169,39 +215,47 @@ class RepositoryService:
         """
         print(f"Creating vector store with {len(documents)} chunks...")
 
-        texts = [doc["content"] for doc in documents]
-        metadatas = [doc["metadata"] for doc in documents]
-
-        # ChromaDB 벡터스토어 생성
+        # ChromaDB 벡터스토어 생성 (원문은 span store에 있으므로 임베딩과 메타데이터만 저장)
+        # http 모드는 다른 replica가 읽을 수 있도록 Chroma 서버에 원문도 저장
         persist_directory = persist_dir or self.chroma_persist_dir
-        vectorstore = Chroma.from_texts(
-            texts=texts,
-            metadatas=metadatas,
-            embedding=self.embeddings,
-            persist_directory=persist_directory,
-        )
+        vectorstore = self.load_vector_store(persist_directory)
+        write_chunks(vectorstore, self.embeddings, documents)
+
+        location = self._store_location(persist_directory)
+        print(f"Vector store created and saved to: {location}")
 
-        # 벡터스토어 저장
-        vectorstore.persist()
-        print(f"Vector store created and saved to: {persist_directory}")
+    def _store_location(self, persist_dir: str) -> str:
+        if self.remote_store is not None:
+            return f"{self.remote_store.base_url} ({self.config.vector_db_collection})"
+        return persist_dir
 
     def load_vector_store(self, persist_dir: str):
-        """기존 벡터스토어 로드"""
+        """기존 벡터스토어 로드 (http 모드면 공유 Chroma 서버 클라이언트)"""
+        if self.remote_store is not None:
+            return self.remote_store
+
         persist_directory = persist_dir or self.chroma_persist_dir
 
-        vectorstore = Chroma(
-            persist_directory=persist_directory, embedding_function=self.embeddings
-        )
+        def create() -> Chroma:
+            return Chroma(
+                persist_directory=persist_directory, embedding_function=self.embeddings
+            )
 
-        return vectorstore
+        key = (os.path.abspath(persist_directory), self.config.embedding_model)
+        return self.stores.get(key, create)
 
     def load_crawled_documents(self, persist_dir: str) -> List[Dict[str, Any]]:
-        """크롤링된 문서 로드 (sparse retriever용)"""
+        """크롤링된 문서 로드 (sparse retriever용)
+
+        span 기반 청크는 content가 비어있으며 SpanStore로 필요할 때 복원
+        (http 모드는 Chroma 서버에 원문이 함께 저장됨)"""
         vectorstore = self.load_vector_store(persist_dir)
 
         # ChromaDB에서 모든 문서 가져오기
-        collection = vectorstore._collection
-        all_docs = collection.get()
+        if self.remote_store is not None:
+            all_docs = self.remote_store.get_all()
+        else:
+            all_docs = vectorstore._collection.get()
 
         documents = []
         for i, (doc_id, content, metadata) in enumerate(
@@ -229,11 +283,24 @@ class RepositoryService:
             # 2. 코드 파일 추출
             file_paths = self._extract_code_files(repo_path)
 
-            # 3. 파일을 청크로 분할
-            documents = self._process_files_to_chunks(file_paths)
+            # 3. 파일을 청크로 분할 (원문은 span store에 1회 저장)
+            persist_directory = (
+                repository_metadata.persist_dir or self.chroma_persist_dir
+            )
+            span_store = SpanStore.for_persist_dir(persist_directory)
+            symbol_table = SymbolTable.load(persist_directory)
+            documents = self._process_files_to_chunks(
+                file_paths, span_store, symbol_table
+            )
 
             # 4. 벡터스토어 생성
-            self._create_vector_store(documents, repository_metadata.persist_dir)
+            self._create_vector_store(documents, persist_directory)
+            symbol_table.save(persist_directory)
+
+            # 인덱스 세대 갱신 → 세대를 키로 쓰는 캐시들 자동 무효화
+            index_generation = IndexGeneration(
+                persist_directory, self.remote_store
+            ).bump()
 
             # 5. 결과 반환
             repository_metadata.last_crawled = datetime.now()
@@ -258,6 +325,8 @@ class RepositoryService:
                 "repository_url": repository_metadata.url,
                 "file_count": repository_metadata.file_count,
                 "chunk_count": repository_metadata.chunk_count,
+                "symbol_count": len(symbol_table),
+                "index_generation": index_generation,
                 "supported_languages": repository_metadata.supported_languages,
                 "persist_directory": repository_metadata.persist_dir,
                 "crawled_at": repository_metadata.last_crawled.isoformat(),
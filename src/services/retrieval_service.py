@@ -4,14 +4,24 @@ RAG Query Service
 """
 
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from dotenv import load_dotenv
 
 from langchain_community.vectorstores import Chroma
-from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_openai import ChatOpenAI
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
+from ..infrastructure.storage.span_store import SpanStore
+from ..infrastructure.retrievers.span_retriever import (
+    ContextPackingRetriever,
+    SpanHydratingRetriever,
+)
+from ..infrastructure.embeddings.cached_embeddings import CachedEmbeddings
+from ..infrastructure.cache.resource_pool import ResourcePool
+from ..infrastructure.storage.index_generation import IndexGeneration
+from ..config import settings
+from .context_packer import ContextPacker
+from .context_compressor import ContextCompressor
 
 load_dotenv()
 
@@ -29,15 +39,18 @@ class RetrievalService:
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        # OpenAI 임베딩 모델
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small", 
-            api_key=self.openai_api_key
+        self.config = settings.load_config()
+        self.embedding_model = self.config.embedding_model
+        self.llm_model = "gpt-4o-mini"
+        
+        # OpenAI 임베딩 모델 (질의 임베딩은 메모리 + 디스크 캐시)
+        self.embeddings = CachedEmbeddings.from_config(
+            self.config, self.openai_api_key
         )
         
         # ChatGPT 모델
         self.llm = ChatOpenAI(
-            model_name="gpt-4o-mini",
+            model_name=self.llm_model,
             temperature=0.1,
             api_key=self.openai_api_key
         )
@@ -55,51 +68,104 @@ class RetrievalService:
 답변: 코드베이스의 컨텍스트를 바탕으로 구체적이고 실용적인 답변을 제공해주세요.
 코드 예시나 파일 위치가 있다면 함께 제공해주세요."""
         )
+        
+        # 요청마다 Chroma 클라이언트/QA 체인을 새로 만들지 않도록 재사용
+        # (persist 디렉토리 + 모델 설정 + 인덱스 세대별, 최대 개수/유휴 시간 초과시 제거)
+        pool_size = int(os.getenv("RAG_POOL_SIZE", "8"))
+        idle_seconds = float(os.getenv("RAG_POOL_IDLE_SECONDS", "600"))
+        self.stores = ResourcePool(max_size=pool_size, idle_seconds=idle_seconds)
+        self.chains = ResourcePool(max_size=pool_size, idle_seconds=idle_seconds)
+        self._generations: Dict[str, IndexGeneration] = {}
+        
+        # stuff 체인에 넣는 문서는 토큰 예산 안에서 겹치는 청크를 병합해 전달
+        self.context_token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+        # CONTEXT_COMPRESSION=true 이면 질의와 관련된 줄 위주로 추출 압축
+        self.compressor = None
+        if os.getenv("CONTEXT_COMPRESSION", "false").lower() == "true":
+            self.compressor = ContextCompressor(
+                keep_ratio=float(os.getenv("CONTEXT_COMPRESSION_RATIO", "0.4"))
+            )
     
     def load_vector_store(self, persist_dir: str = "./chroma_db") -> Chroma:
-        """벡터 스토어 로드"""
+        """벡터 스토어 로드 (열려 있는 스토어 재사용)"""
+        return self._open_store(persist_dir)[0]
+    
+    def _open_store(self, persist_dir: str) -> Tuple[Chroma, SpanStore]:
+        """(벡터 스토어, span 저장소) 조회, 없으면 디스크에서 열어 등록"""
         if not os.path.exists(persist_dir):
             raise ValueError(f"Vector store directory not found: {persist_dir}")
         
-        vectorstore = Chroma(
-            persist_directory=persist_dir,
-            embedding_function=self.embeddings
-        )
+        def create() -> Tuple[Chroma, SpanStore]:
+            vectorstore = Chroma(
+                persist_directory=persist_dir,
+                embedding_function=self.embeddings
+            )
+            return vectorstore, SpanStore.for_persist_dir(persist_dir)
         
-        return vectorstore
+        return self.stores.get(self._store_key(persist_dir), create)
     
-    async def query_repository(
-        self, 
-        query: str, 
-        persist_dir: str = "./chroma_db",
-        k: int = 5
-    ) -> Dict[str, Any]:
-        """Repository에 대한 질의 처리"""
-        try:
-            # 벡터 스토어 로드
-            vectorstore = self.load_vector_store(persist_dir)
+    def _qa_chain(self, persist_dir: str, k: int) -> RetrievalQA:
+        """k별 QA 체인 조회, 없으면 생성해 등록 (체인은 상태가 없어 동시 요청에 공유)"""
+        def create() -> RetrievalQA:
+            vectorstore, span_store = self._open_store(persist_dir)
             
-            # 유사 문서 검색
-            retriever = vectorstore.as_retriever(
-                search_type="similarity",
-                search_kwargs={"k": k}
+            # 유사 문서 검색 (span 기반 청크는 원문 복원 후 토큰 예산 안으로 패킹)
+            retriever = ContextPackingRetriever(
+                base_retriever=SpanHydratingRetriever(
+                    base_retriever=vectorstore.as_retriever(
+                        search_type="similarity",
+                        search_kwargs={"k": k}
+                    ),
+                    span_store=span_store
+                ),
+                packer=ContextPacker(
+                    max_tokens=self.context_token_budget,
+                    model=self.llm_model,
+                    span_store=span_store,
+                    compressor=self.compressor
+                )
             )
             
-            # QA 체인 생성
-            qa_chain = RetrievalQA.from_chain_type(
+            return RetrievalQA.from_chain_type(
                 llm=self.llm,
                 chain_type="stuff",
                 retriever=retriever,
                 chain_type_kwargs={"prompt": self.prompt_template},
                 return_source_documents=True
             )
+        
+        key = self._store_key(persist_dir) + (self.llm_model, k)
+        return self.chains.get(key, create)
+    
+    def _store_key(self, persist_dir: str) -> Tuple[str, ...]:
+        # 재크롤링으로 인덱스 세대가 바뀌면 새 키로 다시 열고 이전 항목은 LRU/유휴 제거
+        path = os.path.abspath(persist_dir)
+        generation = self._generations.setdefault(path, IndexGeneration(path))
+        return (path, self.embedding_model, generation.current())
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """열린 벡터 스토어/QA 체인 레지스트리 통계"""
+        return {"stores": self.stores.stats(), "chains": self.chains.stats()}
+    
+    async def query_repository(
+        self, 
+        query: str, 
+        persist_dir: str = "./chroma_db",
+        k: int = 5
+    ) -> Dict[str, Any]:
+        """Repository에 대한 질의 처리"""
+        try:
+            # QA 체인 조회 (처음 요청시에만 벡터 스토어를 열고 체인 생성)
+            qa_chain = self._qa_chain(persist_dir, k)
             
             # 질의 실행
             result = await qa_chain.ainvoke({"query": query})
             
-            # 소스 문서 정보 추출
+            # 소스 문서 정보 추출 (패킹된 블록 단위)
             source_docs = []
+            context_tokens = {}
             for doc in result.get("source_documents", []):
+                context_tokens = doc.metadata.get("packing", context_tokens)
                 source_docs.append({
                     "content": doc.page_content[:200] + "...",  # 처음 200자만
                     "source": doc.metadata.get("source", "Unknown"),
@@ -111,7 +177,8 @@ class RetrievalService:
                 "query": query,
                 "answer": result["result"],
                 "source_documents": source_docs,
-                "total_sources": len(source_docs)
+                "total_sources": len(source_docs),
+                "context_tokens": context_tokens
             }
             
         except Exception as e:
@@ -126,8 +193,8 @@ class RetrievalService:
     ) -> List[Dict[str, Any]]:
         """유사 문서 검색만 수행 (LLM 응답 없이)"""
         try:
-            # 벡터 스토어 로드
-            vectorstore = self.load_vector_store(persist_dir)
+            # 벡터 스토어 조회
+            vectorstore, span_store = self._open_store(persist_dir)
             
             # 유사성 검색
             docs = vectorstore.similarity_search(query, k=k)
@@ -135,7 +202,7 @@ class RetrievalService:
             similar_docs = []
             for doc in docs:
                 similar_docs.append({
-                    "content": doc.page_content,
+                    "content": span_store.materialize(doc.page_content, doc.metadata),
                     "metadata": doc.metadata,
                     "similarity_score": getattr(doc, 'similarity_score', None)
                 })
@@ -149,7 +216,7 @@ class RetrievalService:
     async def get_repository_stats(self, persist_dir: str = "./chroma_db") -> Dict[str, Any]:
         """Repository 통계 정보 조회"""
         try:
-            # 벡터 스토어 로드
+            # 벡터 스토어 조회
             vectorstore = self.load_vector_store(persist_dir)
             
             # 전체 문서 수 조회
@@ -160,8 +227,9 @@ class RetrievalService:
             return {
                 "total_chunks": total_chunks,
                 "persist_directory": persist_dir,
-                "embedding_model": "text-embedding-3-small",
-                "llm_model": "gpt-4o-mini"
+                "embedding_model": self.embedding_model,
+                "llm_model": self.llm_model,
+                "pool": self.pool_stats()
             }
             
         except Exception as e:
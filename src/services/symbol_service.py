@@ -0,0 +1,81 @@
+from typing import List, Dict, Any, Optional
+from ..infrastructure.symbols.symbol_table import IDENTIFIER_PATTERN, SymbolTable
+from ..infrastructure.storage.span_store import SpanStore
+from ..models.symbol_models import Symbol
+
+
+class SymbolService:
+    """심볼 테이블 조회 서비스
+
+    `UserRepository.save` 처럼 식별자만으로 된 질의는 임베딩/검색 없이 해시 조회로 응답
+    재크롤링으로 인덱스 세대가 바뀌면 심볼 테이블을 다시 로드 (이전 오프셋으로 새 원문을 자르지 않도록)"""
+
+    def __init__(self, symbol_table: SymbolTable, span_store: Optional[SpanStore] = None):
+        self.symbol_table = symbol_table
+        self.span_store = span_store
+        self._generation = span_store.generation() if span_store is not None else None
+
+    def lookup(self, name: str, prefix: bool = False, limit: int = 20) -> List[Dict]:
+        name = self._normalize(name)
+        self._ensure_current()
+        if prefix:
+            symbols = self.symbol_table.lookup_prefix(name, limit)
+        else:
+            symbols = self.symbol_table.lookup(name, limit, ignore_case=True)
+        return [symbol.to_dict() for symbol in symbols]
+
+    def is_identifier(self, text: str) -> bool:
+        return bool(IDENTIFIER_PATTERN.match(text.strip()))
+
+    def resolve_query(self, text: str, k: int) -> List[Dict[str, Any]]:
+        """식별자 질의를 심볼 정의 문서로 변환 (해당 심볼이 없으면 빈 리스트)
+
+        "config", "user" 같은 자연어 단어가 심볼로 잡히지 않도록 대소문자까지 일치해야 함"""
+        if not self.is_identifier(text):
+            return []
+
+        self._ensure_current()
+        symbols = self.symbol_table.lookup(self._normalize(text), k)
+        return [self._to_document(symbol) for symbol in symbols]
+
+    def _ensure_current(self) -> None:
+        if self.span_store is None:
+            return
+        generation = self.span_store.generation()
+        if generation == self._generation:
+            return
+        self.symbol_table = SymbolTable.load(str(self.span_store.root_dir.parent))
+        self._generation = generation
+
+    def _normalize(self, text: str) -> str:
+        text = text.strip()
+        if text.endswith("()"):
+            text = text[:-2]
+        # Kotlin/Java 레퍼런스 표기 (Foo::bar, Foo#bar)도 Foo.bar로 조회
+        return text.replace("::", ".").replace("#", ".")
+
+    def _to_document(self, symbol: Symbol) -> Dict[str, Any]:
+        content = ""
+        if self.span_store is not None and symbol.file_id:
+            try:
+                content = self.span_store.get_span(
+                    symbol.file_id, symbol.span_start, symbol.span_end
+                )
+            except (KeyError, OSError) as e:
+                print(f"심볼 원문 복원 실패 {symbol.qualified_name}: {e}")
+
+        return {
+            "id": symbol.chunk_id,
+            "page_content": content,
+            "metadata": {
+                "source": symbol.source,
+                "chunk_id": symbol.chunk_id,
+                "symbol": symbol.qualified_name,
+                "kind": symbol.kind,
+                "language": symbol.language,
+                "line_start": symbol.line_start,
+                "line_end": symbol.line_end,
+            },
+            "score": 1.0,
+            "source": "symbol",
+        }
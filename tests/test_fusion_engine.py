@@ -0,0 +1,119 @@
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import Embeddings
+
+from src.infrastructure.retrievers.dense_retriever import DenseReriever
+from src.services.fusion_engine import FusionEngine
+
+# 질의 [1, 0]에 가까운 순서: doc-0 > doc-1 > doc-2
+DOC_VECTORS = {"doc-0": [1.0, 0.1], "doc-1": [1.0, 1.0], "doc-2": [0.1, 1.0]}
+
+
+class FixedEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [_unit(DOC_VECTORS[text]) for text in texts]
+
+    def embed_query(self, text):
+        return _unit([1.0, 0.0])
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float64)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+@pytest.fixture
+def dense_retriever():
+    store = Chroma(
+        collection_name=f"test-{uuid.uuid4().hex[:8]}",
+        embedding_function=FixedEmbeddings(),
+    )
+    store.add_texts(
+        list(DOC_VECTORS),
+        metadatas=[{"chunk_id": chunk_id} for chunk_id in DOC_VECTORS],
+        ids=list(DOC_VECTORS),
+    )
+    yield DenseReriever(store)
+    store.delete_collection()
+
+
+def _dense_arrays(results):
+    ids = np.array([int(doc["id"].split("-")[1]) for doc in results])
+    scores = np.array([doc["score"] for doc in results])
+    return ids, scores
+
+
+def test_dense_scores_are_cosine_similarity_on_every_path(dense_retriever):
+    query = FixedEmbeddings().embed_query("q")
+    by_vector = asyncio.run(dense_retriever.search("q", 3, embedding=query))
+    by_text = asyncio.run(dense_retriever.search("q", 3))
+    by_matrix = asyncio.run(dense_retriever.search_batch(["q"], 3, [query]))[0]
+
+    expected = [np.dot(_unit([1, 0]), _unit(v)) for v in DOC_VECTORS.values()]
+    for results in (by_vector, by_text, by_matrix):
+        assert [doc["id"] for doc in results] == list(DOC_VECTORS)
+        assert [doc["score"] for doc in results] == pytest.approx(expected, abs=1e-5)
+
+
+@pytest.mark.parametrize("strategy", ["combsum", "combmnz"])
+@pytest.mark.parametrize("normalization", ["minmax", "zscore"])
+def test_score_fusion_keeps_dense_order(dense_retriever, strategy, normalization):
+    ids, scores = _dense_arrays(asyncio.run(dense_retriever.search("q", 3)))
+    engine = FusionEngine(strategy, normalization)
+
+    order, _ = engine.fuse([ids], [scores], [1.0], top_k=3)
+
+    assert order.tolist() == [0, 1, 2]
+
+
+def test_rrf_uses_rank_only():
+    engine = FusionEngine("rrf", rrf_k=60)
+    order, fused = engine.fuse(
+        [np.array([2, 0]), np.array([0, 1])],
+        [np.array([9.0, 1.0]), np.array([5.0, 4.0])],
+        [1.0, 1.0],
+        top_k=3,
+    )
+
+    assert order.tolist() == [0, 2, 1]
+    assert fused[0] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_combmnz_rewards_docs_returned_by_both_engines():
+    engine = FusionEngine("combmnz")
+    order, _ = engine.fuse(
+        [np.array([0, 1]), np.array([1, 2])],
+        [np.array([1.0, 0.9]), np.array([1.0, 0.5])],
+        [1.0, 1.0],
+        top_k=3,
+    )
+
+    assert order[0] == 1
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        FusionEngine("borda")
+
+
+
+def test_zscore_ranks_returned_docs_above_absent_ones():
+    engine = FusionEngine("combsum", "zscore")
+    # dense는 0~2, sparse는 3만 반환 (4, 5는 어느 엔진도 반환하지 않음)
+    order, fused = engine.fuse(
+        [np.array([0, 1, 2]), np.array([3])],
+        [np.array([0.9, 0.5, 0.1]), np.array([7.5])],
+        [1.0, 1.0],
+        top_k=6,
+        size=6,
+    )
+    scores = dict(zip(order.tolist(), fused.tolist()))
+
+    assert (fused >= 0).all()
+    assert scores[3] == pytest.approx(1.0)
+    assert scores[0] > scores[1] > scores[4] == scores[5] == 0
+    assert order.tolist()[:3] == [0, 1, 3]
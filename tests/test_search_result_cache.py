@@ -0,0 +1,67 @@
+from src.infrastructure.cache.disk_cache import DiskCache
+from src.infrastructure.cache.search_result_cache import SearchResultCache
+from src.infrastructure.storage.index_generation import IndexGeneration
+from src.models.search_models import RetrievalWeights, SearchQuery, SearchResult
+
+
+def _result(text: str) -> SearchResult:
+    return SearchResult(
+        documents=[{"page_content": text, "metadata": {}}],
+        scores=[1.0],
+        method="hybrid",
+        weights_used=RetrievalWeights(),
+        total_time=0.01,
+    )
+
+
+def test_hit_within_the_same_generation(tmp_path):
+    cache = SearchResultCache(IndexGeneration(str(tmp_path)))
+    key = cache.make_key(SearchQuery(text="UserRepository save"), 5, None)
+    cache.put(key, _result("v1"))
+
+    # 공백만 다른 질의는 같은 키 (식별자 때문에 대소문자는 구분)
+    same = cache.make_key(SearchQuery(text="  UserRepository   save "), 5, None)
+    other = cache.make_key(SearchQuery(text="userrepository save"), 5, None)
+    hit = cache.get(same)
+
+    assert same == key
+    assert other != key
+    assert hit is not None and hit.cache == "memory"
+    assert hit.documents[0]["page_content"] == "v1"
+
+
+def test_generation_bump_invalidates_memory_and_disk(tmp_path):
+    generation = IndexGeneration(str(tmp_path))
+    disk = DiskCache(str(tmp_path / "cache.db"), "search_results")
+    cache = SearchResultCache(generation, disk=disk)
+    query = SearchQuery(text="login token")
+
+    old_key = cache.make_key(query, 5, None)
+    cache.put(old_key, _result("old"))
+    assert cache.get(old_key) is not None
+
+    generation.bump()
+    new_key = cache.make_key(query, 5, None)
+
+    assert new_key != old_key
+    assert cache.get(new_key) is None
+    # 이전 세대 항목은 메모리에서 해제됨 (디스크 항목은 세대가 다른 키라 조회되지 않음)
+    assert cache.memory.get(old_key) is None
+
+
+def test_disk_layer_survives_a_restart(tmp_path):
+    generation = IndexGeneration(str(tmp_path))
+    db_path = str(tmp_path / "cache.db")
+    query = SearchQuery(text="login token")
+
+    first = SearchResultCache(generation, disk=DiskCache(db_path, "search_results"))
+    key = first.make_key(query, 5, None)
+    first.put(key, _result("persisted"))
+
+    second = SearchResultCache(
+        IndexGeneration(str(tmp_path)), disk=DiskCache(db_path, "search_results")
+    )
+    hit = second.get(second.make_key(query, 5, None))
+
+    assert hit is not None and hit.cache == "disk"
+    assert hit.documents[0]["page_content"] == "persisted"
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.concurrency.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        return calls, results, flight.stats()
+
+    calls, results, stats = asyncio.run(main())
+
+    assert calls == 1
+    assert results == [1] * 5
+    assert stats == {"in_flight": 0, "calls": 5, "executions": 1, "shared": 4}
+
+
+def test_different_keys_and_later_calls_run_separately():
+    async def main():
+        flight = SingleFlight()
+        calls = []
+
+        async def work(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return name
+
+        await asyncio.gather(
+            flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))
+        )
+        # 완료된 키는 제거되므로 다시 실행 (결과 캐시 아님)
+        await flight.do("a", lambda: work("a"))
+        return calls
+
+    assert asyncio.run(main()) == ["a", "b", "a"]
+
+
+def test_errors_propagate_to_every_waiter():
+    async def main():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        return await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_leader_does_not_cancel_other_waiters():
+    async def main():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("key", work))
+        follower = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_execution_is_cancelled_when_every_waiter_cancels():
+    async def main():
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return flight.stats()["in_flight"]
+
+    assert asyncio.run(main()) == 0
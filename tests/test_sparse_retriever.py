@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from rank_bm25 import BM25Okapi
+
+from src.infrastructure.retrievers.sharded_search import ShardedSearcher
+from src.infrastructure.retrievers.sparse_retriever import SparseRetriever
+
+DOCS = ["alpha beta", "beta gamma", "x y", "p q", "r s", "t u"]
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def searcher_factory():
+    searchers = []
+
+    def create(index_dir, shards=2):
+        searcher = ShardedSearcher(str(index_dir), shards)
+        searchers.append(searcher)
+        return searcher
+
+    yield create
+    for searcher in searchers:
+        searcher.close()
+
+
+def test_csr_scores_match_rank_bm25():
+    retriever = SparseRetriever(DOCS)
+    bm25 = BM25Okapi([retriever._tokenize(doc) for doc in DOCS])
+
+    for query in ("beta", "alpha gamma", "q r"):
+        expected = bm25.get_scores(retriever._tokenize(query))
+        matrix = retriever._query_matrix([retriever._query_terms(query)])
+        scores = (matrix @ retriever.doc_term_weights.T).toarray()[0]
+        np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+
+def test_sharded_search_matches_in_process_search(tmp_path, searcher_factory):
+    retriever = SparseRetriever(DOCS)
+    queries = ["alpha", "beta", "gamma x", "t"]
+    expected = retriever.search_batch(queries, 3)
+
+    retriever.build_shard_index(str(tmp_path))
+    retriever.use_shards(searcher_factory(tmp_path))
+
+    assert retriever.sharded is not None
+    sharded = retriever.search_batch(queries, 3)
+    # 동점 문서는 순서가 다를 수 있으므로 문서별 점수로 비교
+    for want, got in zip(expected, sharded):
+        want_scores = {doc["page_content"]: doc["score"] for doc in want}
+        got_scores = {doc["page_content"]: doc["score"] for doc in got}
+        assert got_scores == pytest.approx(want_scores, rel=1e-5)
+
+
+def test_shard_columns_survive_a_new_hash_seed(tmp_path, searcher_factory):
+    # 다른 PYTHONHASHSEED 프로세스에서 만든 샤드를 재시작 후 그대로 사용
+    script = (
+        "from src.infrastructure.retrievers.sparse_retriever import SparseRetriever;"
+        f"SparseRetriever({DOCS!r}).build_shard_index({str(tmp_path)!r})"
+    )
+    for seed in ("2", "5"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, env=env, check=True
+        )
+
+        retriever = SparseRetriever(DOCS)
+        retriever.use_shards(searcher_factory(tmp_path))
+
+        assert retriever.sharded is not None
+        top = retriever.search_batch(["alpha"], 1)[0]
+        assert top[0]["page_content"] == "alpha beta"
+
+
+def test_mismatched_shard_is_not_used(tmp_path, searcher_factory):
+    SparseRetriever(DOCS[:3]).build_shard_index(str(tmp_path))
+    retriever = SparseRetriever(DOCS)
+
+    assert not retriever.shard_index_current(str(tmp_path))
+    retriever.use_shards(searcher_factory(tmp_path))
+    assert retriever.sharded is None